@@ -0,0 +1,5 @@
+"""Shared building blocks for the HireHub LiveKit agents.
+
+The agent entry points (``interview-agent.py``, ``job-posting-agent.py`` ...)
+are standalone scripts, so anything they need to share lives here.
+"""
@@ -0,0 +1,215 @@
+"""Silero VAD batched across every room in a worker process
+
+With the stock plugin, each room's VAD stream runs the silero model on its
+own 32 ms window, one ONNX call per window per room. ``BatchedVAD`` keeps the
+plugin's speech/silence logic (it is the plugin's ``VADStream``) but gives
+each stream a ``BatchedModel`` instead. The model hands its window and RNN
+state to the process-wide ``VadEngine``, whose thread runs a single ONNX
+call over every window that arrived within ``CADENCE`` and fans the
+probabilities back out.
+
+Latency: a window waits at most ``CADENCE`` for its batch (less once
+``MAX_BATCH`` windows are waiting), plus one batched inference. Each
+window's wait + inference time is recorded, and windows over
+``FRAME_DEADLINE`` (one window of audio, i.e. falling behind realtime) are
+counted as late; ``VadEngine.summary()`` reports both.
+
+Rooms only share an engine if they share a process, so this needs the
+worker to run jobs as threads (``$VAD_BATCHING=1`` in ``livekit-agent.py``
+does both). Built through ``providers`` ("vad", "silero_batched"); with
+jobs on threads the agent imports this module on the main thread at load,
+as LiveKit requires of plugins.
+
+``BatchedVAD`` reaches into ``silero.VAD`` internals (``PLUGIN_INTERNALS``),
+so requirements.txt pins the plugin release it was written against and
+construction fails with a clear error if those have moved.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from importlib import metadata
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from livekit.plugins import silero
+from livekit.plugins.silero.vad import VADStream
+
+from agent_core.metrics import percentile
+
+logger = logging.getLogger("batched-vad")
+
+# Longest a window waits for others to join its batch
+CADENCE = 0.01
+MAX_BATCH = 64
+# One 512-sample window at 16 kHz; slower than this and the VAD falls behind
+FRAME_DEADLINE = 0.032
+STATE_SIZE = 128
+MAX_LATENCY_SAMPLES = 10000
+
+# sample rate -> (window, context) samples, as the silero model expects
+WINDOWS = {8000: (256, 32), 16000: (512, 64)}
+
+# Private silero.VAD attributes BatchedVAD uses, and the plugin release
+# (pinned in requirements.txt) they were checked against
+PLUGIN_INTERNALS = ("_onnx_session", "_opts", "_streams")
+SILERO_VERSION = "1.0.23"
+
+
+class _Request:
+    __slots__ = ("input", "state", "arrived", "done", "probability", "new_state", "error")
+
+    def __init__(self, window: np.ndarray, state: np.ndarray) -> None:
+        self.input = window
+        self.state = state
+        self.arrived = time.perf_counter()
+        self.done = threading.Event()
+        self.probability = 0.0
+        self.new_state: Optional[np.ndarray] = None
+        self.error: Optional[BaseException] = None
+
+
+class VadEngine:
+    """Runs queued VAD windows from any number of streams in batches on one thread"""
+
+    def __init__(self, session: Any, sample_rate: int, cadence: float = CADENCE, max_batch: int = MAX_BATCH) -> None:
+        self.session = session
+        self.sample_rate = sample_rate
+        self.cadence = cadence
+        self.max_batch = max_batch
+        self._sr = np.array(sample_rate, dtype=np.int64)
+        self._pending: List[_Request] = []
+        self._cond = threading.Condition()
+        self.batches = 0
+        self.windows = 0
+        self.late = 0
+        self.latencies: Deque[float] = deque(maxlen=MAX_LATENCY_SAMPLES)
+        threading.Thread(target=self._run, name="vad-engine", daemon=True).start()
+
+    def infer(self, window: np.ndarray, state: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Speech probability and next RNN state for one context+window; blocks until its batch has run"""
+        request = _Request(window, state)
+        with self._cond:
+            self._pending.append(request)
+            # Wake the engine to open a batch, or to run a full one now
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._cond.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.probability, request.new_state
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = self._pending[0].arrived + self.cadence
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[_Request]) -> None:
+        try:
+            inputs = np.stack([request.input for request in batch])
+            states = np.concatenate([request.state for request in batch], axis=1)
+            output, new_states = self.session.run(None, {"input": inputs, "state": states, "sr": self._sr})
+        except Exception as e:
+            logger.exception(f"Batched VAD inference failed for {len(batch)} windows")
+            for request in batch:
+                request.error = e
+                request.done.set()
+            return
+
+        now = time.perf_counter()
+        self.batches += 1
+        self.windows += len(batch)
+        for i, request in enumerate(batch):
+            request.probability = float(output[i, 0])
+            request.new_state = new_states[:, i:i + 1, :]
+            latency = now - request.arrived
+            self.latencies.append(latency)
+            if latency > FRAME_DEADLINE:
+                self.late += 1
+            request.done.set()
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = list(self.latencies)
+        return {
+            "windows": self.windows,
+            "batches": self.batches,
+            "mean_batch": round(self.windows / self.batches, 1) if self.batches else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50) * 1000, 2),
+                "p99": round(percentile(latencies, 99) * 1000, 2),
+                "max": round(max(latencies, default=0.0) * 1000, 2),
+            },
+            "late": self.late,
+        }
+
+
+class BatchedModel:
+    """Drop-in for the plugin's per-stream OnnxModel that runs through a VadEngine"""
+
+    def __init__(self, engine: VadEngine) -> None:
+        self.engine = engine
+        self._window_size_samples, self._context_size = WINDOWS[engine.sample_rate]
+        self._context = np.zeros(self._context_size, dtype=np.float32)
+        self._state = np.zeros((2, 1, STATE_SIZE), dtype=np.float32)
+
+    @property
+    def sample_rate(self) -> int:
+        return self.engine.sample_rate
+
+    @property
+    def window_size_samples(self) -> int:
+        return self._window_size_samples
+
+    @property
+    def context_size(self) -> int:
+        return self._context_size
+
+    def __call__(self, x: np.ndarray) -> float:
+        # Runs on the stream's executor thread, so blocking on the batch doesn't block the loop
+        window = np.concatenate((self._context, x))
+        probability, self._state = self.engine.infer(window, self._state)
+        self._context = window[-self._context_size:]
+        return probability
+
+
+class BatchedVAD(silero.VAD):
+    """silero.VAD whose streams share the process's VadEngine"""
+
+    _engine: Optional[VadEngine] = None
+    _engine_lock = threading.Lock()
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        missing = [name for name in PLUGIN_INTERNALS if not hasattr(self, name)]
+        if missing:
+            try:
+                installed = metadata.version("livekit-plugins-silero")
+            except metadata.PackageNotFoundError:
+                installed = "unknown"
+            raise RuntimeError(
+                f"livekit-plugins-silero {installed} has no silero.VAD {', '.join(missing)}; "
+                f"BatchedVAD needs {SILERO_VERSION} (see requirements.txt), or unset VAD_BATCHING"
+            )
+
+    @property
+    def engine(self) -> VadEngine:
+        with BatchedVAD._engine_lock:
+            if BatchedVAD._engine is None:
+                BatchedVAD._engine = VadEngine(self._onnx_session, self._opts.sample_rate)
+        return BatchedVAD._engine
+
+    def stream(self) -> VADStream:
+        stream = VADStream(self, self._opts, BatchedModel(self.engine))
+        self._streams.add(stream)
+        return stream
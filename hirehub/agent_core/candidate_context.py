@@ -0,0 +1,149 @@
+"""Candidate context precomputed from a parsed resume and a job
+
+Every interview session used to rebuild the candidate's prompt section and
+question plan from ``resume_data`` on start, and retries and reconnects for
+the same candidate redid all of it. The compact context the interview needs
+(normalized skills ordered by relevance to the job, a short experience
+summary, skill overlap with the job, the question plan and the prompt
+section) is now built once and stored in the job cache (see
+``interview_config``) under the job and ``candidate:<candidate>:<resume hash>``,
+so a new resume, or an edited job, gets a fresh context.
+
+For interview start to be a cache lookup, build it when the interview is
+scheduled (the room metadata is known then): run this against the worker's
+``$JOB_CACHE_DB`` with that metadata. The web app doesn't do this yet.
+
+    python -m agent_core.candidate_context metadata.json
+    echo '{"job_data": ..., "resume_data": ...}' | python -m agent_core.candidate_context -
+
+Without it, the interview agent starts building the context in the
+background once it has accepted the room, and the session builds it itself
+(off its event loop) if it gets there first. Precomputing is an
+optimization, never a requirement.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import sys
+import time
+from typing import Any, Dict, List
+
+from agent_core.interview_config import (
+    InterviewConfig,
+    get_job_cache,
+    parse_room_metadata,
+    plan_version,
+    question_plan,
+)
+from agent_core.skills import match_skills, normalize_skills, skill_name
+
+logger = logging.getLogger("candidate-context")
+
+# Bump when the context's contents change, so old entries aren't reused (the
+# embedded question plan is versioned separately, see ``plan_version``)
+CONTEXT_VERSION = "1"
+MAX_CONTEXT_SKILLS = 5
+MAX_EXPERIENCE_CHARS = 300
+
+
+def resume_hash(config: InterviewConfig) -> str:
+    candidate = config.candidate
+    content = json.dumps([candidate.name, candidate.skills, candidate.experience])
+    return hashlib.sha1(content.encode()).hexdigest()[:16]
+
+
+def candidate_key(config: InterviewConfig) -> str:
+    """Who the context is for: the application, or the candidate's name without one"""
+    return config.application_id or config.candidate.name or "anonymous"
+
+
+def context_kind(config: InterviewConfig) -> str:
+    return f"candidate:{CONTEXT_VERSION}.{plan_version()}:{candidate_key(config)}:{resume_hash(config)}"
+
+
+def summarize_experience(experience: str, limit: int = MAX_EXPERIENCE_CHARS) -> str:
+    """Whitespace-collapsed experience, cut at a sentence (or word) boundary within ``limit``"""
+    text = re.sub(r"\s+", " ", experience).strip()
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    sentence_end = cut.rfind(". ")
+    if sentence_end >= limit // 2:
+        return cut[:sentence_end + 1]
+    return cut.rsplit(" ", 1)[0] + "..."
+
+
+def ranked_skills(config: InterviewConfig) -> List[str]:
+    """The candidate's skills, ones the job asks for first, as display names"""
+    job_skills = set(normalize_skills(config.job.skills_required + config.job.skills_preferred))
+    skills = normalize_skills(config.candidate.skills)
+    ranked = [key for key in skills if key in job_skills] + [key for key in skills if key not in job_skills]
+    return [skill_name(key) for key in ranked]
+
+
+def build_candidate_context(config: InterviewConfig) -> Dict[str, Any]:
+    candidate = config.candidate
+    overlap = match_skills(config.job.to_job_data(), {"skills": list(candidate.skills)})
+    skills = ranked_skills(config)
+    experience = summarize_experience(candidate.experience)
+    prompt = f"""CANDIDATE CONTEXT:
+- Name: {candidate.name or 'the candidate'}
+- Key Skills: {', '.join(skills[:MAX_CONTEXT_SKILLS])}
+- Experience: {experience or 'Not specified'}
+- Skill match with the role: {overlap['score']}%"""
+    if overlap["missing_required"]:
+        prompt += f"\n- Required skills not on the resume: {', '.join(overlap['missing_required'])}"
+
+    return {
+        "candidate": candidate_key(config),
+        "job": config.job.key,
+        "resume_hash": resume_hash(config),
+        "name": candidate.name,
+        "skills": skills,
+        "experience": experience,
+        "overlap": overlap,
+        "question_plan": question_plan(config),
+        "prompt": prompt,
+        "built_at": time.time(),
+    }
+
+
+def candidate_context(config: InterviewConfig) -> Dict[str, Any]:
+    """The cached context for this candidate, resume and job, building it on a miss
+
+    Shared with other sessions in the process; copy anything you modify.
+    """
+    return get_job_cache().get(config.job.key, context_kind(config), lambda: build_candidate_context(config))
+
+
+def precompute(metadata: str) -> Dict[str, Any]:
+    """Build and cache the context for room metadata (as sent when the interview is scheduled)"""
+    config = parse_room_metadata(metadata)
+    cache = get_job_cache()
+    misses = cache.misses
+    context = candidate_context(config)
+    logger.info(
+        f"Candidate context for {context['candidate']} / {context['job']} "
+        f"{'built' if cache.misses > misses else 'already cached'}"
+    )
+    return context
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("metadata", nargs="+", help="room metadata JSON files, or - for one JSON object per line on stdin")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    for source in args.metadata:
+        if source == "-":
+            documents = [line for line in sys.stdin if line.strip()]
+        else:
+            with open(source) as f:
+                documents = [f.read()]
+        for document in documents:
+            context = precompute(document)
+            print(json.dumps({key: context[key] for key in ("candidate", "job", "resume_hash", "skills", "overlap")}))
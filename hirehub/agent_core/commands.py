@@ -0,0 +1,93 @@
+"""Per-room command queue for RPCs that change interview state
+
+RPC handlers run as independent tasks, so two ``next_question`` calls a
+few milliseconds apart used to both advance the plan and both start a reply.
+``CommandQueue`` is a small actor: state-changing commands run one at a
+time, in arrival order, on one task per room.
+
+- A command submitted with a ``key`` while one with the same key is queued,
+  running, or finished less than ``window`` seconds ago shares that one's
+  result instead of running again (a double-clicked "next" advances once).
+- After each command a snapshot of the room's state is taken; read-only
+  RPCs return the latest one straight away instead of waiting in line or
+  reading state halfway through a change.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from agent_core.runtime import SessionRuntime
+
+logger = logging.getLogger("commands")
+
+# Seconds after a keyed command finishes during which a repeat shares its result
+DEFAULT_WINDOW = 1.0
+
+
+class CommandQueue:
+    def __init__(self, runtime: SessionRuntime, snapshot: Callable[[], Any]) -> None:
+        self.runtime = runtime
+        self._take_snapshot = snapshot
+        self.snapshot = snapshot()
+        self._queue: "asyncio.Queue[Tuple[str, Callable[[], Any], asyncio.Future]]" = asyncio.Queue()
+        # key -> (future, time it finished or None while queued/running)
+        self._recent: Dict[str, Tuple[asyncio.Future, Optional[float]]] = {}
+        runtime.spawn(self._run(), name="commands")
+
+    def submit(
+        self,
+        name: str,
+        command: Callable[[], Any],
+        key: Optional[str] = None,
+        window: float = DEFAULT_WINDOW,
+    ) -> "asyncio.Future":
+        """Queue ``command`` (sync or async); await the returned future for its result"""
+        if key is not None:
+            recent = self._recent.get(key)
+            if recent is not None:
+                future, finished = recent
+                if finished is None or time.monotonic() - finished < window:
+                    self.runtime.metrics.incr(f"command.{name}.coalesced")
+                    return future
+
+        future = asyncio.get_running_loop().create_future()
+        if key is not None:
+            self._recent[key] = (future, None)
+            future.add_done_callback(lambda _: self._finished(key, future))
+        self._queue.put_nowait((name, command, future))
+        self.runtime.metrics.peak("commands.queued", self._queue.qsize())
+        return future
+
+    async def call(self, name: str, command: Callable[[], Any], key: Optional[str] = None, window: float = DEFAULT_WINDOW) -> Any:
+        """Submit and wait; the caller giving up (e.g. an RPC timeout) doesn't cancel a shared command"""
+        return await asyncio.shield(self.submit(name, command, key=key, window=window))
+
+    def _finished(self, key: str, future: asyncio.Future) -> None:
+        if self._recent.get(key, (None,))[0] is future:
+            self._recent[key] = (future, time.monotonic())
+
+    async def _run(self) -> None:
+        while True:
+            name, command, future = await self._queue.get()
+            if future.done():
+                continue
+            metric = f"command.{name}"
+            self.runtime.metrics.incr(metric)
+            try:
+                with self.runtime.metrics.timer(metric):
+                    result = command()
+                    if inspect.isawaitable(result):
+                        result = await result
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                logger.exception(f"[{self.runtime.room}] {name} failed")
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                self.snapshot = self._take_snapshot()
@@ -0,0 +1,116 @@
+"""Per-turn deadlines for LLM calls
+
+A stalled LLM call used to leave the candidate sitting in silence. Each
+spoken turn now has a budget: if the model misses it, the slow call is
+cancelled and the agent says a fallback question picked from the session's
+question plan before the call started. Hits and misses are counted per
+model, per session and across the worker process.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Dict, Optional
+
+from agent_core.degradation import CONTROLLER
+from agent_core.metrics import SessionMetrics
+
+logger = logging.getLogger("deadlines")
+
+# Seconds to the first token of a streamed reply, and to a full one-shot completion
+FIRST_TOKEN_BUDGET = 3.0
+COMPLETION_BUDGET = 8.0
+
+# Said when the plan has no question left to fall back on
+GENERIC_FALLBACK = "Could you tell me a bit more about that?"
+
+
+def model_name(llm: Any) -> str:
+    return getattr(llm, "model", None) or type(llm).__name__
+
+
+class DeadlineStats:
+    """Deadline hits and misses per model, across every session in the process"""
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def record(self, model: str, missed: bool) -> None:
+        self.calls[model] = self.calls.get(model, 0) + 1
+        if missed:
+            self.misses[model] = self.misses.get(model, 0) + 1
+
+    def miss_rate(self, model: str) -> float:
+        calls = self.calls.get(model, 0)
+        return self.misses.get(model, 0) / calls if calls else 0.0
+
+    def summary(self) -> Dict[str, Dict]:
+        return {
+            model: {"calls": calls, "misses": self.misses.get(model, 0), "miss_rate": round(self.miss_rate(model), 3)}
+            for model, calls in self.calls.items()
+        }
+
+
+STATS = DeadlineStats()
+
+
+class TurnDeadlines:
+    def __init__(self, metrics: SessionMetrics) -> None:
+        self.metrics = metrics
+
+    def _record(self, model: str, missed: bool, elapsed: float) -> None:
+        STATS.record(model, missed)
+        CONTROLLER.record_call(failed=missed)
+        self.metrics.incr(f"deadline.{model}.calls")
+        self.metrics.observe(f"deadline.{model}", elapsed)
+        if missed:
+            self.metrics.incr(f"deadline.{model}.misses")
+            logger.warning(
+                f"[{self.metrics.room}] {model} missed its {elapsed:.1f}s deadline "
+                f"(process miss rate {STATS.miss_rate(model):.1%}); using fallback"
+            )
+
+    async def complete(
+        self,
+        call: Awaitable[str],
+        model: str,
+        fallback: Optional[str],
+        budget: float = COMPLETION_BUDGET,
+    ) -> str:
+        """Await a one-shot completion, cancelling it for ``fallback`` after ``budget`` seconds"""
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(call, budget)
+        except asyncio.TimeoutError:
+            self._record(model, True, budget)
+            return fallback or GENERIC_FALLBACK
+        self._record(model, False, time.perf_counter() - start)
+        return result
+
+    async def stream(
+        self,
+        chunks: AsyncIterable[Any],
+        model: str,
+        fallback: Optional[str],
+        budget: float = FIRST_TOKEN_BUDGET,
+    ) -> AsyncIterator[Any]:
+        """Relay a streamed reply, or ``fallback`` if no token arrives within ``budget`` seconds"""
+        start = time.perf_counter()
+        iterator = chunks.__aiter__()
+        try:
+            first = await asyncio.wait_for(iterator.__anext__(), budget)
+        except asyncio.TimeoutError:
+            self._record(model, True, budget)
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            yield fallback or GENERIC_FALLBACK
+            return
+        except StopAsyncIteration:
+            self._record(model, False, time.perf_counter() - start)
+            return
+        self._record(model, False, time.perf_counter() - start)
+        yield first
+        async for chunk in iterator:
+            yield chunk
@@ -0,0 +1,354 @@
+"""Load shedding: degrade features step by step instead of dropping rooms
+
+A worker under pressure used to keep running every room at full cost until
+rooms started timing out. ``Degradation`` (``CONTROLLER``) samples pressure
+every ``INTERVAL`` seconds from a background thread:
+
+- event-loop lag: the p95 of the loop monitors' pings in the interval;
+- CPU: the share of the node's CPU time spent busy (``/proc/stat``, or the
+  load average per core where there is none);
+- provider errors: the share of LLM calls in the interval that raised or
+  missed their deadline (``record_call``, fed by ``SessionRuntime.complete``
+  and ``TurnDeadlines``).
+
+Any signal over its high mark for ``ESCALATE_TICKS`` intervals in a row
+moves one level up; every signal under its low mark for ``RECOVER_TICKS``
+intervals moves one level back down. Levels are cumulative:
+
+1. ``defer_analysis``: per-answer analysis is queued and run in one batch
+   once pressure drops or the interview ends;
+2. ``cheap_models``: completions use ``CHEAP_MODELS`` substitutes;
+3. ``no_noise_cancellation``: new rooms start without noise cancellation
+   (rooms already running keep it);
+4. ``short_prompts``: prompts carry a third of the usual transcript history.
+
+Each job runs in its own process, so the level is the worker's, not the
+job's. ``AgentRuntime.run`` makes the main worker process the leader
+(``lead``): it owns the level and publishes it to ``level.json`` in
+``$DEGRADATION_STATE`` (a temporary directory unless set), which job
+processes inherit. Job processes follow: every interval they write their
+loop lag and LLM call counts to ``job-<pid>.json`` and read the level back,
+and a new room reads it before it starts. The leader adds those reports to
+its own readings (the worst lag, every job's calls), and ignores and
+deletes reports older than ``STALE_INTERVALS`` intervals (finished jobs). A
+process with neither role (a script, a test) samples for itself.
+
+Every change is logged with the readings behind it. ``$DEGRADATION=0``
+turns the controller off (level stays 0).
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from agent_core import loop_monitor
+from agent_core.metrics import percentile
+
+logger = logging.getLogger("degradation")
+
+LEVELS = ("normal", "defer_analysis", "cheap_models", "no_noise_cancellation", "short_prompts")
+
+INTERVAL = 5.0
+ESCALATE_TICKS = 2
+RECOVER_TICKS = 6
+
+# signal -> (high, low) marks
+THRESHOLDS = {
+    "lag": (0.2, 0.05),
+    "cpu": (0.85, 0.5),
+    "errors": (0.2, 0.05),
+}
+# Fewer calls than this in an interval say nothing about the error rate
+MIN_CALLS = 5
+# A job report this many intervals old is from a job that has ended
+STALE_INTERVALS = 3
+
+LEVEL_FILE = "level.json"
+
+CHEAP_MODELS = {
+    "gpt-4": "gpt-4o-mini",
+    "gpt-4o": "gpt-4o-mini",
+    "gpt-4-turbo": "gpt-4o-mini",
+}
+
+
+def enabled() -> bool:
+    return os.getenv("DEGRADATION", "1") != "0"
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    """Replace ``path`` atomically, so readers never see half a file"""
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "w") as f:
+        json.dump(data, f)
+    os.replace(partial, path)
+
+
+class NodeCPU:
+    """Busy share of the whole node's CPU time between readings (1.0 is every core busy)"""
+
+    def __init__(self, path: str = "/proc/stat") -> None:
+        self.path = path
+        self._last = self._times()
+
+    def _times(self) -> Optional[Tuple[float, float]]:
+        """(busy, total) jiffies across all cores, or None without /proc/stat"""
+        try:
+            with open(self.path) as f:
+                fields = [float(value) for value in f.readline().split()[1:9]]
+        except (OSError, ValueError):
+            return None
+        if len(fields) < 4:
+            return None
+        # idle and iowait
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0.0)
+        total = sum(fields)
+        return total - idle, total
+
+    def read(self) -> float:
+        times = self._times()
+        last, self._last = self._last, times
+        if times is None or last is None:
+            if not hasattr(os, "getloadavg"):
+                return 0.0
+            return os.getloadavg()[0] / (os.cpu_count() or 1)
+        busy, total = times[0] - last[0], times[1] - last[1]
+        return busy / total if total > 0 else 0.0
+
+
+class Degradation:
+    def __init__(self, interval: float = INTERVAL, state_dir: Optional[str] = None) -> None:
+        self.interval = interval
+        self.state_dir = state_dir
+        self.level = 0
+        self.changes = 0
+        self.readings: Dict[str, float] = {}
+        # Cumulative LLM calls in this process, and their values at the last sample
+        self._calls = 0
+        self._failures = 0
+        self._sampled = (0, 0)
+        # Each job report's calls and failures as of the leader's last sample
+        self._reports: Dict[str, Tuple[int, int]] = {}
+        self._high_ticks = 0
+        self._low_ticks = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._leader_pid: Optional[int] = None
+        self._cpu = NodeCPU()
+
+    @property
+    def leader(self) -> bool:
+        # By pid, so a job process forked from the leader doesn't think it leads
+        return self._leader_pid == os.getpid()
+
+    @property
+    def following(self) -> bool:
+        return self.state_dir is not None and not self.leader
+
+    def lead(self, state_dir: Optional[str] = None) -> None:
+        """Own the worker's level; called in the main worker process before any job starts"""
+        state_dir = state_dir or os.getenv("DEGRADATION_STATE") or tempfile.mkdtemp(prefix="degradation-")
+        os.makedirs(state_dir, exist_ok=True)
+        # Inherited by the job processes, which then follow
+        os.environ["DEGRADATION_STATE"] = state_dir
+        self.state_dir = state_dir
+        self._leader_pid = os.getpid()
+        self.publish()
+        self.start()
+
+    def start(self) -> None:
+        """Start sampling (idempotent); SessionRuntime does this for each new room"""
+        if not enabled():
+            return
+        if self.state_dir is None:
+            self.state_dir = os.getenv("DEGRADATION_STATE") or None
+        if self.following:
+            # A new room starts at the worker's current level, not this process's last one
+            self.follow()
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="degradation", daemon=True)
+        self._thread.start()
+
+    def active(self, mode: str) -> bool:
+        return self.level >= LEVELS.index(mode)
+
+    @property
+    def mode(self) -> str:
+        return LEVELS[self.level]
+
+    def model(self, name: str) -> str:
+        """``name``, or its cheaper substitute at ``cheap_models`` and above"""
+        return CHEAP_MODELS.get(name, name) if self.active("cheap_models") else name
+
+    def history(self, turns: int) -> int:
+        """Transcript turns to put in a prompt that normally carries ``turns``"""
+        return max(2, turns // 3) if self.active("short_prompts") else turns
+
+    def record_call(self, failed: bool) -> None:
+        with self._lock:
+            self._calls += 1
+            if failed:
+                self._failures += 1
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.step()
+            except Exception:
+                logger.exception("Degradation sampling failed")
+
+    def step(self) -> None:
+        """One interval: a follower reports and reads the level, anyone else samples and decides"""
+        if self.following:
+            self.report()
+            self.follow()
+            return
+        self.tick(self.sample())
+        if self.leader:
+            self.publish()
+
+    def _local_lag(self) -> float:
+        """p95 loop lag over the last interval, across this process's loops"""
+        pings = int(self.interval / loop_monitor.PING)
+        try:
+            lag = [sample for monitor in loop_monitor.monitors() for sample in list(monitor.lag)[-pings:]]
+        except RuntimeError:
+            # A loop's monitor was added or collected mid-read; skip lag this once
+            lag = []
+        return percentile(lag, 95)
+
+    def _local_calls(self) -> Tuple[int, int]:
+        """This process's calls and failures since the last sample"""
+        with self._lock:
+            calls, failures = self._calls, self._failures
+        last_calls, last_failures = self._sampled
+        self._sampled = (calls, failures)
+        return calls - last_calls, failures - last_failures
+
+    def _job_reports(self) -> Tuple[List[float], int, int]:
+        """Lag readings, and calls and failures since the last sample, from live jobs' reports"""
+        lags: List[float] = []
+        calls = failures = 0
+        now = time.time()
+        try:
+            names = [name for name in os.listdir(self.state_dir) if name.startswith("job-") and name.endswith(".json")]
+        except OSError:
+            return lags, calls, failures
+        for name in names:
+            path = os.path.join(self.state_dir, name)
+            report = _read_json(path)
+            if report is None:
+                continue
+            if now - report.get("at", 0.0) > STALE_INTERVALS * self.interval:
+                self._reports.pop(name, None)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            last_calls, last_failures = self._reports.get(name, (0, 0))
+            if report["calls"] < last_calls:
+                # The pid was reused by a new job
+                last_calls = last_failures = 0
+            self._reports[name] = (report["calls"], report["failures"])
+            calls += report["calls"] - last_calls
+            failures += report["failures"] - last_failures
+            lags.append(report["lag"])
+        for name in set(self._reports) - set(names):
+            del self._reports[name]
+        return lags, calls, failures
+
+    def sample(self) -> Dict[str, float]:
+        """Pressure readings since the last sample; the leader's include every job's"""
+        lag = self._local_lag()
+        calls, failures = self._local_calls()
+        if self.leader:
+            job_lags, job_calls, job_failures = self._job_reports()
+            lag = max([lag, *job_lags])
+            calls += job_calls
+            failures += job_failures
+
+        return {
+            "lag": lag,
+            "cpu": self._cpu.read(),
+            "errors": failures / calls if calls >= MIN_CALLS else 0.0,
+        }
+
+    def report(self) -> None:
+        """Follower: write this job's lag and cumulative call counts for the leader"""
+        with self._lock:
+            calls, failures = self._calls, self._failures
+        _write_json(os.path.join(self.state_dir, f"job-{os.getpid()}.json"), {
+            "at": time.time(),
+            "lag": self._local_lag(),
+            "calls": calls,
+            "failures": failures,
+        })
+
+    def follow(self) -> None:
+        """Follower: take the leader's published level"""
+        state = _read_json(os.path.join(self.state_dir, LEVEL_FILE))
+        if state is None:
+            return
+        self.readings = state.get("readings", {})
+        level = state.get("level", 0)
+        if isinstance(level, int) and 0 <= level < len(LEVELS) and level != self.level:
+            self._set_level(level, "set by the worker")
+
+    def publish(self) -> None:
+        """Leader: write the level for the job processes"""
+        _write_json(os.path.join(self.state_dir, LEVEL_FILE), {
+            "at": time.time(),
+            "level": self.level,
+            "mode": self.mode,
+            "readings": self.readings,
+        })
+
+    def tick(self, readings: Dict[str, float]) -> None:
+        """Move at most one level given one interval's readings"""
+        self.readings = readings
+        high = [name for name, value in readings.items() if value >= THRESHOLDS[name][0]]
+        low = all(value <= THRESHOLDS[name][1] for name, value in readings.items())
+        self._high_ticks = self._high_ticks + 1 if high else 0
+        self._low_ticks = self._low_ticks + 1 if low else 0
+
+        if self._high_ticks >= ESCALATE_TICKS and self.level < len(LEVELS) - 1:
+            self._set_level(self.level + 1, f"over the mark: {', '.join(high)}")
+        elif self._low_ticks >= RECOVER_TICKS and self.level > 0:
+            self._set_level(self.level - 1, "pressure cleared")
+
+    def _set_level(self, level: int, reason: str) -> None:
+        previous = self.level
+        self.level = level
+        self.changes += 1
+        self._high_ticks = self._low_ticks = 0
+        readings = ", ".join(f"{name} {value:.2f}" for name, value in self.readings.items())
+        log = logger.warning if level > previous else logger.info
+        log(f"Degradation {LEVELS[previous]} -> {LEVELS[level]} ({reason}; {readings})")
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "level": self.level,
+            "mode": self.mode,
+            "changes": self.changes,
+            "role": "leader" if self.leader else "follower" if self.following else "local",
+            "readings": {name: round(value, 3) for name, value in self.readings.items()},
+        }
+
+
+CONTROLLER = Degradation()
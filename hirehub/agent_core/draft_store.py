@@ -0,0 +1,190 @@
+"""Job posting drafts keyed by recruiter identity
+
+Active drafts stay in an in-memory LRU; everything is written through to a
+local SQLite file, so a recruiter who reconnects (to a new room, or to a new
+job process on the same worker) picks up where they left off. Idle drafts cost
+one SQLite row and no memory.
+
+Sessions save through ``save_async``/``discard_async``, which run the SQLite
+work on the store's single writer thread (so writes land in call order) rather
+than on the event loop. Every save also sweeps idle and expired drafts once
+``SWEEP_INTERVAL`` has passed since the last sweep.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from agent_core.job_draft import JobDraft
+
+logger = logging.getLogger("draft-store")
+
+DEFAULT_PATH = "job_drafts.sqlite3"
+# Drafts in memory at once, and their approximate serialized size in total
+DEFAULT_MAX_HOT = 256
+DEFAULT_MAX_HOT_BYTES = 8 * 1024 * 1024
+# Hot drafts untouched this long are dropped from memory (still on disk)
+DEFAULT_HOT_TTL = 15 * 60
+# Drafts untouched this long are deleted entirely
+DEFAULT_DRAFT_TTL = 7 * 24 * 60 * 60
+# Seconds between sweeps triggered by saves
+SWEEP_INTERVAL = 60
+
+
+class DraftStore:
+    def __init__(
+        self,
+        path: str = DEFAULT_PATH,
+        max_hot: int = DEFAULT_MAX_HOT,
+        max_hot_bytes: int = DEFAULT_MAX_HOT_BYTES,
+        hot_ttl: float = DEFAULT_HOT_TTL,
+        draft_ttl: float = DEFAULT_DRAFT_TTL,
+    ) -> None:
+        self.max_hot = max_hot
+        self.max_hot_bytes = max_hot_bytes
+        self.hot_ttl = hot_ttl
+        self.draft_ttl = draft_ttl
+        # identity -> (draft, last access, serialized size)
+        self._hot: "OrderedDict[str, Tuple[JobDraft, float, int]]" = OrderedDict()
+        self._hot_bytes = 0
+        self._lock = threading.Lock()
+        self._next_sweep = time.time() + SWEEP_INTERVAL
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="draft-writer")
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS drafts ("
+            " identity TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+
+    def get(self, identity: str) -> JobDraft:
+        """The recruiter's draft: from memory, else from disk, else a new one"""
+        now = time.time()
+        with self._lock:
+            entry = self._hot.get(identity)
+            if entry is not None:
+                self._hot[identity] = (entry[0], now, entry[2])
+                self._hot.move_to_end(identity)
+                return entry[0]
+
+            row = self._db.execute(
+                "SELECT data, updated_at FROM drafts WHERE identity = ?", (identity,)
+            ).fetchone()
+            if row is not None and now - row[1] <= self.draft_ttl:
+                draft = JobDraft(json.loads(row[0]))
+                draft.clear_dirty()
+                size = len(row[0])
+                logger.info(f"Resumed draft for {identity} ({draft.completion_percentage}% complete)")
+            else:
+                draft = JobDraft()
+                size = 0
+            self._admit(identity, draft, now, size)
+            return draft
+
+    async def get_async(self, identity: str) -> JobDraft:
+        """``get`` on the writer thread, after any save still queued there"""
+        return await asyncio.get_running_loop().run_in_executor(self._writer, self.get, identity)
+
+    def save(self, identity: str, draft: JobDraft) -> bool:
+        """Write the draft through to disk if it changed; returns True if written"""
+        if not self._needs_write(identity, draft):
+            return False
+        self._store(identity, draft, json.dumps(draft.to_dict()))
+        return True
+
+    async def save_async(self, identity: str, draft: JobDraft) -> bool:
+        """``save``, with the write on the writer thread instead of the event loop"""
+        if not self._needs_write(identity, draft):
+            return False
+        # Serialized here, so later edits on the loop don't race the writer
+        data = json.dumps(draft.to_dict())
+        await asyncio.get_running_loop().run_in_executor(self._writer, self._store, identity, draft, data)
+        return True
+
+    def discard(self, identity: str) -> None:
+        """Forget a draft, e.g. once it has been submitted"""
+        with self._lock:
+            entry = self._hot.pop(identity, None)
+            if entry is not None:
+                self._hot_bytes -= entry[2]
+            self._db.execute("DELETE FROM drafts WHERE identity = ?", (identity,))
+
+    async def discard_async(self, identity: str) -> None:
+        """``discard`` on the writer thread, after any save still queued there"""
+        await asyncio.get_running_loop().run_in_executor(self._writer, self.discard, identity)
+
+    def sweep(self) -> None:
+        """Drop idle drafts from memory and delete expired ones from disk"""
+        with self._lock:
+            self._sweep(time.time())
+
+    def hot_count(self) -> int:
+        return len(self._hot)
+
+    def close(self) -> None:
+        self._writer.shutdown(wait=True)
+        self._db.close()
+
+    def _needs_write(self, identity: str, draft: JobDraft) -> bool:
+        if draft.clear_dirty():
+            return True
+        with self._lock:
+            return identity not in self._hot
+
+    def _store(self, identity: str, draft: JobDraft, data: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._write(identity, data, now)
+            self._admit(identity, draft, now, len(data))
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+    def _sweep(self, now: float) -> None:
+        self._next_sweep = now + SWEEP_INTERVAL
+        for identity, (draft, last_access, size) in list(self._hot.items()):
+            if now - last_access <= self.hot_ttl:
+                break  # LRU order: everything after this is fresher
+            del self._hot[identity]
+            self._hot_bytes -= size
+            if draft.clear_dirty():
+                self._write(identity, json.dumps(draft.to_dict()), now)
+        self._db.execute("DELETE FROM drafts WHERE updated_at < ?", (now - self.draft_ttl,))
+
+    def _admit(self, identity: str, draft: JobDraft, now: float, size: int) -> None:
+        previous = self._hot.pop(identity, None)
+        if previous is not None:
+            self._hot_bytes -= previous[2]
+        self._hot[identity] = (draft, now, size)
+        self._hot_bytes += size
+
+        while len(self._hot) > 1 and (len(self._hot) > self.max_hot or self._hot_bytes > self.max_hot_bytes):
+            evicted_identity, (evicted, _, evicted_size) = self._hot.popitem(last=False)
+            self._hot_bytes -= evicted_size
+            # Saved drafts are already on disk; only unsaved edits need flushing
+            if evicted.clear_dirty():
+                self._write(evicted_identity, json.dumps(evicted.to_dict()), now)
+
+    def _write(self, identity: str, data: str, now: float) -> None:
+        self._db.execute(
+            "INSERT INTO drafts (identity, data, updated_at) VALUES (?, ?, ?)"
+            " ON CONFLICT(identity) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+            (identity, data, now),
+        )
+
+
+@lru_cache(maxsize=None)
+def get_draft_store(path: Optional[str] = None) -> DraftStore:
+    """Process-wide draft store; the file defaults to $JOB_DRAFTS_DB"""
+    return DraftStore(path or os.getenv("JOB_DRAFTS_DB", DEFAULT_PATH))
@@ -0,0 +1,388 @@
+"""Adaptive end-of-turn detection and barge-in handling
+
+Rather than waiting out a fixed silence timeout (or a frontend RPC), the end
+of a candidate's turn is decided from three signals:
+
+- VAD silence since the candidate stopped speaking;
+- interim STT stability, i.e. the transcript has stopped changing;
+- a local completion heuristic on the transcript ("... and um" is unfinished,
+  "... so that's how we shipped it." is not).
+
+How much silence is needed also depends on the candidate. Pauses they take
+mid-answer, and any time they carry on talking right after we committed their
+turn, widen their allowance for the rest of the session.
+
+``AdaptiveEndpointer`` is a plain state machine over timestamped events, so
+recorded sessions replay through it exactly as a live one runs (see
+``benchmarks/bench_endpointing.py``). ``bind_endpointer`` drives it from an
+AgentSession in manual turn-detection mode, committing user turns and
+interrupting agent speech itself.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from agent_core.runtime import SessionRuntime
+
+logger = logging.getLogger("endpointing")
+
+# Silence needed after a turn that sounds finished, and the most ever waited
+MIN_DELAY = 0.25
+MAX_DELAY = 2.0
+# Pause allowance for a candidate we know nothing about yet
+DEFAULT_ALLOWANCE = 1.4
+# Without a final transcript, the interim one must be unchanged this long
+STABLE_AFTER = 0.3
+# Speech resuming this soon after a commit means the candidate was cut off
+RESUME_WINDOW = 1.5
+# After a cut-off, how far the candidate's minimum wait moves towards the
+# pause that was cut short
+CUTOFF_STEP = 0.5
+# Weight of the newest pause in the running pause statistics
+PAUSE_ALPHA = 0.25
+# Candidate speech this long, or this many words that aren't a backchannel,
+# while the agent is talking counts as a barge-in
+BARGE_IN_MIN_SPEECH = 0.6
+BARGE_IN_MIN_WORDS = 2
+
+BACKCHANNELS = frozenset({
+    "yeah", "yes", "yep", "ok", "okay", "right", "sure", "mm", "mhm", "hmm",
+    "uh-huh", "mm-hmm", "got", "it", "i", "see", "cool", "great",
+})
+# A turn ending on one of these is almost certainly not over
+UNFINISHED = frozenset({
+    "and", "but", "so", "or", "because", "then", "if", "when", "while", "which",
+    "that", "the", "a", "an", "to", "of", "for", "with", "in", "on", "my", "our",
+    "we", "i", "um", "uh", "er", "like", "also", "was", "is", "were",
+})
+
+# VAD settings for sessions using the endpointer: report silence almost
+# immediately and let the endpointer decide what it means
+VAD_OPTIONS = {"min_silence_duration": 0.2}
+
+# Trace/fixture event kinds, in the format ``feed`` accepts
+EVENTS = ("speech_start", "speech_end", "interim", "final", "agent_start", "agent_stop")
+
+_WORD = re.compile(r"[a-z]+(?:[-'][a-z]+)*")
+
+
+def completion_score(text: str) -> float:
+    """How finished an utterance sounds, from 0 (mid-sentence) to 1"""
+    stripped = text.strip()
+    words = _WORD.findall(stripped.lower())
+    if not words:
+        return 0.0
+    if words[-1] in UNFINISHED or stripped.endswith(("-", "...")):
+        return 0.0
+    if stripped.endswith(","):
+        return 0.1
+    if stripped.endswith(("?", "!", ".")):
+        return 0.9
+    if len(words) < 3:
+        return 0.4
+    return 0.6
+
+
+class PauseProfile:
+    """How long this candidate pauses mid-answer, learned as they talk"""
+
+    def __init__(self, allowance: float = DEFAULT_ALLOWANCE) -> None:
+        self.mean = allowance / 2
+        self.deviation = allowance / 4
+        # Minimum wait even when a turn sounds finished, raised by cut-offs
+        self.floor = 0.0
+        self.pauses = 0
+        self.cutoffs = 0
+
+    def observe_pause(self, seconds: float) -> None:
+        self.pauses += 1
+        error = seconds - self.mean
+        self.mean += PAUSE_ALPHA * error
+        self.deviation += PAUSE_ALPHA * (abs(error) - self.deviation)
+
+    def observe_cutoff(self, seconds: float) -> None:
+        """The candidate resumed ``seconds`` after going quiet, but we had already committed"""
+        self.cutoffs += 1
+        self.floor += CUTOFF_STEP * max(0.0, seconds - self.floor)
+        self.observe_pause(seconds)
+
+    @property
+    def allowance(self) -> float:
+        return min(MAX_DELAY, max(MIN_DELAY, self.floor, self.mean + 2 * self.deviation))
+
+
+class AdaptiveEndpointer:
+    def __init__(
+        self,
+        on_end_of_turn: Callable[[str], Any],
+        on_barge_in: Optional[Callable[[], Any]] = None,
+        on_discard: Optional[Callable[[str], Any]] = None,
+        profile: Optional[PauseProfile] = None,
+        min_delay: float = MIN_DELAY,
+        max_delay: float = MAX_DELAY,
+    ) -> None:
+        self.on_end_of_turn = on_end_of_turn
+        self.on_barge_in = on_barge_in
+        self.on_discard = on_discard
+        self.profile = profile or PauseProfile()
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+        self.user_speaking = False
+        self.agent_speaking = False
+        self.speech_started_at: Optional[float] = None
+        self.silence_started_at: Optional[float] = None
+        self.last_change_at: Optional[float] = None
+        self.final_text: List[str] = []
+        self.interim_text = ""
+        self.barged_in = False
+        # Last commit, to notice when the candidate was cut off
+        self.committed_at: Optional[float] = None
+        self.committed_silence = 0.0
+        # Silence waited before each commit
+        self.delays: List[float] = []
+        # Events seen, in fixture format, when recording is on
+        self.trace: Optional[List[Dict]] = None
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.final_text + ([self.interim_text] if self.interim_text else []))
+
+    def feed(self, event: Dict) -> None:
+        """Apply one trace event (``{"t": ..., "event": ..., "text": ...}``)"""
+        kind, now = event["event"], event["t"]
+        if kind == "speech_start":
+            self.speech_start(now)
+        elif kind == "speech_end":
+            self.speech_end(now)
+        elif kind in ("interim", "final"):
+            self.transcript(event.get("text", ""), kind == "final", now)
+        elif kind in ("agent_start", "agent_stop"):
+            self.agent_state(kind == "agent_start", now)
+
+    def speech_start(self, now: float) -> None:
+        self._record(now, "speech_start")
+        if self.silence_started_at is not None and self.text:
+            # Resumed before we committed: an ordinary mid-turn pause
+            self.profile.observe_pause(now - self.silence_started_at)
+        elif self.committed_at is not None and now - self.committed_at <= RESUME_WINDOW:
+            self.profile.observe_cutoff(self.committed_silence + now - self.committed_at)
+            logger.info(f"Candidate cut off; pause allowance now {self.profile.allowance:.2f}s")
+        self.committed_at = None
+        self.user_speaking = True
+        self.speech_started_at = now
+        self.silence_started_at = None
+
+    def speech_end(self, now: float) -> None:
+        self._record(now, "speech_end")
+        self.user_speaking = False
+        self.speech_started_at = None
+        self.silence_started_at = now
+
+    def transcript(self, text: str, is_final: bool, now: float) -> None:
+        self._record(now, "final" if is_final else "interim", text)
+        text = text.strip()
+        if is_final:
+            if text:
+                self.final_text.append(text)
+            self.interim_text = ""
+        else:
+            self.interim_text = text
+        self.last_change_at = now
+        self.poll(now)
+
+    def agent_state(self, speaking: bool, now: float) -> None:
+        self._record(now, "agent_start" if speaking else "agent_stop")
+        self.agent_speaking = speaking
+        self.barged_in = False
+
+    def required_silence(self) -> float:
+        """Silence needed to end the turn as it stands"""
+        completion = completion_score(self.text)
+        floor = max(self.min_delay, self.profile.floor)
+        delay = floor + (self.profile.allowance - floor) * (1.0 - completion)
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def commit_deadline(self) -> Optional[float]:
+        """When the turn ends if the candidate stays quiet; None while they are talking"""
+        if self.user_speaking or self.silence_started_at is None or not self.text:
+            return None
+        deadline = self.silence_started_at + self.required_silence()
+        if self.interim_text:
+            # STT hasn't finalized the last words yet; wait for them to settle
+            deadline = max(deadline, self.last_change_at + STABLE_AFTER)
+        return deadline
+
+    def next_deadline(self) -> Optional[float]:
+        """When ``poll`` will next act if no other event arrives"""
+        deadlines = [self.commit_deadline()]
+        if self.agent_speaking and self.user_speaking and not self.barged_in:
+            deadlines.append(self.speech_started_at + BARGE_IN_MIN_SPEECH)
+        deadlines = [deadline for deadline in deadlines if deadline is not None]
+        return min(deadlines) if deadlines else None
+
+    def poll(self, now: float) -> None:
+        """Commit the turn or flag a barge-in if either is due"""
+        if self.agent_speaking and self.user_speaking and not self.barged_in:
+            words = [w for w in _WORD.findall(self.interim_text.lower()) if w not in BACKCHANNELS]
+            if now - self.speech_started_at >= BARGE_IN_MIN_SPEECH or len(words) >= BARGE_IN_MIN_WORDS:
+                self.barged_in = True
+                if self.on_barge_in is not None:
+                    self.on_barge_in()
+
+        deadline = self.commit_deadline()
+        if deadline is not None and now >= deadline:
+            if self.agent_speaking and not self.barged_in:
+                # A backchannel ("mm-hmm") while the agent talks is not a turn
+                self._discard()
+            else:
+                self._commit(now)
+
+    def _commit(self, now: float) -> None:
+        text = self.text
+        self.committed_at = now
+        self.committed_silence = now - self.silence_started_at
+        self.delays.append(self.committed_silence)
+        self.silence_started_at = None
+        self.last_change_at = None
+        self.final_text = []
+        self.interim_text = ""
+        self.on_end_of_turn(text)
+
+    def _discard(self) -> None:
+        text = self.text
+        self.silence_started_at = None
+        self.last_change_at = None
+        self.final_text = []
+        self.interim_text = ""
+        if self.on_discard is not None:
+            self.on_discard(text)
+
+    def _record(self, now: float, kind: str, text: Optional[str] = None) -> None:
+        if self.trace is not None:
+            event: Dict[str, Any] = {"t": now, "event": kind}
+            if text is not None:
+                event["text"] = text
+            self.trace.append(event)
+
+
+def replay(endpointer: AdaptiveEndpointer, events: Iterable[Dict], tail: float = 5.0) -> None:
+    """Run recorded events through an endpointer, firing deadlines in between"""
+    now = 0.0
+    for event in events:
+        if event["event"] not in EVENTS:
+            continue  # annotations such as "turn_end"
+        now = event["t"]
+        deadline = endpointer.next_deadline()
+        while deadline is not None and deadline <= now:
+            endpointer.poll(deadline)
+            following = endpointer.next_deadline()
+            if following == deadline:
+                break
+            deadline = following
+        endpointer.feed(event)
+        endpointer.poll(now)
+    deadline = endpointer.next_deadline()
+    if deadline is not None and deadline <= now + tail:
+        endpointer.poll(deadline)
+
+
+def load_trace(path: str) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def bind_endpointer(
+    runtime: SessionRuntime,
+    session: Any,
+    on_end_of_turn: Optional[Callable[[str], Any]] = None,
+    profile: Optional[PauseProfile] = None,
+) -> AdaptiveEndpointer:
+    """Drive an endpointer from an AgentSession created with ``turn_detection="manual"``
+
+    Each end of turn commits the user turn (so the agent replies) and then
+    calls ``on_end_of_turn``, if given, with its text. A barge-in interrupts the agent's
+    current speech; a backchannel that doesn't barge in is cleared. With ``$ENDPOINTING_TRACE_DIR`` set, the session's events
+    are written there as a replayable trace on shutdown.
+    """
+    loop = asyncio.get_event_loop()
+    timer: Optional[asyncio.TimerHandle] = None
+
+    def end_of_turn(text: str) -> None:
+        runtime.metrics.incr("endpointing.turns")
+        runtime.metrics.observe("endpointing.delay", endpointer.delays[-1])
+        session.commit_user_turn()
+        result = on_end_of_turn(text) if on_end_of_turn is not None else None
+        if inspect.isawaitable(result):
+            runtime.spawn(result, name="end_of_turn")
+
+    def barge_in() -> None:
+        runtime.metrics.incr("endpointing.barge_ins")
+        logger.info(f"[{runtime.room}] Barge-in, interrupting agent speech")
+        session.interrupt()
+
+    def discard(text: str) -> None:
+        runtime.metrics.incr("endpointing.backchannels")
+        session.clear_user_turn()
+
+    endpointer = AdaptiveEndpointer(end_of_turn, on_barge_in=barge_in, on_discard=discard, profile=profile)
+    trace_dir = os.getenv("ENDPOINTING_TRACE_DIR")
+    if trace_dir:
+        endpointer.trace = []
+
+    def tick() -> None:
+        nonlocal timer
+        timer = None
+        endpointer.poll(time.monotonic())
+        reschedule()
+
+    def reschedule() -> None:
+        nonlocal timer
+        if timer is not None:
+            timer.cancel()
+            timer = None
+        deadline = endpointer.next_deadline()
+        if deadline is not None and not runtime.closed:
+            timer = loop.call_later(max(0.0, deadline - time.monotonic()), tick)
+
+    @runtime.on(session, "user_state_changed")
+    def on_user_state_changed(event):
+        now = time.monotonic()
+        if event.new_state == "speaking":
+            endpointer.speech_start(now)
+        elif event.old_state == "speaking":
+            endpointer.speech_end(now)
+        reschedule()
+
+    @runtime.on(session, "user_input_transcribed")
+    def on_user_input_transcribed(event):
+        endpointer.transcript(event.transcript, event.is_final, time.monotonic())
+        reschedule()
+
+    @runtime.on(session, "agent_state_changed")
+    def on_agent_state_changed(event):
+        speaking = event.new_state == "speaking"
+        if speaking != endpointer.agent_speaking:
+            endpointer.agent_state(speaking, time.monotonic())
+            reschedule()
+
+    @runtime.on_shutdown
+    def close() -> None:
+        if timer is not None:
+            timer.cancel()
+        runtime.metrics.incr("endpointing.cutoffs", endpointer.profile.cutoffs)
+        if trace_dir and endpointer.trace:
+            start = endpointer.trace[0]["t"]
+            path = os.path.join(trace_dir, f"{runtime.room}-{int(time.time())}.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                for event in endpointer.trace:
+                    f.write(json.dumps({**event, "t": round(event["t"] - start, 3)}) + "\n")
+            logger.info(f"Wrote endpointing trace to {path}")
+
+    return endpointer
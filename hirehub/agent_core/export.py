@@ -0,0 +1,654 @@
+"""Columnar export of finished interviews for bulk analytics
+
+Interview results only left the agents as JSON over the data channel or in
+RPC replies. With ``$EXPORT_DIR`` set (and pyarrow installed), every session
+that ends is also appended to three tables, partitioned by day in Hive
+layout so DuckDB, ``pyarrow.dataset``, Spark or pandas read each table as
+one dataset:
+
+    <EXPORT_DIR>/turns/date=2026-10-19/part-<pid>-<time>-<n>.parquet
+    <EXPORT_DIR>/analyses/date=.../...
+    <EXPORT_DIR>/interviews/date=.../...
+
+- ``turns``: one row per transcript turn;
+- ``analyses``: one row per per-answer analysis (livekit-agent);
+- ``interviews``: one row per session: final scores, turn counts, LLM
+  latency and deadline misses, plus the full analysis and metrics as JSON.
+
+Sessions hand their rows to the process's ``Exporter`` thread, which
+appends one row group per table and day every ``FLUSH_SECONDS`` (or
+``FLUSH_ROWS`` rows) to a streaming Parquet writer, or an Arrow IPC file
+writer with ``$EXPORT_FORMAT=arrow``. Part files are written as ``.part``
+and renamed when closed (every ``ROLL_SECONDS``, at UTC midnight and at
+process exit), so readers never see a half-written file. A process that was
+killed leaves its ``.part`` files behind unreadable; the next exporter to
+start deletes those of processes that are gone. Timestamps are UTC, and so
+are the partition dates.
+
+Each job process runs one interview and has its own exporter. LiveKit ends
+job processes with ``os._exit``, so nothing registered with atexit runs and
+anything still buffered would be lost: when a session ends, its shutdown
+hook waits (off the event loop) for the exporter to write everything queued
+and close its part files. A worker therefore writes a small file per
+interview and table. Compact past days into one file per partition (a cron
+job after midnight UTC, say):
+
+    python -m agent_core.export --compact --out exports/
+
+Interviews recorded before export was on can be backfilled from a
+recording directory, with scores from a re-scoring run:
+
+    python -m agent_core.export recordings/ --out exports/ --scores rescoring/results.jsonl
+"""
+
+import argparse
+import asyncio
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+from agent_core.interview_config import InterviewConfig, load_interview_config
+from agent_core.metrics import percentile
+from agent_core.runtime import SessionRuntime
+from agent_core.scoring import SCORING_VERSION
+
+logger = logging.getLogger("export")
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+DEFAULT_FORMAT = "parquet"
+FLUSH_ROWS = 5000
+FLUSH_SECONDS = 10.0
+ROLL_SECONDS = 300.0
+# Finished interviews waiting for the writer; beyond this they are dropped, not blocked on
+MAX_QUEUED = 1000
+# Longest a session's shutdown waits for its rows to be written
+FLUSH_TIMEOUT = 30.0
+# Numbers part files across every exporter in the process, so names never collide
+_part_numbers = itertools.count(1)
+# Records a compaction in progress, so an interrupted one can be finished
+COMPACTION_JOURNAL = "_compacting.json"
+
+
+def _arrow() -> Optional[ModuleType]:
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def schemas(pa: ModuleType) -> Dict[str, Any]:
+    strings = pa.list_(pa.string())
+    common = [
+        ("interview_id", pa.string()),
+        ("room", pa.string()),
+        ("agent_type", pa.string()),
+    ]
+    return {
+        "turns": pa.schema(common + [
+            ("turn", pa.int32()),
+            ("timestamp", pa.timestamp("us", tz="UTC")),
+            ("speaker", pa.string()),
+            ("content", pa.string()),
+            ("question_id", pa.string()),
+        ]),
+        "analyses": pa.schema(common + [
+            ("answer_index", pa.int32()),
+            ("question", pa.string()),
+            ("answer", pa.string()),
+            ("confidence_level", pa.string()),
+            ("clarity_score", pa.float64()),
+            ("relevance_score", pa.float64()),
+            ("key_points", strings),
+            ("technical_skills", strings),
+            ("soft_skills", strings),
+        ]),
+        "interviews": pa.schema(common + [
+            ("ended_at", pa.timestamp("us", tz="UTC")),
+            ("duration_s", pa.float64()),
+            ("job_id", pa.string()),
+            ("job_title", pa.string()),
+            ("company", pa.string()),
+            ("turns", pa.int32()),
+            ("candidate_turns", pa.int32()),
+            ("candidate_words", pa.int32()),
+            ("overall_score", pa.float64()),
+            ("communication_score", pa.float64()),
+            ("experience_match", pa.float64()),
+            ("culture_fit", pa.float64()),
+            ("recommendation", pa.string()),
+            ("scoring_version", pa.string()),
+            ("llm_calls", pa.int32()),
+            ("llm_p50_ms", pa.float64()),
+            ("llm_p95_ms", pa.float64()),
+            ("deadline_misses", pa.int32()),
+            ("final_analysis", pa.string()),
+            ("metrics", pa.string()),
+        ]),
+    }
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _strings(value: Any) -> List[str]:
+    return [str(item) for item in value] if isinstance(value, list) else []
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    """An ISO timestamp in UTC; naive ones (as the transcript writes them) are local time"""
+    try:
+        return datetime.fromisoformat(value).astimezone(timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+def utc_today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def interview_rows(
+    interview_id: str,
+    room: str,
+    agent_type: str,
+    config: InterviewConfig,
+    turns: List[Dict[str, Any]],
+    analyses: List[Tuple[str, str, Dict[str, Any]]],
+    final: Optional[Dict[str, Any]],
+    metrics: Optional[Dict[str, Any]],
+    llm_latencies: List[float],
+    ended_at: datetime,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """One interview as rows of each table; ``llm_latencies`` in seconds, ``ended_at`` aware"""
+    common = {"interview_id": interview_id, "room": room, "agent_type": agent_type}
+    candidate = [turn for turn in turns if turn.get("speaker") == "candidate"]
+
+    deadline_misses = 0
+    duration = None
+    if metrics:
+        duration = metrics.get("duration_s")
+        deadline_misses = sum(
+            count for name, count in metrics.get("counters", {}).items()
+            if name.startswith("deadline.") and name.endswith(".misses")
+        )
+    elif turns:
+        start, end = _timestamp(turns[0].get("timestamp")), _timestamp(turns[-1].get("timestamp"))
+        if start and end:
+            duration = (end - start).total_seconds()
+
+    final = final or {}
+    return {
+        "turns": [
+            {
+                **common,
+                "turn": index,
+                "timestamp": _timestamp(turn.get("timestamp")),
+                "speaker": turn.get("speaker"),
+                "content": turn.get("content"),
+                "question_id": turn.get("question_id"),
+            }
+            for index, turn in enumerate(turns)
+        ],
+        "analyses": [
+            {
+                **common,
+                "answer_index": index,
+                "question": question,
+                "answer": answer,
+                "confidence_level": str(analysis.get("confidence_level", "")) or None,
+                "clarity_score": _number(analysis.get("clarity_score")),
+                "relevance_score": _number(analysis.get("relevance_score")),
+                "key_points": _strings(analysis.get("key_points")),
+                "technical_skills": _strings(analysis.get("technical_skills_mentioned")),
+                "soft_skills": _strings(analysis.get("soft_skills_demonstrated")),
+            }
+            for index, (question, answer, analysis) in enumerate(analyses)
+        ],
+        "interviews": [{
+            **common,
+            "ended_at": ended_at,
+            "duration_s": duration,
+            "job_id": config.job.id or None,
+            "job_title": config.job.title or None,
+            "company": config.job.company or None,
+            "turns": len(turns),
+            "candidate_turns": len(candidate),
+            "candidate_words": sum(len(str(turn.get("content", "")).split()) for turn in candidate),
+            "overall_score": _number(final.get("overall_score")),
+            "communication_score": _number(final.get("communication_score")),
+            "experience_match": _number(final.get("experience_match")),
+            "culture_fit": _number(final.get("culture_fit")),
+            "recommendation": final.get("recommendation"),
+            "scoring_version": SCORING_VERSION if final else None,
+            "llm_calls": len(llm_latencies),
+            "llm_p50_ms": percentile(llm_latencies, 50) * 1000 if llm_latencies else None,
+            "llm_p95_ms": percentile(llm_latencies, 95) * 1000 if llm_latencies else None,
+            "deadline_misses": deadline_misses,
+            "final_analysis": json.dumps(final) if final else None,
+            "metrics": json.dumps(metrics) if metrics else None,
+        }],
+    }
+
+
+class _PartFile:
+    """One open, growing part file of a table's day partition"""
+
+    def __init__(self, pa: ModuleType, path: str, schema: Any, fmt: str) -> None:
+        self.path = path
+        self.partial = path + ".part"
+        self.opened = time.monotonic()
+        self.rows = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if fmt == "arrow":
+            self._sink = pa.OSFile(self.partial, "wb")
+            self._writer = pa.ipc.new_file(self._sink, schema)
+        else:
+            self._sink = None
+            self._writer = pa.parquet.ParquetWriter(self.partial, schema, compression="zstd")
+
+    def write(self, table: Any) -> None:
+        self._writer.write_table(table)
+        self.rows += table.num_rows
+
+    def close(self) -> None:
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+        os.replace(self.partial, self.path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def remove_stale_parts(directory: str) -> int:
+    """Delete ``.part`` files left by exporter processes that no longer exist"""
+    removed = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            # part-<pid>-<time>-<n>.<format>.part, or compacted-<pid>-<time>...
+            fields = name.split("-")
+            if not name.endswith(".part") or fields[0] not in ("part", "compacted") or len(fields) < 3:
+                continue
+            if fields[1].isdigit() and _pid_alive(int(fields[1])):
+                continue
+            path = os.path.join(root, name)
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            removed += 1
+            logger.warning(f"Removed {path}, left unfinished by an exporter that exited")
+    return removed
+
+
+class Exporter:
+    """Streams interview rows into partitioned columnar files from a background thread"""
+
+    def __init__(
+        self,
+        directory: str,
+        fmt: str = DEFAULT_FORMAT,
+        flush_rows: int = FLUSH_ROWS,
+        flush_seconds: float = FLUSH_SECONDS,
+        roll_seconds: float = ROLL_SECONDS,
+    ) -> None:
+        pa = _arrow()
+        if pa is None:
+            raise RuntimeError("columnar export needs pyarrow (pip install pyarrow)")
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+        self.pa = pa
+        self.directory = directory
+        self.format = fmt
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.roll_seconds = roll_seconds
+        self.schemas = schemas(pa)
+        self.interviews = 0
+        self.dropped = 0
+        # Rows of one interview, a flush request (an Event to set once done), or None to stop
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=MAX_QUEUED)
+        # (table, day) -> buffered rows / open part file
+        self._buffers: Dict[Tuple[str, str], List[Dict]] = {}
+        self._files: Dict[Tuple[str, str], _PartFile] = {}
+        self._closed = False
+        remove_stale_parts(directory)
+        self._thread = threading.Thread(target=self._run, name="export", daemon=True)
+        self._thread.start()
+        # Runs in the worker's main process and CLIs; job processes exit with
+        # os._exit, so sessions there call flush() instead
+        atexit.register(self.close)
+
+    def submit(self, day: str, rows: Dict[str, List[Dict[str, Any]]], block: bool = False) -> bool:
+        """Queue one interview's rows for ``day`` (YYYY-MM-DD); False if the writer is too far behind"""
+        try:
+            self._queue.put((day, rows), block=block)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Export queue full, dropped an interview ({self.dropped} so far)")
+            return False
+        return True
+
+    def flush(self, timeout: Optional[float] = FLUSH_TIMEOUT) -> bool:
+        """Write everything queued so far and close the open part files; False on timeout
+
+        Blocks, so call it off the event loop.
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Write everything queued and close the part files"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        buffered = 0
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                item = ()
+            if item is None or isinstance(item, threading.Event):
+                self._flush()
+                self._roll(everything=True)
+                last_flush = time.monotonic()
+                buffered = 0
+                if item is None:
+                    return
+                item.set()
+                continue
+            if item:
+                day, rows = item
+                self.interviews += 1
+                for table, table_rows in rows.items():
+                    if table_rows:
+                        self._buffers.setdefault((table, day), []).extend(table_rows)
+                        buffered += len(table_rows)
+            if buffered >= self.flush_rows or time.monotonic() - last_flush >= self.flush_seconds:
+                self._flush()
+                self._roll()
+                last_flush = time.monotonic()
+                buffered = 0
+
+    def _flush(self) -> None:
+        """Append each buffered (table, day) as one row group"""
+        for key, rows in self._buffers.items():
+            table, day = key
+            try:
+                part = self._files.get(key)
+                if part is None:
+                    part = self._files[key] = _PartFile(self.pa, self._part_path(table, day), self.schemas[table], self.format)
+                part.write(self.pa.Table.from_pylist(rows, schema=self.schemas[table]))
+            except Exception:
+                logger.exception(f"Exporting {len(rows)} {table} rows for {day} failed")
+        self._buffers.clear()
+
+    def _roll(self, everything: bool = False) -> None:
+        """Close part files that are old enough or from a past day, making them visible"""
+        today = utc_today()
+        for key, part in list(self._files.items()):
+            if everything or key[1] != today or time.monotonic() - part.opened >= self.roll_seconds:
+                try:
+                    part.close()
+                    logger.info(f"Exported {part.rows} rows to {part.path}")
+                except Exception:
+                    logger.exception(f"Closing {part.partial} failed")
+                del self._files[key]
+
+    def _part_path(self, table: str, day: str) -> str:
+        name = f"part-{os.getpid()}-{time.strftime('%Y%m%d%H%M%S')}-{next(_part_numbers)}{FORMATS[self.format]}"
+        return os.path.join(self.directory, table, f"date={day}", name)
+
+
+_exporter: Optional[Exporter] = None
+_exporter_failed = False
+_exporter_lock = threading.Lock()
+
+
+def exporter() -> Optional[Exporter]:
+    """The process's exporter, if $EXPORT_DIR is set and pyarrow is installed"""
+    global _exporter, _exporter_failed
+    directory = os.getenv("EXPORT_DIR")
+    if not directory or _exporter_failed:
+        return None
+    with _exporter_lock:
+        if _exporter is None:
+            try:
+                _exporter = Exporter(directory, os.getenv("EXPORT_FORMAT", DEFAULT_FORMAT))
+            except (RuntimeError, ValueError) as e:
+                logger.warning(f"Columnar export disabled: {e}")
+                _exporter_failed = True
+                return None
+    return _exporter
+
+
+def start_export() -> None:
+    """Prewarm hook: import pyarrow and start the writer before any session, not on the event loop"""
+    exporter()
+
+
+class InterviewExport:
+    """One session's analyses and final scores, exported with its transcript when it ends"""
+
+    def __init__(self, runtime: SessionRuntime, config: InterviewConfig) -> None:
+        self.runtime = runtime
+        self.config = config
+        self.analyses: List[Tuple[str, str, Dict[str, Any]]] = []
+        self.final: Optional[Dict[str, Any]] = None
+
+    def add_analysis(self, question: str, answer: str, analysis: Any) -> None:
+        # Parsed from the model's reply, so not necessarily an object
+        self.analyses.append((question, answer, analysis if isinstance(analysis, dict) else {}))
+
+    def set_final(self, analysis: Dict[str, Any]) -> None:
+        self.final = analysis
+
+    def submit(self, target: Exporter) -> None:
+        runtime = self.runtime
+        llm_latencies = [
+            seconds for name, samples in runtime.metrics.timings.items() if name.startswith("llm") for seconds in samples
+        ]
+        rows = interview_rows(
+            self.config.interview_id or runtime.room,
+            runtime.room,
+            runtime.runtime.agent_type,
+            self.config,
+            runtime.transcript.turns(),
+            self.analyses,
+            self.final,
+            runtime.metrics.summary(),
+            llm_latencies,
+            datetime.now(timezone.utc),
+        )
+        if target.submit(utc_today(), rows):
+            runtime.metrics.incr("export.rows", sum(len(table_rows) for table_rows in rows.values()))
+
+
+def bind_export(runtime: SessionRuntime, config: InterviewConfig) -> InterviewExport:
+    """Collect the session's results; they are exported at shutdown if $EXPORT_DIR is set"""
+    export = InterviewExport(runtime, config)
+    target = exporter()
+    if target is not None:
+        async def finish() -> None:
+            export.submit(target)
+            # The job process may exit right after this hook; get the rows on disk first
+            if not await asyncio.to_thread(target.flush):
+                logger.warning(f"[{runtime.room}] export flush timed out; rows may be lost")
+
+        runtime.on_shutdown(finish)
+    return export
+
+
+def _write_json_file(path: str, data: Dict[str, Any]) -> None:
+    partial = path + ".part"
+    with open(partial, "w") as f:
+        json.dump(data, f)
+    os.replace(partial, path)
+
+
+def _finish_compaction(partition: str) -> None:
+    """Complete or undo a compaction of ``partition`` that was interrupted"""
+    journal_path = os.path.join(partition, COMPACTION_JOURNAL)
+    try:
+        with open(journal_path) as f:
+            journal = json.load(f)
+    except (OSError, ValueError):
+        return
+    output = os.path.join(partition, journal["output"])
+    if os.path.exists(output):
+        # The merged file made it; its inputs go
+        for name in journal["inputs"]:
+            try:
+                os.remove(os.path.join(partition, name))
+            except FileNotFoundError:
+                pass
+    elif os.path.exists(output + ".part"):
+        os.remove(output + ".part")
+    os.remove(journal_path)
+
+
+def compact_partition(pa: ModuleType, partition: str, schema: Any, fmt: str) -> Optional[str]:
+    """Merge a partition's closed files into one; returns the new file, if there was anything to merge
+
+    Files are cast to ``schema``, so ones written before timestamps were UTC merge too.
+    """
+    _finish_compaction(partition)
+    extension = FORMATS[fmt]
+    inputs = sorted(name for name in os.listdir(partition) if name.endswith(extension))
+    if len(inputs) < 2:
+        return None
+    paths = [os.path.join(partition, name) for name in inputs]
+    if fmt == "arrow":
+        tables = []
+        for path in paths:
+            with pa.memory_map(path) as source:
+                tables.append(pa.ipc.open_file(source).read_all())
+    else:
+        tables = [pa.parquet.read_table(path) for path in paths]
+    table = pa.concat_tables([piece.cast(schema) for piece in tables])
+
+    output = f"compacted-{os.getpid()}-{time.strftime('%Y%m%d%H%M%S')}{extension}"
+    _write_json_file(os.path.join(partition, COMPACTION_JOURNAL), {"output": output, "inputs": inputs})
+    part = _PartFile(pa, os.path.join(partition, output), table.schema, fmt)
+    part.write(table)
+    part.close()
+    _finish_compaction(partition)
+    logger.info(f"Compacted {len(inputs)} files ({table.num_rows} rows) into {part.path}")
+    return part.path
+
+
+def compact(directory: str, fmt: str = DEFAULT_FORMAT, before: Optional[str] = None) -> int:
+    """Compact every table's day partitions before ``before`` (default: today, UTC)"""
+    pa = _arrow()
+    if pa is None:
+        raise RuntimeError("columnar export needs pyarrow (pip install pyarrow)")
+    before = before or utc_today()
+    compacted = 0
+    for table, schema in sorted(schemas(pa).items()):
+        table_dir = os.path.join(directory, table)
+        if not os.path.isdir(table_dir):
+            continue
+        for name in sorted(os.listdir(table_dir)):
+            # Today's partition is still being written to
+            if not name.startswith("date=") or name[len("date="):] >= before:
+                continue
+            if compact_partition(pa, os.path.join(table_dir, name), schema, fmt):
+                compacted += 1
+    return compacted
+
+
+def _load_scores(path: str) -> Dict[str, Dict[str, Any]]:
+    """Re-scoring results by interview directory; the last entry for a directory wins"""
+    scores: Dict[str, Dict[str, Any]] = {}
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            scores[entry["directory"]] = entry["analysis"]
+    return scores
+
+
+def backfill(recordings: str, target: Exporter, scores: Dict[str, Dict[str, Any]]) -> int:
+    """Export every recorded interview (``<room>/interview.json``) under ``recordings``"""
+    from agent_core.rescoring import iter_interviews
+
+    count = 0
+    for directory in iter_interviews(recordings):
+        path = os.path.join(directory, "interview.json")
+        with open(path) as f:
+            interview = json.load(f)
+        turns = interview.get("transcript", [])
+        ended = _timestamp(turns[-1].get("timestamp")) if turns else None
+        ended = ended or datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+        config = load_interview_config(interview.get("metadata"))
+        rows = interview_rows(
+            config.interview_id or interview["room"],
+            interview["room"],
+            interview.get("agent_type", ""),
+            config,
+            turns,
+            [],
+            scores.get(os.path.basename(directory)),
+            None,
+            [],
+            ended,
+        )
+        target.submit(ended.date().isoformat(), rows, block=True)
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recordings", nargs="?", default=os.getenv("RECORDING_DIR"), help="recording directory (default $RECORDING_DIR)")
+    parser.add_argument("--out", default=os.getenv("EXPORT_DIR", "exports"), help="export directory (default $EXPORT_DIR)")
+    parser.add_argument("--format", default=os.getenv("EXPORT_FORMAT", DEFAULT_FORMAT), choices=list(FORMATS))
+    parser.add_argument("--scores", help="re-scoring results.jsonl to take final scores from")
+    parser.add_argument("--compact", action="store_true", help="merge past days' part files in --out instead of backfilling")
+    args = parser.parse_args()
+    if args.compact:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        print(f"Compacted {compact(args.out, args.format)} partitions in {args.out}")
+        raise SystemExit(0)
+    if not args.recordings:
+        parser.error("no recording directory given and $RECORDING_DIR is not set")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    target = Exporter(args.out, args.format, roll_seconds=float("inf"))
+    exported = backfill(args.recordings, target, _load_scores(args.scores) if args.scores else {})
+    target.close()
+    print(f"Exported {exported} interviews to {args.out} ({target.dropped} dropped)")
@@ -0,0 +1,188 @@
+"""Local intent matching for recruiter utterances
+
+Two signals are combined in a single pass over the tokens:
+
+- an Aho-Corasick automaton over token sequences finds every weighted key
+  phrase ("submit it", "read it back") at once, longest and shortest alike;
+- a multinomial naive Bayes model over unigrams and bigrams, trained at load
+  time on ``intent_corpus.jsonl``, covers phrasings the patterns miss and
+  pushes back when a key word is used in passing ("they'll review PRs").
+
+An intent with no key phrase in the utterance needs ``MODEL_ONLY_CONFIDENCE``
+from the model alone. With a small corpus, ordinary content statements ("we
+have an opening for a designer") can lean towards an action intent on a few
+shared words, and acting on one replaces the agent's reply.
+
+Everything runs in-process with no network calls.
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+PATTERNS_PATH = os.path.join(os.path.dirname(__file__), "intent_patterns.json")
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "intent_corpus.jsonl")
+
+OTHER = "other"
+# Log-odds added per unit of pattern weight
+PATTERN_SCALE = 1.0
+# Below this the top intent is reported as OTHER
+MIN_CONFIDENCE = 0.5
+# ...and below this when none of the intent's key phrases matched
+MODEL_ONLY_CONFIDENCE = 0.9
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+class IntentMatch(NamedTuple):
+    intent: str
+    confidence: float
+    # Whether one of the intent's key phrases occurs in the utterance
+    pattern: bool = False
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def features(tokens: List[str]) -> List[str]:
+    """Unigram and bigram features for the classifier"""
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton whose alphabet is tokens rather than characters"""
+
+    def __init__(self, patterns: Dict[str, Dict[str, float]]) -> None:
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[Tuple[str, float]]] = [[]]
+
+        for intent, phrases in patterns.items():
+            for phrase, weight in phrases.items():
+                state = 0
+                for token in tokenize(phrase):
+                    if token not in self.goto[state]:
+                        self.goto.append({})
+                        self.fail.append(0)
+                        self.out.append([])
+                        self.goto[state][token] = len(self.goto) - 1
+                    state = self.goto[state][token]
+                self.out[state].append((intent, weight))
+
+        # Breadth-first pass to fill failure links and merge outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def scan(self, tokens: Iterable[str]) -> Dict[str, float]:
+        """Sum the weights of every pattern occurrence, per intent"""
+        scores: Dict[str, float] = {}
+        state = 0
+        for token in tokens:
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+            for intent, weight in self.out[state]:
+                scores[intent] = scores.get(intent, 0.0) + weight
+        return scores
+
+
+class NaiveBayes:
+    def __init__(self, examples: Iterable[Tuple[str, str]]) -> None:
+        counts: Dict[str, Counter] = {}
+        docs: Counter = Counter()
+        for text, intent in examples:
+            docs[intent] += 1
+            counts.setdefault(intent, Counter()).update(features(tokenize(text)))
+
+        vocabulary = set()
+        for counter in counts.values():
+            vocabulary.update(counter)
+        total_docs = sum(docs.values())
+
+        self.intents = sorted(counts)
+        self.log_prior = {intent: math.log(docs[intent] / total_docs) for intent in self.intents}
+        self.log_likelihood: Dict[str, Dict[str, float]] = {}
+        self.log_unseen: Dict[str, float] = {}
+        for intent in self.intents:
+            denominator = sum(counts[intent].values()) + len(vocabulary)
+            self.log_likelihood[intent] = {
+                feature: math.log((count + 1) / denominator) for feature, count in counts[intent].items()
+            }
+            self.log_unseen[intent] = math.log(1 / denominator)
+        self.vocabulary = frozenset(vocabulary)
+
+    def log_scores(self, feats: List[str]) -> Dict[str, float]:
+        known = [f for f in feats if f in self.vocabulary]
+        scores = {}
+        for intent in self.intents:
+            likelihood = self.log_likelihood[intent]
+            unseen = self.log_unseen[intent]
+            scores[intent] = self.log_prior[intent] + sum(likelihood.get(f, unseen) for f in known)
+        return scores
+
+
+class IntentClassifier:
+    def __init__(self, patterns: Dict[str, Dict[str, float]], examples: Iterable[Tuple[str, str]]) -> None:
+        self.automaton = PhraseAutomaton(patterns)
+        self.model = NaiveBayes(examples)
+
+    @classmethod
+    def from_files(cls, patterns_path: str = PATTERNS_PATH, corpus_path: str = CORPUS_PATH) -> "IntentClassifier":
+        with open(patterns_path, encoding="utf-8") as f:
+            patterns = json.load(f)
+        return cls(patterns, load_corpus(corpus_path))
+
+    def rank(self, text: str) -> List[IntentMatch]:
+        """All intents ranked by confidence (softmax over combined scores)"""
+        tokens = tokenize(text)
+        scores = self.model.log_scores(features(tokens))
+        matched = self.automaton.scan(tokens)
+        for intent, weight in matched.items():
+            scores[intent] = scores.get(intent, 0.0) + PATTERN_SCALE * weight
+
+        top = max(scores.values())
+        exp_scores = {intent: math.exp(score - top) for intent, score in scores.items()}
+        total = sum(exp_scores.values())
+        return sorted(
+            (IntentMatch(intent, value / total, intent in matched) for intent, value in exp_scores.items()),
+            key=lambda match: match.confidence,
+            reverse=True,
+        )
+
+    def classify(self, text: str) -> IntentMatch:
+        """Best intent, or OTHER when nothing is confident enough"""
+        best = self.rank(text)[0]
+        threshold = MIN_CONFIDENCE if best.pattern else MODEL_ONLY_CONFIDENCE
+        if best.intent != OTHER and best.confidence < threshold:
+            return IntentMatch(OTHER, best.confidence)
+        return best
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[Tuple[str, str]]:
+    """Labeled utterances as (text, intent) pairs"""
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                examples.append((row["text"], row["intent"]))
+    return examples
+
+
+@lru_cache(maxsize=None)
+def load_intent_classifier() -> IntentClassifier:
+    """Build the classifier once per process"""
+    return IntentClassifier.from_files()
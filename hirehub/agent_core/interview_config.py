@@ -0,0 +1,325 @@
+"""Interview configuration from room metadata, with per-job derived artifacts
+
+Room metadata is parsed once into a validated ``InterviewConfig`` instead of
+each agent doing its own ``json.loads`` and nested ``.get`` chains. Three
+shapes are accepted: the one the interview room API sends
+(``{"job_data": ..., "resume_data": ..., "interview_id": ...}``), the flat
+``{"jobTitle": ..., "requiredSkills": ...}`` one and the snake_case one used
+by ``livekit-agent.py``.
+
+Everything derived from the job alone (prompts, question plans per probed
+skill) is cached by job, so concurrent interviews for the same posting
+share them. Job processes don't share memory, so the cache is an in-process
+LRU in front of a SQLite file every job process on the worker can read.
+Entries outlive a deploy, so every cached kind carries the version of what
+built it: ``job_prompt`` callers pass their builder's version, and plans
+carry ``PLAN_VERSION`` plus a digest of the question bank.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agent_core.question_bank import load_question_bank
+
+logger = logging.getLogger("interview-config")
+
+# Longest accepted text per field; longer values are truncated
+MAX_SHORT_TEXT = 200
+MAX_LONG_TEXT = 4000
+MAX_SKILLS = 30
+DEFAULT_MAX_QUESTIONS = 5
+DEFAULT_MAX_DURATION = 30
+
+DEFAULT_CACHE_PATH = "job_cache.sqlite3"
+DEFAULT_CACHE_ENTRIES = 256
+DEFAULT_CACHE_TTL = 24 * 60 * 60
+# Bump when plan_for_skill changes what it builds
+PLAN_VERSION = "1"
+
+
+class ConfigError(ValueError):
+    """Room metadata that can't be turned into an interview config"""
+
+
+@dataclass(frozen=True)
+class JobConfig:
+    id: str = ""
+    title: str = ""
+    company: str = ""
+    experience_level: str = ""
+    description: str = ""
+    skills_required: Tuple[str, ...] = ()
+    skills_preferred: Tuple[str, ...] = ()
+
+    @property
+    def key(self) -> str:
+        """Cache key: the job id plus a digest of its content, so edits invalidate"""
+        content = json.dumps(
+            [self.title, self.company, self.experience_level, self.description,
+             self.skills_required, self.skills_preferred],
+        )
+        return f"{self.id or 'job'}:{hashlib.sha1(content.encode()).hexdigest()[:16]}"
+
+    def to_job_data(self) -> Dict[str, Any]:
+        """The job in the jobs API shape the question bank reads"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "company": {"name": self.company},
+            "experienceLevel": self.experience_level,
+            "description": self.description,
+            "skillsRequired": list(self.skills_required),
+            "skillsPreferred": list(self.skills_preferred),
+        }
+
+
+@dataclass(frozen=True)
+class CandidateConfig:
+    name: str = ""
+    skills: Tuple[str, ...] = ()
+    experience: str = ""
+
+
+@dataclass(frozen=True)
+class InterviewConfig:
+    job: JobConfig = field(default_factory=JobConfig)
+    candidate: CandidateConfig = field(default_factory=CandidateConfig)
+    interview_id: str = ""
+    application_id: str = ""
+    max_questions: int = DEFAULT_MAX_QUESTIONS
+    max_duration: int = DEFAULT_MAX_DURATION
+
+
+def _text(data: Dict, name: str, path: str, limit: int = MAX_SHORT_TEXT) -> str:
+    value = data.get(name)
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    if not isinstance(value, str):
+        raise ConfigError(f"{path}.{name} must be a string")
+    return value.strip()[:limit]
+
+
+def _skills(data: Dict, name: str, path: str) -> Tuple[str, ...]:
+    value = data.get(name)
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ConfigError(f"{path}.{name} must be a list of strings")
+    skills: List[str] = []
+    seen = set()
+    for item in value:
+        item = item.strip()[:MAX_SHORT_TEXT]
+        if item and item.lower() not in seen:
+            seen.add(item.lower())
+            skills.append(item)
+    return tuple(skills[:MAX_SKILLS])
+
+
+def _bounded_int(data: Dict, name: str, default: int, low: int, high: int) -> int:
+    value = data.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ConfigError(f"{name} must be a number")
+    return max(low, min(high, int(value)))
+
+
+def _object(data: Dict, name: str) -> Dict:
+    value = data.get(name)
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise ConfigError(f"{name} must be an object")
+    return value
+
+
+def parse_interview_config(data: Dict) -> InterviewConfig:
+    """Validate decoded metadata (any of the accepted shapes)"""
+    if not isinstance(data, dict):
+        raise ConfigError("room metadata must be a JSON object")
+
+    if "job_data" in data or "resume_data" in data:
+        job_data = _object(data, "job_data")
+        resume_data = _object(data, "resume_data")
+        company = job_data.get("company")
+        if isinstance(company, dict):
+            company_name = _text(company, "name", "job_data.company")
+        else:
+            company_name = _text(job_data, "company", "job_data")
+        job = JobConfig(
+            id=_text(job_data, "id", "job_data"),
+            title=_text(job_data, "title", "job_data"),
+            company=company_name,
+            experience_level=_text(job_data, "experienceLevel", "job_data"),
+            description=_text(job_data, "description", "job_data", MAX_LONG_TEXT),
+            skills_required=_skills(job_data, "skillsRequired", "job_data"),
+            skills_preferred=_skills(job_data, "skillsPreferred", "job_data"),
+        )
+        candidate = CandidateConfig(
+            name=_text(resume_data, "name", "resume_data"),
+            skills=_skills(resume_data, "skills", "resume_data"),
+            experience=_text(resume_data, "experience", "resume_data", MAX_LONG_TEXT),
+        )
+    else:
+        # Flat camelCase or snake_case
+        job = JobConfig(
+            id=_text(data, "jobId", "metadata") or _text(data, "job_id", "metadata"),
+            title=_text(data, "jobTitle", "metadata") or _text(data, "job_title", "metadata"),
+            company=_text(data, "company", "metadata"),
+            experience_level=_text(data, "experienceLevel", "metadata") or _text(data, "experience_level", "metadata"),
+            description=_text(data, "description", "metadata", MAX_LONG_TEXT),
+            skills_required=_skills(data, "requiredSkills", "metadata") or _skills(data, "skills_to_evaluate", "metadata"),
+            skills_preferred=_skills(data, "preferredSkills", "metadata"),
+        )
+        candidate = CandidateConfig(
+            name=_text(data, "candidateName", "metadata"),
+            skills=_skills(data, "candidateSkills", "metadata"),
+        )
+
+    return InterviewConfig(
+        job=job,
+        candidate=candidate,
+        interview_id=_text(data, "interview_id", "metadata"),
+        application_id=_text(data, "application_id", "metadata"),
+        max_questions=_bounded_int(data, "max_questions", DEFAULT_MAX_QUESTIONS, 1, 20),
+        max_duration=_bounded_int(data, "max_duration", DEFAULT_MAX_DURATION, 1, 180),
+    )
+
+
+def parse_room_metadata(metadata: Optional[str]) -> InterviewConfig:
+    """Parse a room's metadata string, raising ConfigError if it is unusable"""
+    try:
+        data = json.loads(metadata or "{}")
+    except ValueError as e:
+        raise ConfigError(f"room metadata is not valid JSON: {e}") from None
+    return parse_interview_config(data)
+
+
+def load_interview_config(metadata: Optional[str], defaults: Optional[Dict] = None) -> InterviewConfig:
+    """Config for a room; falls back to ``defaults`` (metadata-shaped) if it is missing or invalid
+
+    Metadata that parses but describes no job takes its job from ``defaults``.
+    """
+    try:
+        if metadata:
+            config = parse_room_metadata(metadata)
+            if defaults is None or config.job != JobConfig():
+                return config
+            logger.warning("Room metadata has no job details; using the default job")
+            return replace(config, job=parse_interview_config(defaults).job)
+    except ConfigError as e:
+        logger.warning(f"Ignoring room metadata: {e}")
+    return parse_interview_config(defaults or {})
+
+
+class JobCache:
+    """Artifacts derived from a job, keyed by (job key, kind)
+
+    ``get`` may read and write SQLite, so on an event loop call it (or the
+    helpers below) through ``asyncio.to_thread``.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+        ttl: float = DEFAULT_CACHE_TTL,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.RLock()  # builds may read other artifacts
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS job_artifacts ("
+            " job_key TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (job_key, kind))"
+        )
+
+    def get(self, job_key: str, kind: str, build: Callable[[], Any]) -> Any:
+        """The cached artifact, building and storing it (as JSON) on a miss"""
+        key = (job_key, kind)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+            now = time.time()
+            row = self._db.execute(
+                "SELECT data, created_at FROM job_artifacts WHERE job_key = ? AND kind = ?", key
+            ).fetchone()
+            if row is not None and now - row[1] <= self.ttl:
+                value = json.loads(row[0])
+                self.hits += 1
+            else:
+                value = build()
+                self.misses += 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO job_artifacts (job_key, kind, data, created_at) VALUES (?, ?, ?, ?)",
+                    (job_key, kind, json.dumps(value), now),
+                )
+
+            self._memory[key] = value
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+            return value
+
+    def sweep(self) -> None:
+        """Delete artifacts older than the TTL"""
+        with self._lock:
+            self._db.execute("DELETE FROM job_artifacts WHERE created_at < ?", (time.time() - self.ttl,))
+
+    def close(self) -> None:
+        self._db.close()
+
+
+@lru_cache(maxsize=None)
+def get_job_cache(path: Optional[str] = None) -> JobCache:
+    """Process-wide job cache; the file defaults to $JOB_CACHE_DB"""
+    return JobCache(path or os.getenv("JOB_CACHE_DB", DEFAULT_CACHE_PATH))
+
+
+def job_prompt(config: InterviewConfig, name: str, build: Callable[[JobConfig], str], version: str) -> str:
+    """A prompt (or prompt section) that depends only on the job, built once per job
+
+    ``version`` is the builder's; bump it whenever ``build`` changes its output.
+    """
+    return get_job_cache().get(config.job.key, f"prompt:{name}:v{version}", lambda: build(config.job))
+
+
+def plan_version() -> str:
+    """Version of cached question plans: PLAN_VERSION and the question bank's digest"""
+    return f"{PLAN_VERSION}.{load_question_bank().digest}"
+
+
+def question_plan(config: InterviewConfig) -> List[Dict]:
+    """The interview question plan; only the probed skill depends on the candidate"""
+    bank = load_question_bank()
+    skill_key, skill_name = bank.choose_primary_skill(list(config.job.skills_required), list(config.candidate.skills))
+    plan = get_job_cache().get(
+        config.job.key,
+        f"plan:{plan_version()}:{skill_key}:{skill_name}",
+        lambda: bank.plan_for_skill(config.job.to_job_data(), skill_key, skill_name),
+    )
+    # Callers may annotate their questions; don't let that leak into the cache
+    return [dict(question) for question in plan]
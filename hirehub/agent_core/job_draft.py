@@ -0,0 +1,167 @@
+"""Job posting draft with incremental completion tracking and edit history
+
+``JobPostingAssistant`` used to keep a plain dict and re-derive completion,
+the missing-field list and the review summary on every utterance. ``JobDraft``
+updates completion as fields change and only re-renders derived text when the
+draft version has moved since the last render.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Field defaults, in the order the API expects them
+DEFAULTS: Dict[str, Any] = {
+    "title": "",
+    "description": "",
+    "requirements": "",
+    "jobType": "",
+    "experienceLevel": "",
+    "salaryMin": None,
+    "salaryMax": None,
+    "location": "",
+    "remoteAllowed": False,
+    "skillsRequired": [],
+    "skillsPreferred": [],
+}
+
+# Completion items -> the fields that satisfy them (any one is enough)
+COMPLETION_ITEMS: Dict[str, Tuple[str, ...]] = {
+    "job title": ("title",),
+    "job description": ("description",),
+    "requirements": ("requirements",),
+    "job type": ("jobType",),
+    "experience level": ("experienceLevel",),
+    "location": ("location",),
+    "required skills": ("skillsRequired",),
+    "preferred skills": ("skillsPreferred",),
+    "salary range": ("salaryMin", "salaryMax"),
+}
+
+ESSENTIAL_ITEMS = ("job title", "job description", "requirements", "job type")
+
+FIELD_LABELS = {
+    "title": "job title",
+    "description": "job description",
+    "requirements": "requirements",
+    "jobType": "job type",
+    "experienceLevel": "experience level",
+    "salaryMin": "salary range",
+    "salaryMax": "salary range",
+    "location": "location",
+    "remoteAllowed": "remote work option",
+    "skillsRequired": "required skills",
+    "skillsPreferred": "preferred skills",
+}
+
+# Undo depth; older edits are dropped
+MAX_HISTORY = 50
+
+_ITEMS_BY_FIELD: Dict[str, List[str]] = {}
+for _item, _fields in COMPLETION_ITEMS.items():
+    for _field in _fields:
+        _ITEMS_BY_FIELD.setdefault(_field, []).append(_item)
+
+
+class JobDraft:
+    def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
+        self._data: Dict[str, Any] = {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in DEFAULTS.items()
+        }
+        self._completed = set()
+        # Undoable edits, newest last; each is a list of (field, previous value)
+        self._history: List[List[Tuple[str, Any]]] = []
+        self._render_cache: Dict[str, Tuple[int, str]] = {}
+        self.version = 0
+        self.dirty_fields = set()
+
+        self.update(data or {}, record=False)
+
+    def __getitem__(self, field: str) -> Any:
+        return self._data[field]
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._data
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copy of the draft in the shape the jobs API accepts"""
+        return {key: list(value) if isinstance(value, list) else value for key, value in self._data.items()}
+
+    def set(self, field: str, value: Any, record: bool = True) -> bool:
+        """Set a single field, returning False if it is unknown or unchanged"""
+        return bool(self.update({field: value}, record=record))
+
+    def update(self, values: Dict[str, Any], record: bool = True) -> List[str]:
+        """Apply several field changes as one undoable edit; returns the fields changed"""
+        edit = []
+        for field, value in values.items():
+            if field not in self._data or self._data[field] == value:
+                continue
+            edit.append((field, self._data[field]))
+            self._data[field] = list(value) if isinstance(value, list) else value
+            self._touch(field)
+        if edit and record:
+            self._history.append(edit)
+            del self._history[:-MAX_HISTORY]
+        return [field for field, _ in edit]
+
+    def merged_list(self, field: str, items: Iterable[Any], key: Callable[[Any], Any] = lambda item: item) -> List[Any]:
+        """The list field with new items appended, skipping ones already present by ``key``"""
+        merged = list(self._data[field])
+        known = {key(item) for item in merged}
+        for item in items:
+            item_key = key(item)
+            if item_key not in known:
+                known.add(item_key)
+                merged.append(item)
+        return merged
+
+    def undo(self, field: Optional[str] = None) -> Optional[str]:
+        """Revert the most recent edit (touching ``field``, if given)
+
+        Returns a spoken label for what was reverted, or None if there was
+        nothing to undo.
+        """
+        for i in range(len(self._history) - 1, -1, -1):
+            edit = self._history[i]
+            if field is None or any(edited == field for edited, _ in edit):
+                del self._history[i]
+                for edited, previous in reversed(edit):
+                    self._data[edited] = previous
+                    self._touch(edited)
+                return FIELD_LABELS.get(edit[0][0], edit[0][0])
+        return None
+
+    def history(self, field: str) -> List[Any]:
+        """Previous values of a field, oldest first"""
+        return [previous for edit in self._history for edited, previous in edit if edited == field]
+
+    def _touch(self, field: str) -> None:
+        self.version += 1
+        self.dirty_fields.add(field)
+        for item in _ITEMS_BY_FIELD.get(field, ()):
+            if any(self._data[f] for f in COMPLETION_ITEMS[item]):
+                self._completed.add(item)
+            else:
+                self._completed.discard(item)
+
+    def clear_dirty(self) -> set:
+        """Return and reset the fields changed since the last call"""
+        dirty, self.dirty_fields = self.dirty_fields, set()
+        return dirty
+
+    @property
+    def completion_percentage(self) -> int:
+        return int((len(self._completed) / len(COMPLETION_ITEMS)) * 100)
+
+    def missing_fields(self, items: Iterable[str] = COMPLETION_ITEMS) -> List[str]:
+        """Completion items still missing, in conversation order"""
+        return [item for item in items if item not in self._completed]
+
+    def render(self, name: str, renderer: Callable[["JobDraft"], str]) -> str:
+        """Render derived text, reusing the cached copy until the draft changes"""
+        cached = self._render_cache.get(name)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        text = renderer(self)
+        self._render_cache[name] = (self.version, text)
+        return text
@@ -0,0 +1,174 @@
+"""Event-loop health: lag, blocking callbacks and pending tasks per room
+
+Every event loop running agent sessions gets one ``LoopMonitor``, a
+watchdog thread that posts a no-op callback to the loop every ``PING``
+seconds and times how long the loop takes to run it:
+
+- that delay is the loop's lag. The worst one in each ``INTERVAL`` goes into
+  every session's metrics, with the peak number of tasks it has pending;
+- if a ping is still waiting after ``SLOW_CALLBACK`` seconds, something is
+  holding the loop, and the watchdog samples the loop thread's stack while
+  it is still blocked. When the loop comes back, the block is counted
+  against every session on it and logged with the sample.
+
+A block is timed from the first ping it held up, so it can read up to
+``PING`` short. A lag spike can also come from many short callbacks in a row; the sample
+then shows whichever one was running. asyncio's own debug mode reports slow
+callbacks too, but slows every callback down; this costs one loop wakeup
+per ping and stays on in production unless ``$LOOP_MONITOR=0``.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from agent_core.metrics import percentile
+
+logger = logging.getLogger("loop-monitor")
+
+# Seconds between pings, and between lag samples recorded per session
+PING = 0.05
+INTERVAL = 0.5
+# The loop held this long counts as a slow callback
+SLOW_CALLBACK = 0.1
+# Slow callbacks (with stacks) kept per loop, and lag samples for the process summary
+MAX_SAMPLES = 20
+MAX_LAG_SAMPLES = 1200
+MAX_STACK_DEPTH = 40
+# At most one slow-callback warning per this many seconds
+LOG_INTERVAL = 5.0
+
+
+def enabled() -> bool:
+    return os.getenv("LOOP_MONITOR", "1") != "0"
+
+
+def collapsed_stack(frame: Any, limit: int = MAX_STACK_DEPTH) -> str:
+    """Root-first "file:function:line;..." (the collapsed-stack format flame graphs read)"""
+    frames = traceback.extract_stack(frame, limit=limit)
+    return ";".join(f"{os.path.basename(f.filename)}:{f.name}:{f.lineno}" for f in frames)
+
+
+class LoopMonitor:
+    def __init__(self, loop: asyncio.AbstractEventLoop, threshold: float = SLOW_CALLBACK) -> None:
+        self.loop = loop
+        self.threshold = threshold
+        self.sessions: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self.lag: Deque[float] = deque(maxlen=MAX_LAG_SAMPLES)
+        self.slow: Deque[Dict[str, Any]] = deque(maxlen=MAX_SAMPLES)
+        self.slow_count = 0
+        self.pings = 0
+        # Ping the loop has answered last, and the stack sampled for a ping it hasn't
+        self._answered = 0.0
+        self._sample: Optional[Tuple[float, str]] = None
+        self._worst = 0.0
+        self._last_interval = time.monotonic()
+        self._last_logged = 0.0
+        self._thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def watch(self, session: Any) -> None:
+        """Start reporting into ``session`` (a SessionRuntime) until it closes"""
+        self.sessions.add(session)
+        if self._thread is None or not self._thread.is_alive():
+            self._thread_id = threading.get_ident()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watchdog, name="loop-monitor", daemon=True)
+            self._thread.start()
+
+    def unwatch(self, session: Any) -> None:
+        self.sessions.discard(session)
+        if not self.sessions:
+            self._stop.set()
+
+    def _watchdog(self) -> None:
+        """Ping the loop; sample its stack once per ping it sits on for too long"""
+        while not self._stop.is_set():
+            posted = time.monotonic()
+            try:
+                self.loop.call_soon_threadsafe(self._answer, posted)
+            except RuntimeError:
+                # Loop closed
+                return
+            sampled = False
+            while not self._stop.wait(PING) and self._answered < posted:
+                if not sampled and time.monotonic() - posted >= self.threshold:
+                    frame = sys._current_frames().get(self._thread_id)
+                    if frame is not None:
+                        self._sample = (posted, collapsed_stack(frame))
+                    sampled = True
+
+    def _answer(self, posted: float) -> None:
+        """Runs on the loop: record how long the ping waited"""
+        now = time.monotonic()
+        self._answered = posted
+        lag = now - posted
+        self.pings += 1
+        self.lag.append(lag)
+        self._worst = max(self._worst, lag)
+        if lag >= self.threshold:
+            sample = self._sample[1] if self._sample is not None and self._sample[0] == posted else None
+            self._record_slow(lag, sample)
+        self._sample = None
+
+        if now - self._last_interval >= INTERVAL:
+            for session in list(self.sessions):
+                session.metrics.observe("loop.lag", self._worst)
+                session.metrics.peak("loop.pending_tasks", session.pending_tasks)
+            self._worst = 0.0
+            self._last_interval = now
+
+    def _record_slow(self, blocked: float, sample: Optional[str]) -> None:
+        self.slow_count += 1
+        self.slow.append({"at": time.time(), "blocked_s": round(blocked, 3), "stack": sample})
+        sessions = list(self.sessions)
+        for session in sessions:
+            session.metrics.incr("loop.slow_callbacks")
+            session.metrics.observe("loop.blocked", blocked)
+
+        if time.monotonic() - self._last_logged >= LOG_INTERVAL:
+            self._last_logged = time.monotonic()
+            rooms = ", ".join(sorted(session.room for session in sessions))
+            where = sample.rsplit(";", 6)[1:] if sample else ["no stack sample"]
+            logger.warning(f"Event loop blocked {blocked * 1000:.0f}ms (rooms: {rooms}); in {' <- '.join(reversed(where))}")
+
+    def summary(self) -> Dict[str, Any]:
+        lag = list(self.lag)
+        return {
+            "pings": self.pings,
+            "lag_ms": {
+                "p50": round(percentile(lag, 50) * 1000, 2),
+                "p99": round(percentile(lag, 99) * 1000, 2),
+                "max": round(max(lag, default=0.0) * 1000, 2),
+            },
+            "slow_callbacks": self.slow_count,
+            "pending_tasks": len(asyncio.all_tasks(self.loop)),
+        }
+
+    def slowest(self, count: int = 3) -> List[Dict[str, Any]]:
+        return sorted(self.slow, key=lambda sample: sample["blocked_s"], reverse=True)[:count]
+
+
+_monitors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LoopMonitor]" = weakref.WeakKeyDictionary()
+
+
+def monitor_for(loop: Optional[asyncio.AbstractEventLoop] = None) -> LoopMonitor:
+    """The monitor for ``loop`` (default: the running one)"""
+    loop = loop or asyncio.get_running_loop()
+    monitor = _monitors.get(loop)
+    if monitor is None:
+        monitor = _monitors[loop] = LoopMonitor(loop)
+    return monitor
+
+
+def monitors() -> List[LoopMonitor]:
+    """Every loop monitor in this process (one per loop running sessions)"""
+    return list(_monitors.values())
@@ -0,0 +1,63 @@
+"""Lightweight per-session instrumentation"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger("agent-metrics")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class SessionMetrics:
+    def __init__(self, agent_type: str, room: str) -> None:
+        self.agent_type = agent_type
+        self.room = room
+        self.started_at = time.monotonic()
+        self.counters: Dict[str, int] = {}
+        self.timings: Dict[str, List[float]] = {}
+        self.peaks: Dict[str, float] = {}
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.timings.setdefault(name, []).append(seconds)
+
+    def peak(self, name: str, value: float) -> None:
+        """Keep the highest value seen for a gauge (pending tasks...)"""
+        if value > self.peaks.get(name, 0):
+            self.peaks[name] = value
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Time a block (sync or spanning awaits) into ``name``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def summary(self) -> Dict:
+        return {
+            "agent_type": self.agent_type,
+            "room": self.room,
+            "duration_s": round(time.monotonic() - self.started_at, 3),
+            "counters": dict(self.counters),
+            "peaks": dict(self.peaks),
+            "timings_ms": {
+                name: {
+                    "count": len(samples),
+                    "p50": round(percentile(samples, 50) * 1000, 2),
+                    "p95": round(percentile(samples, 95) * 1000, 2),
+                    "max": round(max(samples) * 1000, 2),
+                }
+                for name, samples in self.timings.items()
+            },
+        }
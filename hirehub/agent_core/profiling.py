@@ -0,0 +1,226 @@
+"""On-demand CPU and memory profiling for a running agent process
+
+Off unless ``$PROFILE_DIR`` is set. Then, in any agent job process:
+
+- ``kill -USR1 <pid>`` samples every thread's stack for ``$PROFILE_SECONDS``
+  (default 30) and writes ``cpu-<pid>-<time>.collapsed``: one
+  "thread;frame;frame... count" line per distinct stack, which
+  flamegraph.pl, speedscope and inferno read as-is;
+- ``kill -USR2 <pid>`` starts tracemalloc the first time, and on later
+  signals writes ``memory-<pid>-<time>.txt``: the allocation sites that grew
+  most since the previous snapshot.
+
+Agents that call ``bind_profiling`` also take a ``profile`` RPC, for callers
+listed in ``$PROFILE_RPC_IDENTITIES``, with a JSON payload of
+``{"action": "cpu", "seconds": 10}``, ``{"action": "memory"}`` or
+``{"action": "memory_stop"}``. Job processes run one room each, so a memory
+snapshot is that room's growth; the RPC reply adds the session's own
+transcript, metrics and task counts.
+
+The sampler is a plain thread reading ``sys._current_frames()``, so it costs
+the process one stack walk per ``SAMPLE_INTERVAL`` while running, and
+nothing otherwise. tracemalloc slows allocation noticeably while tracing, so
+stop it when done.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from agent_core.runtime import SessionRuntime
+
+logger = logging.getLogger("profiling")
+
+SAMPLE_INTERVAL = 0.005
+DEFAULT_SECONDS = 30
+MAX_SECONDS = 300
+TRACEMALLOC_FRAMES = 10
+TOP_ALLOCATIONS = 25
+
+
+def profile_dir() -> Optional[str]:
+    return os.getenv("PROFILE_DIR") or None
+
+
+def _output_path(directory: str, kind: str, extension: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{kind}-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}.{extension}")
+
+
+class SamplingProfiler:
+    """Stack-sampling thread; one run at a time per process"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self._thread: Optional[threading.Thread] = None
+        self._labels: Dict[Any, str] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, path: str) -> bool:
+        """Profile for ``seconds`` in the background; False if a run is already going"""
+        if self.running:
+            return False
+        seconds = max(0.1, min(float(seconds), MAX_SECONDS))
+        self._thread = threading.Thread(target=self._run, args=(seconds, path), name="profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"Profiling for {seconds:.0f}s into {path}")
+        return True
+
+    def _label(self, code: Any) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+        return label
+
+    def sample(self, stacks: Counter, skip: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == skip:
+                continue
+            labels: List[str] = []
+            while frame is not None:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+            labels.append(names.get(thread_id, str(thread_id)))
+            stacks[";".join(reversed(labels))] += 1
+
+    def _run(self, seconds: float, path: str) -> None:
+        stacks: Counter = Counter()
+        me = threading.get_ident()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self.sample(stacks, me)
+            samples += 1
+            time.sleep(self.interval)
+        with open(path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        logger.info(f"Wrote {samples} samples ({len(stacks)} distinct stacks) to {path}")
+
+
+class MemoryTracker:
+    """tracemalloc snapshots diffed against the previous one"""
+
+    def __init__(self) -> None:
+        self._previous: Optional[tracemalloc.Snapshot] = None
+
+    def snapshot(self, directory: str, label: str = "") -> Dict[str, Any]:
+        """Start tracing, or write the growth since the last snapshot"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._previous = tracemalloc.take_snapshot()
+            logger.info("tracemalloc started")
+            return {"status": "started"}
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        growth = snapshot.compare_to(self._previous, "lineno")[:TOP_ALLOCATIONS]
+        self._previous = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+
+        path = _output_path(directory, "memory", "txt")
+        with open(path, "w") as f:
+            f.write(f"# {label or 'process'}: traced {current / 2**20:.1f} MiB (peak {peak / 2**20:.1f} MiB)\n")
+            for stat in growth:
+                f.write(f"{stat}\n")
+        logger.info(f"Wrote tracemalloc growth to {path}")
+        return {
+            "status": "snapshot",
+            "path": path,
+            "traced_mib": round(current / 2**20, 2),
+            "top": [str(stat) for stat in growth[:5]],
+        }
+
+    def stop(self) -> Dict[str, Any]:
+        tracemalloc.stop()
+        self._previous = None
+        return {"status": "stopped"}
+
+
+PROFILER = SamplingProfiler()
+MEMORY = MemoryTracker()
+
+
+def session_footprint(runtime: SessionRuntime) -> Dict[str, Any]:
+    """Sizes of the per-room state we keep, which is what grows with a long interview"""
+    return {
+        "room": runtime.room,
+        "transcript_turns": len(runtime.transcript),
+        "timing_samples": sum(len(samples) for samples in runtime.metrics.timings.values()),
+        "pending_tasks": runtime.pending_tasks,
+    }
+
+
+def install_signal_handlers() -> None:
+    """SIGUSR1 profiles CPU, SIGUSR2 snapshots memory; a prewarm hook, as it must run on the main thread
+
+    Jobs run as threads (``JobExecutorType.THREAD``) prewarm off the main
+    thread, where ``signal.signal`` raises; those rely on the ``profile`` RPC.
+    """
+    directory = profile_dir()
+    if directory is None or not hasattr(signal, "SIGUSR1"):
+        return
+    if threading.current_thread() is not threading.main_thread():
+        logger.info("Not on the main thread; profiling signals not installed (use the profile RPC)")
+        return
+    seconds = float(os.getenv("PROFILE_SECONDS", DEFAULT_SECONDS))
+
+    def on_usr1(signum, frame):
+        PROFILER.start(seconds, _output_path(directory, "cpu", "collapsed"))
+
+    def on_usr2(signum, frame):
+        # tracemalloc.take_snapshot can take a while; don't do it inside the handler
+        threading.Thread(target=MEMORY.snapshot, args=(directory,), name="memory-snapshot", daemon=True).start()
+
+    signal.signal(signal.SIGUSR1, on_usr1)
+    signal.signal(signal.SIGUSR2, on_usr2)
+    logger.info(f"Profiling signals installed (pid {os.getpid()}, output {directory})")
+
+
+def bind_profiling(runtime: SessionRuntime, participant: Any) -> None:
+    """Register the ``profile`` RPC, if profiling and its callers are configured"""
+    directory = profile_dir()
+    allowed = {identity.strip() for identity in os.getenv("PROFILE_RPC_IDENTITIES", "").split(",") if identity.strip()}
+    if directory is None or not allowed:
+        return
+
+    @runtime.rpc(participant, "profile")
+    async def profile(data):
+        if data.caller_identity not in allowed:
+            logger.warning(f"[{runtime.room}] profile RPC refused for {data.caller_identity}")
+            return json.dumps({"error": "not allowed"})
+        try:
+            request = json.loads(data.payload or "{}")
+        except ValueError:
+            return json.dumps({"error": "payload must be JSON"})
+        if not isinstance(request, dict):
+            return json.dumps({"error": "payload must be a JSON object"})
+
+        action = request.get("action", "cpu")
+        if action == "cpu":
+            seconds = request.get("seconds", DEFAULT_SECONDS)
+            path = _output_path(directory, "cpu", "collapsed")
+            if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or not PROFILER.start(seconds, path):
+                return json.dumps({"error": "bad duration or a profile is already running"})
+            return json.dumps({"status": "profiling", "path": path})
+        if action == "memory":
+            result = await asyncio.to_thread(MEMORY.snapshot, directory, runtime.room)
+            return json.dumps({**result, "session": session_footprint(runtime)})
+        if action == "memory_stop":
+            return json.dumps(MEMORY.stop())
+        return json.dumps({"error": f"unknown action {action!r}"})
+
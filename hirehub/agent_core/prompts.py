@@ -0,0 +1,125 @@
+"""Prompt assembly ordered for provider-side prefix caching
+
+Providers cache the longest previously seen prompt prefix, so every prompt is
+laid out from most to least shared:
+
+1. stable: the agent's instructions, identical for every session;
+2. job: the job section, identical for every interview for that job (and
+   built once per job, see ``interview_config.job_prompt``);
+3. candidate: this candidate's context;
+4. turn: the request for this call.
+
+Sections are normalized so the same content always produces the same bytes,
+and stable + job go in one system message so their prefix is shared by every
+call in every session for the job. Prompt and cached token counts from the
+API usage fields are recorded per call site, with TTFT split by whether the
+prefix was served from cache.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from agent_core.metrics import SessionMetrics
+
+logger = logging.getLogger("prompts")
+
+SECTION_SEPARATOR = "\n\n"
+
+
+def normalize(text: str) -> str:
+    """Canonical bytes for a section: unix newlines, no trailing whitespace"""
+    lines = text.replace("\r\n", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+@dataclass(frozen=True)
+class Prompt:
+    stable: str
+    job: str = ""
+    candidate: str = ""
+    turn: str = ""
+
+    @property
+    def prefix(self) -> str:
+        """Stable + job sections, byte-identical across sessions for the same job"""
+        return SECTION_SEPARATOR.join(part for part in (normalize(self.stable), normalize(self.job)) if part)
+
+    @property
+    def instructions(self) -> str:
+        """Everything but the turn, e.g. for an Agent's instructions"""
+        return SECTION_SEPARATOR.join(part for part in (self.prefix, normalize(self.candidate)) if part)
+
+    def messages(self) -> List[Tuple[str, str]]:
+        """(role, content) pairs, shared prefix first"""
+        messages = [("system", self.prefix)]
+        if self.candidate:
+            messages.append(("system", normalize(self.candidate)))
+        if self.turn:
+            messages.append(("user", normalize(self.turn)))
+        return messages
+
+    def prefix_digest(self) -> str:
+        return hashlib.sha1(self.prefix.encode()).hexdigest()[:12]
+
+    def with_turn(self, turn: str) -> "Prompt":
+        return Prompt(self.stable, self.job, self.candidate, turn)
+
+
+def record_usage(
+    metrics: SessionMetrics,
+    name: str,
+    prompt_tokens: int,
+    cached_tokens: int,
+    completion_tokens: int = 0,
+    ttft: Optional[float] = None,
+) -> None:
+    """Count one call's tokens under ``name`` (a call site such as "llm.analysis")"""
+    metrics.incr(f"tokens.{name}.prompt", prompt_tokens)
+    metrics.incr(f"tokens.{name}.cached", cached_tokens)
+    metrics.incr(f"tokens.{name}.completion", completion_tokens)
+    if ttft is not None:
+        metrics.observe(f"ttft.{name}.{'cached' if cached_tokens else 'uncached'}", ttft)
+
+
+def record_completion_usage(metrics: SessionMetrics, name: str, usage: Any, ttft: Optional[float] = None) -> None:
+    """Record a ``CompletionUsage`` from an LLM stream"""
+    record_usage(metrics, name, usage.prompt_tokens, usage.prompt_cached_tokens, usage.completion_tokens, ttft)
+
+
+def cache_ratios(metrics: SessionMetrics) -> Dict[str, float]:
+    """Share of prompt tokens served from the provider's cache, per call site"""
+    ratios = {}
+    for counter, prompt_tokens in metrics.counters.items():
+        if counter.startswith("tokens.") and counter.endswith(".prompt") and prompt_tokens:
+            name = counter[len("tokens."):-len(".prompt")]
+            ratios[name] = round(metrics.counters.get(f"tokens.{name}.cached", 0) / prompt_tokens, 3)
+    return ratios
+
+
+def track_session_llm(runtime: Any, session: Any, name: str = "llm.reply") -> None:
+    """Record usage of the replies an AgentSession generates itself (pipeline or realtime)"""
+
+    @runtime.on(session, "metrics_collected")
+    def on_metrics_collected(event):
+        metrics = event.metrics
+        kind = getattr(metrics, "type", None)
+        if kind == "llm_metrics" and not metrics.cancelled:
+            record_usage(
+                runtime.metrics,
+                name,
+                metrics.prompt_tokens,
+                metrics.prompt_cached_tokens,
+                metrics.completion_tokens,
+                metrics.ttft,
+            )
+        elif kind == "realtime_model_metrics" and not metrics.cancelled:
+            record_usage(
+                runtime.metrics,
+                name,
+                metrics.input_tokens,
+                metrics.input_token_details.cached_tokens,
+                metrics.output_tokens,
+                metrics.ttft,
+            )
@@ -0,0 +1,107 @@
+"""Lazily imported LiveKit plugin providers
+
+Importing a plugin (deepgram, cartesia, silero, ...) pulls in its SDK and,
+for some, model files. The agent scripts used to import every plugin at module
+load, so the worker supervisor and every job process paid for all of them even
+when a code path never used one. Plugins are now imported on first use, or up
+front in the worker's prewarm hook.
+
+LiveKit requires plugins to be registered on the main thread, which is where
+both prewarm and job entrypoints run when jobs are processes. A worker that
+runs jobs as threads must import its plugins at module load instead.
+"""
+
+import importlib
+import logging
+import sys
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, Tuple
+
+logger = logging.getLogger("providers")
+
+PLUGINS = {
+    "openai": "livekit.plugins.openai",
+    "deepgram": "livekit.plugins.deepgram",
+    "cartesia": "livekit.plugins.cartesia",
+    "silero": "livekit.plugins.silero",
+    "noise_cancellation": "livekit.plugins.noise_cancellation",
+}
+
+# (kind, name) -> factory
+_FACTORIES: Dict[Tuple[str, str], Callable[..., Any]] = {}
+
+
+def plugin(name: str) -> ModuleType:
+    """Import a LiveKit plugin on first use"""
+    module_name = PLUGINS[name]
+    module = sys.modules.get(module_name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        logger.info(f"Loaded plugin {name} in {(time.perf_counter() - start) * 1000:.0f}ms")
+    return module
+
+
+def preload(*names: str) -> None:
+    """Import plugins ahead of the first job, e.g. from a prewarm hook"""
+    for name in names:
+        plugin(name)
+
+
+def preload_for_command(*names: str) -> None:
+    """``download-files`` only downloads assets for plugins that are already imported"""
+    if "download-files" in sys.argv:
+        preload(*names)
+
+
+def register(kind: str, name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorator(factory: Callable[..., Any]) -> Callable[..., Any]:
+        _FACTORIES[(kind, name)] = factory
+        return factory
+    return decorator
+
+
+def create(kind: str, name: str, **kwargs: Any) -> Any:
+    """Build a provider instance, importing its plugin if needed"""
+    try:
+        factory = _FACTORIES[(kind, name)]
+    except KeyError:
+        raise ValueError(f"Unknown {kind} provider: {name}") from None
+    return factory(**kwargs)
+
+
+def stt(name: str = "deepgram", **kwargs: Any) -> Any:
+    return create("stt", name, **kwargs)
+
+
+def llm(name: str = "openai", **kwargs: Any) -> Any:
+    return create("llm", name, **kwargs)
+
+
+def tts(name: str = "cartesia", **kwargs: Any) -> Any:
+    return create("tts", name, **kwargs)
+
+
+def vad(name: str = "silero", **kwargs: Any) -> Any:
+    return create("vad", name, **kwargs)
+
+
+def realtime_model(name: str = "openai", **kwargs: Any) -> Any:
+    return create("realtime", name, **kwargs)
+
+
+def noise_cancellation(name: str = "bvc", **kwargs: Any) -> Any:
+    return create("noise_cancellation", name, **kwargs)
+
+
+register("stt", "deepgram")(lambda **kw: plugin("deepgram").STT(**kw))
+register("stt", "openai")(lambda **kw: plugin("openai").STT(**kw))
+register("llm", "openai")(lambda **kw: plugin("openai").LLM(**kw))
+register("tts", "cartesia")(lambda **kw: plugin("cartesia").TTS(**kw))
+register("tts", "openai")(lambda **kw: plugin("openai").TTS(**kw))
+register("vad", "silero")(lambda **kw: plugin("silero").VAD.load(**kw))
+# One inference thread batching every room's VAD windows (see agent_core.batched_vad)
+register("vad", "silero_batched")(lambda **kw: importlib.import_module("agent_core.batched_vad").BatchedVAD.load(**kw))
+register("realtime", "openai")(lambda **kw: plugin("openai").realtime.RealtimeModel(**kw))
+register("noise_cancellation", "bvc")(lambda **kw: plugin("noise_cancellation").BVC(**kw))
@@ -0,0 +1,131 @@
+"""Pre-built interview question bank
+
+The bank is a small JSON file of ranked question templates. It is loaded and
+indexed once per process; building a plan for a candidate is then a handful of
+dict lookups and ``str.format`` calls.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from agent_core.skills import load_skill_taxonomy, normalize_skill
+
+QUESTION_BANK_PATH = os.path.join(os.path.dirname(__file__), "question_bank.json")
+
+DEFAULT_SKILL = "your technical skills"
+
+# (category, skill, level) -> templates, best rank first. "" is the wildcard.
+IndexKey = Tuple[str, str, str]
+
+
+class QuestionBank:
+    def __init__(self, plan: List[Dict], templates: List[Dict], digest: str = "") -> None:
+        # Identifies the bank's content, so plans cached from an older bank aren't reused
+        self.digest = digest
+        self.plan = tuple((slot["id"], slot["category"]) for slot in plan)
+        self.index: Dict[IndexKey, Tuple[Dict, ...]] = {}
+        self.skills_with_templates = frozenset(
+            normalize_skill(t["skill"]) for t in templates if t.get("skill")
+        )
+
+        buckets: Dict[IndexKey, List[Dict]] = {}
+        for template in templates:
+            key = (
+                template["category"],
+                normalize_skill(template["skill"]) if template.get("skill") else "",
+                template.get("level", "").lower(),
+            )
+            buckets.setdefault(key, []).append(template)
+
+        for key, bucket in buckets.items():
+            bucket.sort(key=lambda t: t.get("rank", 0), reverse=True)
+            self.index[key] = tuple(bucket)
+
+    @classmethod
+    def from_file(cls, path: str) -> "QuestionBank":
+        with open(path, "rb") as f:
+            content = f.read()
+        data = json.loads(content)
+        return cls(plan=data["plan"], templates=data["templates"], digest=hashlib.sha1(content).hexdigest()[:12])
+
+    def find_template(self, category: str, skill: str = "", level: str = "") -> Optional[Dict]:
+        """Return the best template for a slot, falling back from specific to generic"""
+        for key in (
+            (category, skill, level),
+            (category, skill, ""),
+            (category, "", level),
+            (category, "", ""),
+        ):
+            templates = self.index.get(key)
+            if templates:
+                return templates[0]
+        return None
+
+    def choose_primary_skill(self, required_skills: List[str], candidate_skills: List[str]) -> Tuple[str, str]:
+        """Pick the skill to probe, returning (normalized key, display name)
+
+        Required skills the candidate also lists win, in the job's order, and
+        ones with a dedicated template are preferred over generic ones.
+        """
+        taxonomy = load_skill_taxonomy()
+        candidate_keys = {normalize_skill(s) for s in candidate_skills if s}
+        required = [(normalize_skill(s), s) for s in required_skills if s]
+        overlap = [
+            (key, taxonomy.display_name(key, name)) for key, name in required
+            if key in candidate_keys
+        ]
+
+        for key, name in overlap:
+            if key in self.skills_with_templates:
+                return key, name
+        if overlap:
+            return overlap[0]
+        if candidate_skills and candidate_skills[0]:
+            key = normalize_skill(candidate_skills[0])
+            return key, taxonomy.display_name(key, candidate_skills[0])
+        return "", DEFAULT_SKILL
+
+    def build_plan(self, job_data: Dict, resume_data: Dict) -> List[Dict]:
+        """Build one question per plan slot for this job and candidate"""
+        skill_key, skill_name = self.choose_primary_skill(
+            job_data.get('skillsRequired') or [],
+            resume_data.get('skills') or [],
+        )
+        return self.plan_for_skill(job_data, skill_key, skill_name)
+
+    def plan_for_skill(self, job_data: Dict, skill_key: str, skill_name: str) -> List[Dict]:
+        """The plan for a job once the skill to probe is known; the candidate only affects the skill"""
+        job_title = job_data.get('title') or 'this position'
+        company_name = (job_data.get('company') or {}).get('name') or 'our company'
+        level = (job_data.get('experienceLevel') or "").lower()
+
+        questions = []
+        for slot_id, category in self.plan:
+            template = self.find_template(category, skill_key, level)
+            if template is None:
+                continue
+            questions.append({
+                "id": slot_id,
+                "question": template["text"].format(
+                    job_title=job_title,
+                    company_name=company_name,
+                    skill=skill_name,
+                ),
+                "category": category,
+                "expected_duration": template["expected_duration"],
+            })
+        return questions
+
+
+@lru_cache(maxsize=None)
+def load_question_bank(path: str = QUESTION_BANK_PATH) -> QuestionBank:
+    """Load and index the question bank once per process"""
+    return QuestionBank.from_file(path)
+
+
+def build_question_plan(job_data: Dict, resume_data: Dict) -> List[Dict]:
+    """Build the interview question plan for a job and candidate"""
+    return load_question_bank().build_plan(job_data, resume_data)
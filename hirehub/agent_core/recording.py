@@ -0,0 +1,345 @@
+"""Interview audio recording
+
+Off unless ``$RECORDING_DIR`` is set. Each remote audio track in the room is
+pulled at a fixed rate and layout (16 kHz mono, what STT wants) and its PCM
+copied into a preallocated ring of fixed-size segment slots. A full slot is
+handed, as a memoryview and without copying, to a small thread pool that
+encodes it and spills it to disk as one file per segment:
+
+    $RECORDING_DIR/<room>/<participant>-<track sid>/00000.flac
+                                                   /...
+                                                   /manifest.json
+    $RECORDING_DIR/<room>/interview.json    room metadata and transcript
+
+Bounds:
+
+- memory: ``SEGMENT_SLOTS`` slots of ``SEGMENT_SECONDS`` of audio per track.
+  If the encoder falls that far behind, frames are dropped (and counted)
+  rather than buffered;
+- event loop: per frame, the only work is one memcpy into the ring, timed
+  against ``FRAME_BUDGET``. Encoding and file IO never run on the loop.
+
+Encoding uses ``soundfile`` (libsndfile) for FLAC and Ogg/Opus, which
+releases the GIL, so threads keep up without copying segments into another
+process. Without ``soundfile`` installed, segments are written as WAV.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from agent_core.runtime import SessionRuntime
+
+logger = logging.getLogger("recording")
+
+SAMPLE_RATE = 16000
+CHANNELS = 1
+SAMPLE_WIDTH = 2  # int16 PCM
+SEGMENT_SECONDS = 10
+SEGMENT_SLOTS = 4
+# Seconds of event-loop time one frame may take
+FRAME_BUDGET = 0.001
+ENCODER_WORKERS = 2
+
+# format -> (file extension, soundfile format, soundfile subtype)
+FORMATS = {
+    "flac": ("flac", "FLAC", "PCM_16"),
+    "opus": ("ogg", "OGG", "OPUS"),
+    "wav": ("wav", None, None),
+}
+DEFAULT_FORMAT = "flac"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_warned_fallback = False
+
+
+def encoder_pool() -> ThreadPoolExecutor:
+    """Encoder threads shared by every recording in the process"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=ENCODER_WORKERS, thread_name_prefix="recording")
+    return _executor
+
+
+def resolve_format(name: str) -> str:
+    """The requested format, or WAV if it needs soundfile and that isn't installed"""
+    global _warned_fallback
+    if name not in FORMATS:
+        raise ValueError(f"unknown recording format {name!r}, expected one of {sorted(FORMATS)}")
+    if FORMATS[name][1] is None:
+        return name
+    try:
+        import soundfile  # noqa: F401
+    except ImportError:
+        if not _warned_fallback:
+            logger.warning(f"soundfile is not installed, recording WAV instead of {name}")
+            _warned_fallback = True
+        return "wav"
+    return name
+
+
+def encode_segment(path: str, pcm: memoryview, fmt: str, sample_rate: int, channels: int) -> int:
+    """Encode int16 PCM to ``path`` (runs on an encoder thread); returns the file size"""
+    _, sf_format, sf_subtype = FORMATS[fmt]
+    partial = path + ".part"
+    if sf_format is None:
+        with wave.open(partial, "wb") as out:
+            out.setnchannels(channels)
+            out.setsampwidth(SAMPLE_WIDTH)
+            out.setframerate(sample_rate)
+            out.writeframes(pcm)
+    else:
+        import soundfile
+
+        with soundfile.SoundFile(
+            partial, "w", samplerate=sample_rate, channels=channels, format=sf_format, subtype=sf_subtype
+        ) as out:
+            out.buffer_write(pcm, dtype="int16")
+    # Readers never see a half-written segment
+    os.replace(partial, path)
+    return os.path.getsize(path)
+
+
+class SegmentRing:
+    """Preallocated PCM buffer split into fixed-size segment slots
+
+    A slot is busy from the moment it fills until its encode finishes; its
+    bytes are only read through a memoryview in the meantime, so the
+    writer must never wrap onto it. When it would, incoming audio is dropped.
+    """
+
+    def __init__(self, slots: int, slot_bytes: int) -> None:
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._buffer = bytearray(slots * slot_bytes)
+        self._view = memoryview(self._buffer)
+        self._busy = [False] * slots
+        self.slot = 0
+        self.fill = 0
+        self.dropped = 0
+
+    def write(self, data: memoryview) -> List[int]:
+        """Copy ``data`` in, returning the slots it filled (now busy)"""
+        full = []
+        offset, size = 0, len(data)
+        while offset < size:
+            if self._busy[self.slot]:
+                self.dropped += size - offset
+                break
+            count = min(self.slot_bytes - self.fill, size - offset)
+            start = self.slot * self.slot_bytes + self.fill
+            self._view[start:start + count] = data[offset:offset + count]
+            self.fill += count
+            offset += count
+            if self.fill == self.slot_bytes:
+                full.append(self.slot)
+                self._busy[self.slot] = True
+                self.slot = (self.slot + 1) % self.slots
+                self.fill = 0
+        return full
+
+    def take_partial(self) -> Optional[int]:
+        """Mark the partly filled slot busy (at the end of a recording)"""
+        if self.fill == 0 or self._busy[self.slot]:
+            return None
+        self._busy[self.slot] = True
+        return self.slot
+
+    def segment(self, slot: int, length: Optional[int] = None) -> memoryview:
+        start = slot * self.slot_bytes
+        return self._view[start:start + (self.slot_bytes if length is None else length)]
+
+    def release(self, slot: int) -> None:
+        self._busy[slot] = False
+
+
+class TrackRecorder:
+    """Records one audio track as numbered segment files plus a manifest"""
+
+    def __init__(
+        self,
+        directory: str,
+        fmt: str = DEFAULT_FORMAT,
+        sample_rate: int = SAMPLE_RATE,
+        channels: int = CHANNELS,
+        segment_seconds: int = SEGMENT_SECONDS,
+        slots: int = SEGMENT_SLOTS,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        self.directory = directory
+        self.format = resolve_format(fmt)
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frame_bytes = channels * SAMPLE_WIDTH
+        self.ring = SegmentRing(slots, segment_seconds * sample_rate * self.frame_bytes)
+        self.executor = executor or encoder_pool()
+        self.started_at: Optional[float] = None
+        self.segments: List[Dict[str, Any]] = []
+        self.frames = 0
+        self.over_budget = 0
+        self.max_frame_time = 0.0
+        self._next_index = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def dropped_seconds(self) -> float:
+        return self.ring.dropped / (self.sample_rate * self.frame_bytes)
+
+    def write(self, pcm: Any) -> None:
+        """Add one frame of int16 PCM (any buffer, e.g. ``AudioFrame.data``)"""
+        start = time.perf_counter()
+        if self.started_at is None:
+            self.started_at = time.time()
+        for slot in self.ring.write(memoryview(pcm).cast("B")):
+            self._submit(slot, self.ring.slot_bytes)
+        self.frames += 1
+        elapsed = time.perf_counter() - start
+        if elapsed > self.max_frame_time:
+            self.max_frame_time = elapsed
+        if elapsed > FRAME_BUDGET:
+            self.over_budget += 1
+
+    def _submit(self, slot: int, length: int) -> None:
+        index = self._next_index
+        self._next_index += 1
+        name = f"{index:05d}.{FORMATS[self.format][0]}"
+        future = asyncio.wrap_future(self.executor.submit(
+            encode_segment,
+            os.path.join(self.directory, name),
+            self.ring.segment(slot, length),
+            self.format,
+            self.sample_rate,
+            self.channels,
+        ))
+        self._pending[index] = future
+        seconds = length / (self.sample_rate * self.frame_bytes)
+
+        def done(future: asyncio.Future) -> None:
+            self.ring.release(slot)
+            del self._pending[index]
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                logger.error(f"Encoding {self.directory}/{name} failed", exc_info=future.exception())
+                return
+            self.segments.append({"index": index, "file": name, "seconds": seconds, "bytes": future.result()})
+
+        future.add_done_callback(done)
+
+    async def close(self) -> Dict[str, Any]:
+        """Encode what is left, wait for pending segments and write the manifest"""
+        slot = self.ring.take_partial()
+        if slot is not None:
+            self._submit(slot, self.ring.fill)
+        if self._pending:
+            await asyncio.gather(*self._pending.values(), return_exceptions=True)
+        manifest = {
+            "started_at": self.started_at,
+            "format": self.format,
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "frames": self.frames,
+            "dropped_seconds": round(self.dropped_seconds, 3),
+            "segments": sorted(self.segments, key=lambda segment: segment["index"]),
+        }
+        path = os.path.join(self.directory, "manifest.json")
+        await asyncio.get_running_loop().run_in_executor(self.executor, _write_json, path, manifest)
+        return manifest
+
+
+def _write_json(path: str, data: Dict) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def _safe(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name) or "_"
+
+
+class RoomRecorder:
+    """One TrackRecorder per remote audio track in a room"""
+
+    def __init__(self, runtime: SessionRuntime, room: Any, directory: str, fmt: str = DEFAULT_FORMAT) -> None:
+        self.runtime = runtime
+        self.room = room
+        self.directory = os.path.join(directory, _safe(runtime.room))
+        self.format = fmt
+        self.tracks: Dict[str, TrackRecorder] = {}
+
+    def subscribe(self, track: Any, participant: Any) -> None:
+        if track.sid in self.tracks:
+            return
+        directory = os.path.join(self.directory, f"{_safe(participant.identity)}-{_safe(track.sid)}")
+        recorder = TrackRecorder(directory, self.format)
+        self.tracks[track.sid] = recorder
+        self.runtime.spawn(self._pull(track, recorder), name=f"recording.{track.sid}")
+        logger.info(f"[{self.runtime.room}] Recording {participant.identity} to {directory} ({recorder.format})")
+
+    async def _pull(self, track: Any, recorder: TrackRecorder) -> None:
+        from livekit import rtc
+
+        stream = rtc.AudioStream(track, sample_rate=recorder.sample_rate, num_channels=recorder.channels)
+        try:
+            async for event in stream:
+                recorder.write(event.frame.data)
+        finally:
+            await stream.aclose()
+
+    async def close(self) -> None:
+        """Finish every track, then save the transcript next to the audio"""
+        metrics = self.runtime.metrics
+        for recorder in self.tracks.values():
+            manifest = await recorder.close()
+            metrics.incr("recording.segments", len(manifest["segments"]))
+            metrics.incr("recording.frames", recorder.frames)
+            metrics.incr("recording.frames_over_budget", recorder.over_budget)
+            metrics.observe("recording.max_frame", recorder.max_frame_time)
+            if recorder.ring.dropped:
+                logger.warning(f"[{self.runtime.room}] Dropped {recorder.dropped_seconds:.1f}s of audio, encoder fell behind")
+                metrics.incr("recording.dropped_bytes", recorder.ring.dropped)
+
+        interview = {
+            "room": self.runtime.room,
+            "agent_type": self.runtime.runtime.agent_type,
+            "metadata": self.room.metadata,
+            "tracks": {sid: os.path.basename(recorder.directory) for sid, recorder in self.tracks.items()},
+            "transcript": self.runtime.transcript.turns(),
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, "interview.json")
+        await asyncio.get_running_loop().run_in_executor(encoder_pool(), _write_json, path, interview)
+
+
+def bind_recorder(runtime: SessionRuntime, room: Any, directory: Optional[str] = None) -> Optional[RoomRecorder]:
+    """Record the room's remote audio tracks, if ``directory`` or $RECORDING_DIR is set
+
+    Call after ``ctx.connect()``; tracks already subscribed are picked up too.
+    The format comes from $RECORDING_FORMAT (flac, opus or wav).
+    """
+    directory = directory or os.getenv("RECORDING_DIR")
+    if not directory:
+        return None
+    from livekit import rtc
+
+    recorder = RoomRecorder(runtime, room, directory, os.getenv("RECORDING_FORMAT", DEFAULT_FORMAT))
+
+    @runtime.on(room, "track_subscribed")
+    def on_track_subscribed(track, publication, participant):
+        if track.kind == rtc.TrackKind.KIND_AUDIO:
+            recorder.subscribe(track, participant)
+
+    for participant in room.remote_participants.values():
+        for publication in participant.track_publications.values():
+            track = publication.track
+            if track is not None and track.kind == rtc.TrackKind.KIND_AUDIO:
+                recorder.subscribe(track, participant)
+
+    runtime.on_shutdown(recorder.close)
+    return recorder
@@ -0,0 +1,378 @@
+"""Offline re-transcription and re-scoring of recorded interviews
+
+Reads the interviews ``bind_recorder`` saved under a recording directory
+(``<room>/interview.json`` plus audio segments per track), optionally
+re-transcribes the candidate's audio, and scores each interview with the
+current scoring prompt (see ``agent_core.scoring``):
+
+    python -m agent_core.rescoring recordings/ --out rescoring/
+    python -m agent_core.rescoring recordings/ --transcriber openai --model gpt-4o
+    python -m agent_core.rescoring recordings/ --transcriber stub --model stub
+
+Interviews are streamed from disk through a bounded queue, with separate
+concurrency limits for transcription and scoring calls. Every scored
+interview is appended to ``<out>/results.jsonl`` and every transcribed
+segment is cached under ``<out>/transcripts``, so an interrupted run picks
+up where it stopped; a run is identified by transcriber, model and
+``SCORING_VERSION``. ``<out>/report.json`` has the run's throughput.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from agent_core.interview_config import InterviewConfig, load_interview_config
+from agent_core.metrics import SessionMetrics
+from agent_core.prompts import Prompt, record_completion_usage
+from agent_core.runtime import AgentRuntime, complete
+from agent_core.scoring import DEFAULT_ANALYSIS, SCORING_VERSION, score_transcript
+from agent_core.transcript import TranscriptStore
+
+logger = logging.getLogger("rescoring")
+
+DEFAULT_INTERVIEW_WORKERS = 4
+DEFAULT_STT_CONCURRENCY = 8
+DEFAULT_LLM_CONCURRENCY = 2
+DEFAULT_MODEL = "gpt-4"
+
+
+class Transcriber(ABC):
+    """Turns one audio segment file into text"""
+
+    name = ""
+
+    @abstractmethod
+    async def transcribe(self, path: str) -> str:
+        ...
+
+
+class StubTranscriber(Transcriber):
+    """Local stand-in: no model, optional simulated latency"""
+
+    name = "stub"
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+
+    async def transcribe(self, path: str) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return f"[audio {os.path.basename(path)}]"
+
+
+class OpenAITranscriber(Transcriber):
+    """OpenAI's transcription endpoint, which takes the FLAC/Ogg/WAV segments as they are"""
+
+    name = "openai"
+
+    def __init__(self, model: str = "whisper-1") -> None:
+        from openai import AsyncOpenAI
+
+        self.model = model
+        self.client = AsyncOpenAI()
+
+    async def transcribe(self, path: str) -> str:
+        data = await asyncio.to_thread(_read_bytes, path)
+        response = await self.client.audio.transcriptions.create(
+            model=self.model, file=(os.path.basename(path), data)
+        )
+        return response.text.strip()
+
+
+TRANSCRIBERS = {
+    "stub": StubTranscriber,
+    "openai": OpenAITranscriber,
+}
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _read_json(path: str) -> Any:
+    with open(path) as f:
+        return json.load(f)
+
+
+def iter_interviews(root: str) -> Iterator[str]:
+    """Interview directories under ``root``, in name order"""
+    with os.scandir(root) as entries:
+        names = sorted(entry.name for entry in entries if entry.is_dir())
+    for name in names:
+        if os.path.exists(os.path.join(root, name, "interview.json")):
+            yield os.path.join(root, name)
+
+
+def load_segments(directory: str, interview: Dict) -> List[Dict]:
+    """Each recorded segment with its wall-clock start, from the track manifests"""
+    segments = []
+    for track_dir in sorted(interview.get("tracks", {}).values()):
+        path = os.path.join(directory, track_dir)
+        manifest_path = os.path.join(path, "manifest.json")
+        if not os.path.exists(manifest_path):
+            logger.warning(f"{path} has no manifest (recording didn't finish); skipping its audio")
+            continue
+        manifest = _read_json(manifest_path)
+        start = manifest["started_at"] or 0.0
+        for segment in manifest["segments"]:
+            segments.append({
+                "track": track_dir,
+                "path": os.path.join(path, segment["file"]),
+                "start": start,
+                "seconds": segment["seconds"],
+            })
+            start += segment["seconds"]
+    return segments
+
+
+def merge_transcript(turns: List[Dict], segments: List[Dict], texts: List[str]) -> str:
+    """Interviewer turns from the live transcript, interleaved by time with re-transcribed candidate audio"""
+    timeline: List[Tuple[float, str, str]] = [
+        (datetime.fromisoformat(turn["timestamp"]).timestamp(), turn["speaker"], turn["content"])
+        for turn in turns
+        if turn["speaker"] != "candidate"
+    ]
+    timeline += [(segment["start"], "candidate", text) for segment, text in zip(segments, texts) if text]
+    timeline.sort(key=lambda item: item[0])
+
+    store = TranscriptStore()
+    speaker, parts = None, []
+    for _, who, text in timeline + [(0.0, None, "")]:
+        if who != speaker and parts:
+            store.add(speaker, " ".join(parts))
+            parts = []
+        speaker = who
+        parts.append(text)
+    return store.as_text()
+
+
+class Checkpoint:
+    """Append-only log of scored interviews; interviews already in it for this run are skipped"""
+
+    def __init__(self, path: str, run: str) -> None:
+        self.path = path
+        self.run = run
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by an interrupted write
+                        continue
+                    if entry.get("run") == run:
+                        self.done.add(entry["directory"])
+        self._file = open(path, "a")
+
+    def record(self, entry: Dict) -> None:
+        self._file.write(json.dumps({"run": self.run, **entry}) + "\n")
+        self._file.flush()
+        self.done.add(entry["directory"])
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def stub_analysis(transcript: str) -> Dict[str, Any]:
+    """Placeholder score for ``--model stub`` runs, which exercise everything but the LLM"""
+    return {**DEFAULT_ANALYSIS, "summary": f"Stub analysis of {len(transcript.splitlines())} turns"}
+
+
+class Rescorer:
+    def __init__(
+        self,
+        out: str,
+        transcriber: Optional[Transcriber],
+        model: str = DEFAULT_MODEL,
+        stt_concurrency: int = DEFAULT_STT_CONCURRENCY,
+        llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+    ) -> None:
+        self.out = out
+        self.transcriber = transcriber
+        self.model = model
+        self.run = f"{transcriber.name if transcriber else 'stored'}:{model}:v{SCORING_VERSION}"
+        # Only for pooled providers; a SessionRuntime would start the live
+        # agents' loop monitor and load shedding, which a batch job doesn't want
+        self.agent_runtime = AgentRuntime("rescoring", plugins=("openai",))
+        self.metrics = SessionMetrics("rescoring", self.run)
+        self.stt_slots = asyncio.Semaphore(stt_concurrency)
+        self.llm_slots = asyncio.Semaphore(llm_concurrency)
+        os.makedirs(out, exist_ok=True)
+        self.checkpoint = Checkpoint(os.path.join(out, "results.jsonl"), self.run)
+
+    def llm(self) -> Any:
+        # Deterministic sampling so re-runs of one version are comparable
+        return self.agent_runtime.provider("llm", "openai", model=self.model, temperature=0.0)
+
+    async def complete(self, llm: Any, prompt: Prompt, metric: str = "llm") -> str:
+        """Timed completion with token usage, as ``score_transcript`` expects of a runtime"""
+        def on_usage(usage: Any, ttft: Optional[float]) -> None:
+            record_completion_usage(self.metrics, metric, usage, ttft)
+
+        self.metrics.incr(metric)
+        with self.metrics.timer(metric):
+            return await complete(llm, prompt, on_usage=on_usage)
+
+    async def transcribe_segment(self, room: str, segment: Dict) -> str:
+        cache = os.path.join(
+            self.out, "transcripts", self.transcriber.name, room, segment["track"],
+            os.path.basename(segment["path"]) + ".txt",
+        )
+        if os.path.exists(cache):
+            self.metrics.incr("segments.cached")
+            return await asyncio.to_thread(_read_text, cache)
+
+        async with self.stt_slots:
+            with self.metrics.timer("transcribe.segment"):
+                text = await self.transcriber.transcribe(segment["path"])
+        self.metrics.incr("segments.transcribed")
+        self.metrics.incr("audio_ms", int(segment["seconds"] * 1000))
+        await asyncio.to_thread(_write_text, cache, text)
+        return text
+
+    async def score(self, config: InterviewConfig, transcript: str) -> Dict[str, Any]:
+        if self.model == "stub":
+            return stub_analysis(transcript)
+        async with self.llm_slots:
+            with self.metrics.timer("score"):
+                return await score_transcript(self, self.llm(), config, transcript)
+
+    async def process(self, directory: str) -> None:
+        interview = await asyncio.to_thread(_read_json, os.path.join(directory, "interview.json"))
+        room = interview["room"]
+        config = load_interview_config(interview.get("metadata"))
+        turns = interview.get("transcript", [])
+
+        with self.metrics.timer("interview"):
+            if self.transcriber is None:
+                transcript = TranscriptStore()
+                for turn in turns:
+                    transcript.add(turn["speaker"], turn["content"])
+                text = transcript.as_text()
+                audio_seconds = 0.0
+            else:
+                segments = await asyncio.to_thread(load_segments, directory, interview)
+                texts = await asyncio.gather(*(self.transcribe_segment(room, segment) for segment in segments))
+                text = merge_transcript(turns, segments, list(texts))
+                audio_seconds = sum(segment["seconds"] for segment in segments)
+            analysis = await self.score(config, text)
+
+        self.checkpoint.record({
+            "directory": os.path.basename(directory),
+            "room": room,
+            "interview_id": config.interview_id,
+            "scoring_version": SCORING_VERSION,
+            "model": self.model,
+            "audio_seconds": audio_seconds,
+            "transcript": text,
+            "analysis": analysis,
+            "scored_at": datetime.now().isoformat(),
+        })
+        self.metrics.incr("interviews.scored")
+
+    async def worker(self, queue: "asyncio.Queue[Optional[str]]") -> None:
+        while True:
+            directory = await queue.get()
+            if directory is None:
+                return
+            try:
+                await self.process(directory)
+            except Exception:
+                self.metrics.incr("interviews.failed")
+                logger.exception(f"Re-scoring {directory} failed; it will be retried on the next run")
+
+    async def run_all(self, interviews: Iterator[str], workers: int = DEFAULT_INTERVIEW_WORKERS) -> Dict:
+        """Process every interview not already in the checkpoint, then write the report"""
+        start = time.perf_counter()
+        queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=workers * 2)
+        tasks = [asyncio.ensure_future(self.worker(queue)) for _ in range(workers)]
+        try:
+            for directory in interviews:
+                if os.path.basename(directory) in self.checkpoint.done:
+                    self.metrics.incr("interviews.skipped")
+                    continue
+                await queue.put(directory)
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.checkpoint.close()
+            report = self.report(time.perf_counter() - start)
+            await asyncio.to_thread(_write_json, os.path.join(self.out, "report.json"), report)
+        return report
+
+    def report(self, wall: float) -> Dict:
+        counters = self.metrics.counters
+        audio = counters.get("audio_ms", 0) / 1000
+        scored = counters.get("interviews.scored", 0)
+        return {
+            "run": self.run,
+            "finished_at": datetime.now().isoformat(),
+            "wall_s": round(wall, 2),
+            "interviews": {
+                "scored": scored,
+                "skipped": counters.get("interviews.skipped", 0),
+                "failed": counters.get("interviews.failed", 0),
+            },
+            "interviews_per_min": round(scored / wall * 60, 2) if wall else 0.0,
+            "audio_transcribed_s": round(audio, 1),
+            "audio_x_realtime": round(audio / wall, 1) if wall else 0.0,
+            "segments": {
+                "transcribed": counters.get("segments.transcribed", 0),
+                "cached": counters.get("segments.cached", 0),
+            },
+            "timings_ms": self.metrics.summary()["timings_ms"],
+        }
+
+
+def _read_text(path: str) -> str:
+    with open(path) as f:
+        return f.read()
+
+
+def _write_text(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = path + ".part"
+    with open(partial, "w") as f:
+        f.write(text)
+    os.replace(partial, path)
+
+
+def _write_json(path: str, data: Dict) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+async def main(args: argparse.Namespace) -> None:
+    transcriber = None
+    if args.transcriber != "stored":
+        transcriber = TRANSCRIBERS[args.transcriber]()
+    rescorer = Rescorer(args.out, transcriber, args.model, args.stt_concurrency, args.llm_concurrency)
+    report = await rescorer.run_all(iter_interviews(args.recordings), args.workers)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recordings", nargs="?", default=os.getenv("RECORDING_DIR"), help="recording directory (default $RECORDING_DIR)")
+    parser.add_argument("--out", default="rescoring", help="results, transcript cache and report")
+    parser.add_argument("--transcriber", default="stored", choices=["stored", *TRANSCRIBERS], help="stored reuses the live transcript")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="scoring model, or stub")
+    parser.add_argument("--workers", type=int, default=DEFAULT_INTERVIEW_WORKERS, help="interviews in flight")
+    parser.add_argument("--stt-concurrency", type=int, default=DEFAULT_STT_CONCURRENCY)
+    parser.add_argument("--llm-concurrency", type=int, default=DEFAULT_LLM_CONCURRENCY)
+    args = parser.parse_args()
+    if not args.recordings:
+        parser.error("no recording directory given and $RECORDING_DIR is not set")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    asyncio.run(main(args))
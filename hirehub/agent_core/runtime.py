@@ -0,0 +1,273 @@
+"""Shared runtime for the agent entry points
+
+Each agent script is a thin policy module (prompt, question flow, what to do
+on each event) over this runtime, which owns the pieces every agent needs:
+
+- ``AgentRuntime`` (one per worker process): plugin preloading, pooled
+  provider instances and HTTP client, and the CLI entry point.
+- ``SessionRuntime`` (one per room): transcript store, metrics, event wiring
+  that runs async handlers as tracked tasks, event-loop health reporting
+  (see ``loop_monitor``), load shedding (see ``degradation``), and
+  shutdown handling.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from agent_core import degradation, loop_monitor, providers
+from agent_core.deadlines import COMPLETION_BUDGET, STATS, TurnDeadlines, model_name
+from agent_core.metrics import SessionMetrics
+from agent_core.prompts import Prompt, cache_ratios, record_completion_usage
+from agent_core.transcript import TranscriptStore
+
+logger = logging.getLogger("agent-runtime")
+
+
+async def complete(
+    llm: Any,
+    prompt: Union[str, Prompt],
+    system: Optional[str] = None,
+    on_usage: Optional[Callable[[Any, Optional[float]], None]] = None,
+) -> str:
+    """One-shot completion on a LiveKit LLM, returning the full response text
+
+    ``on_usage`` receives the API's token usage and the time to first token.
+    """
+    from livekit.agents.llm import ChatContext
+
+    chat_ctx = ChatContext()
+    if isinstance(prompt, Prompt):
+        for role, content in prompt.messages():
+            chat_ctx.add_message(role=role, content=content)
+    else:
+        if system:
+            chat_ctx.add_message(role="system", content=system)
+        chat_ctx.add_message(role="user", content=prompt)
+
+    parts = []
+    start = time.perf_counter()
+    ttft = None
+    async with llm.chat(chat_ctx=chat_ctx) as stream:
+        async for chunk in stream:
+            if chunk.delta and chunk.delta.content:
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                parts.append(chunk.delta.content)
+            if chunk.usage is not None and on_usage is not None:
+                on_usage(chunk.usage, ttft)
+    return "".join(parts).strip()
+
+
+class AgentRuntime:
+    def __init__(self, agent_type: str, plugins: Tuple[str, ...] = ()) -> None:
+        self.agent_type = agent_type
+        self.plugins = plugins
+        self._providers: Dict[Tuple, Any] = {}
+        self._http_client = None
+        self._prewarm_hooks: List[Callable[[], Any]] = []
+
+    def on_prewarm(self, hook: Callable[[], Any]) -> Callable[[], Any]:
+        """Register extra per-process setup (question bank, draft store...)"""
+        self._prewarm_hooks.append(hook)
+        return hook
+
+    def prewarm(self, proc: Any = None) -> None:
+        """Worker prewarm hook: import plugins and run setup before any job arrives"""
+        providers.preload(*self.plugins)
+        for hook in self._prewarm_hooks:
+            hook()
+
+    def provider(self, kind: str, name: str, **kwargs: Any) -> Any:
+        """Provider instance shared by every session in this process with the same config"""
+        key = (kind, name, tuple(sorted(kwargs.items())))
+        instance = self._providers.get(key)
+        if instance is None:
+            instance = providers.create(kind, name, **kwargs)
+            self._providers[key] = instance
+        return instance
+
+    def http_client(self) -> Any:
+        """Process-wide httpx.AsyncClient, so requests reuse pooled connections"""
+        if self._http_client is None:
+            import httpx
+
+            self._http_client = httpx.AsyncClient(timeout=30.0)
+        return self._http_client
+
+    def session(self, ctx: Any) -> "SessionRuntime":
+        """Per-room runtime, with its shutdown wired to the job context"""
+        session = SessionRuntime(self, ctx.room.name)
+        ctx.add_shutdown_callback(session.shutdown)
+        return session
+
+    def run(self, entrypoint: Callable[[Any], Awaitable[None]], **worker_options: Any) -> None:
+        """CLI entry point shared by all agents"""
+        from livekit.agents import WorkerOptions, cli
+
+        providers.preload_for_command(*self.plugins)
+        # This is the worker's main process: it sets the load-shedding level for every job
+        degradation.CONTROLLER.lead()
+        cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=self.prewarm, **worker_options))
+
+
+class SessionRuntime:
+    def __init__(self, runtime: AgentRuntime, room: str) -> None:
+        self.runtime = runtime
+        self.room = room
+        self.transcript = TranscriptStore()
+        self.metrics = SessionMetrics(runtime.agent_type, room)
+        self.deadlines = TurnDeadlines(self.metrics)
+        self.closed = False
+        self._tasks: Set[asyncio.Task] = set()
+        self._shutdown_hooks: List[Callable[[], Any]] = []
+        self.monitor: Optional[loop_monitor.LoopMonitor] = None
+        if loop_monitor.enabled():
+            try:
+                self.monitor = loop_monitor.monitor_for()
+            except RuntimeError:
+                # Not on a running loop (e.g. built by a sync script); nothing to watch
+                pass
+            else:
+                self.monitor.watch(self)
+        degradation.CONTROLLER.start()
+        self.metrics.peak("degradation.level", degradation.CONTROLLER.level)
+        if degradation.CONTROLLER.level:
+            logger.info(f"[{room}] starting degraded: {degradation.CONTROLLER.mode}")
+
+    @property
+    def pending_tasks(self) -> int:
+        return len(self._tasks)
+
+    def spawn(self, coro: Awaitable[Any], name: Optional[str] = None) -> asyncio.Task:
+        """Run a coroutine as a task that is cancelled on shutdown and whose errors are logged"""
+        task = asyncio.ensure_future(coro)
+        if name:
+            task.set_name(name)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.metrics.incr("handler_errors")
+            logger.error(f"[{self.room}] {task.get_name()} failed", exc_info=task.exception())
+
+    def on(self, emitter: Any, event: str) -> Callable[[Callable], Callable]:
+        """Subscribe to an event; async handlers run as tracked, timed tasks
+
+        LiveKit emitters only accept sync callbacks, so async handlers are
+        wrapped rather than registered directly.
+        """
+        def decorator(handler: Callable) -> Callable:
+            metric = f"handler.{event}"
+
+            if inspect.iscoroutinefunction(handler):
+                async def timed(*args: Any) -> None:
+                    with self.metrics.timer(metric):
+                        await handler(*args)
+
+                def callback(*args: Any) -> None:
+                    self.spawn(timed(*args), name=metric)
+            else:
+                def callback(*args: Any) -> None:
+                    start = time.perf_counter()
+                    try:
+                        handler(*args)
+                    finally:
+                        self._observe_sync(metric, time.perf_counter() - start)
+
+            emitter.on(event, callback)
+            return handler
+        return decorator
+
+    def _observe_sync(self, metric: str, elapsed: float) -> None:
+        """Time a sync handler; one that holds the loop too long is flagged by name"""
+        self.metrics.observe(metric, elapsed)
+        if elapsed >= loop_monitor.SLOW_CALLBACK:
+            self.metrics.incr(f"slow.{metric}")
+            logger.warning(f"[{self.room}] {metric} handler blocked the event loop for {elapsed * 1000:.0f}ms")
+
+    async def complete(
+        self,
+        llm: Any,
+        prompt: Union[str, Prompt],
+        system: Optional[str] = None,
+        metric: str = "llm",
+        fallback: Optional[str] = None,
+        budget: float = COMPLETION_BUDGET,
+    ) -> str:
+        """Timed one-shot completion (see ``complete``)
+
+        With a ``fallback``, the call is cancelled and the fallback returned
+        if it takes longer than ``budget`` seconds.
+        """
+        def on_usage(usage: Any, ttft: Optional[float]) -> None:
+            record_completion_usage(self.metrics, metric, usage, ttft)
+
+        self.metrics.incr(metric)
+        with self.metrics.timer(metric):
+            call = complete(llm, prompt, system=system, on_usage=on_usage)
+            try:
+                if fallback is None:
+                    result = await call
+                    degradation.CONTROLLER.record_call(failed=False)
+                    return result
+                # Deadline hits and misses are recorded by TurnDeadlines
+                return await self.deadlines.complete(call, model_name(llm), fallback, budget=budget)
+            except Exception:
+                degradation.CONTROLLER.record_call(failed=True)
+                raise
+
+    def rpc(self, participant: Any, method: str) -> Callable[[Callable], Callable]:
+        """Register a timed RPC method on the local participant"""
+        def decorator(handler: Callable[[Any], Awaitable[str]]) -> Callable:
+            metric = f"rpc.{method}"
+
+            async def timed(data: Any) -> str:
+                self.metrics.incr(metric)
+                with self.metrics.timer(metric):
+                    return await handler(data)
+
+            participant.register_rpc_method(method)(timed)
+            return handler
+        return decorator
+
+    def on_shutdown(self, hook: Callable[[], Any]) -> Callable[[], Any]:
+        """Register cleanup (sync or async) to run once when the session ends"""
+        self._shutdown_hooks.append(hook)
+        return hook
+
+    async def shutdown(self, reason: str = "") -> None:
+        if self.closed:
+            return
+        self.closed = True
+
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        for hook in self._shutdown_hooks:
+            try:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception(f"[{self.room}] shutdown hook failed")
+
+        self.metrics.peak("degradation.level", degradation.CONTROLLER.level)
+        logger.info(f"[{self.room}] session closed {reason}".rstrip() + f": {self.metrics.summary()}")
+        if self.monitor is not None:
+            self.monitor.unwatch(self)
+            if self.metrics.counters.get("loop.slow_callbacks"):
+                logger.info(f"[{self.room}] slowest event-loop blocks (this loop): {self.monitor.slowest()}")
+            logger.info(f"Event loop health (this loop): {self.monitor.summary()}")
+        ratios = cache_ratios(self.metrics)
+        if ratios:
+            logger.info(f"[{self.room}] cached prompt token ratio by call site: {ratios}")
+        if STATS.calls:
+            logger.info(f"LLM deadline misses by model (this process): {STATS.summary()}")
@@ -0,0 +1,110 @@
+"""Final interview scoring, shared by the live agent and offline re-scoring
+
+The scoring prompt is its own Prompt (stable rubric, then the job, then the
+candidate) rather than the interviewer's, so a score depends only on the
+transcript, the job and ``SCORING_VERSION``. Bump the version whenever the
+rubric or the requested JSON changes; re-scoring runs are keyed by it.
+
+A failed call or an unusable reply raises ``ScoringError``. The live agent
+falls back to ``DEFAULT_ANALYSIS`` so the room still gets a result;
+re-scoring records nothing and retries the interview on its next run.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict
+
+from agent_core.interview_config import InterviewConfig, JobConfig, job_prompt
+from agent_core.prompts import Prompt
+
+SCORING_VERSION = "1"
+
+SCORING_INSTRUCTIONS = """You are an experienced technical interviewer reviewing a completed interview.
+Score the candidate only on evidence in the transcript. Reply with JSON only."""
+
+FINAL_ANALYSIS_REQUEST = """Based on this complete interview transcript, provide a comprehensive candidate analysis:
+
+{transcript}
+
+Provide analysis in JSON format:
+{{
+    "overall_score": 0-100,
+    "technical_skills": [{{"skill": "JavaScript", "proficiency": 0-100}}],
+    "soft_skills": [{{"skill": "Communication", "rating": 0-100}}],
+    "communication_score": 0-100,
+    "experience_match": 0-100,
+    "culture_fit": 0-100,
+    "strengths": ["strength1", "strength2"],
+    "areas_for_improvement": ["area1", "area2"],
+    "summary": "Comprehensive assessment summary",
+    "recommendation": "strong_hire|hire|maybe|no_hire",
+    "interview_duration": 20,
+    "response_quality": 0-100,
+    "engagement_level": 0-100
+}}"""
+
+# What the live agent reports when scoring fails
+DEFAULT_ANALYSIS = {
+    "overall_score": 50,
+    "technical_skills": [],
+    "soft_skills": [],
+    "communication_score": 50,
+    "experience_match": 50,
+    "culture_fit": 50,
+    "strengths": [],
+    "areas_for_improvement": [],
+    "summary": "Analysis could not be completed",
+    "recommendation": "maybe",
+    "interview_duration": 20,
+    "response_quality": 50,
+    "engagement_level": 50,
+}
+
+
+def scoring_job_section(job: JobConfig) -> str:
+    return f"""ROLE:
+{job.experience_level or 'Mid-level'} {job.title or 'Software Engineer'} at {job.company or 'our company'}
+- Required skills: {', '.join(job.skills_required) or 'Not specified'}
+- Preferred skills: {', '.join(job.skills_preferred) or 'Not specified'}"""
+
+
+def scoring_prompt(config: InterviewConfig) -> Prompt:
+    """Scoring prompt without its turn; the job section is built once per job"""
+    candidate = config.candidate
+    return Prompt(
+        stable=SCORING_INSTRUCTIONS,
+        job=job_prompt(config, "scoring", scoring_job_section, SCORING_VERSION),
+        candidate=f"CANDIDATE: {candidate.name}" if candidate.name else "",
+    )
+
+
+class ScoringError(Exception):
+    """The scoring call failed, or its reply wasn't a JSON analysis"""
+
+
+def parse_analysis(response: str) -> Dict[str, Any]:
+    """The model's JSON analysis (tolerating a ```json fence); raises ScoringError"""
+    text = response.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[len("json"):]
+    try:
+        analysis = json.loads(text)
+    except ValueError as e:
+        raise ScoringError(f"final analysis is not JSON: {e}") from None
+    if not isinstance(analysis, dict):
+        raise ScoringError("final analysis is not a JSON object")
+    return analysis
+
+
+async def score_transcript(runtime: Any, llm: Any, config: InterviewConfig, transcript: str) -> Dict[str, Any]:
+    """Score a transcript ("Speaker: text" lines) with ``runtime.complete``; raises ScoringError"""
+    # The job section may come from the job cache's SQLite file; keep that off the loop
+    base = await asyncio.to_thread(scoring_prompt, config)
+    prompt = base.with_turn(FINAL_ANALYSIS_REQUEST.format(transcript=transcript))
+    try:
+        response = await runtime.complete(llm, prompt, metric="llm.final_analysis")
+    except Exception as e:
+        raise ScoringError(f"final analysis call failed: {e}") from e
+    return parse_analysis(response)
@@ -0,0 +1,220 @@
+"""Skill taxonomy shared by resume matching and job posting extraction
+
+Skills are folded to a canonical key ("React.js", "ReactJS" and "react" all
+become "react") through a precomputed alias index. Free text is scanned in one
+pass against a token trie of every alias, and names that are not in the
+taxonomy fall back to a fuzzy match within one edit, using a precomputed
+deletion index so lookups stay O(len(skill)) however large the taxonomy gets.
+"""
+
+import difflib
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SKILLS_PATH = os.path.join(os.path.dirname(__file__), "skills.json")
+
+REQUIRED_WEIGHT = 1.0
+PREFERRED_WEIGHT = 0.5
+
+# Shortest key we try to fuzzy match; below this "java" would match "jav" etc.
+FUZZY_MIN_LENGTH = 5
+FUZZY_CUTOFF = 0.8
+
+# Keeps "node.js", "c++" and "c#" as single tokens but drops trailing periods
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9+#]")
+_END = ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase skill tokens"""
+    return _TOKEN.findall(text.lower())
+
+
+def fold(skill: str) -> str:
+    """Fold case, punctuation and whitespace without consulting the taxonomy"""
+    return " ".join(tokenize(skill))
+
+
+def _deletions(key: str) -> List[str]:
+    return [key[:i] + key[i + 1:] for i in range(len(key))]
+
+
+class SkillTaxonomy:
+    def __init__(self, entries: List[Dict], speech_ambiguous: Iterable[str] = ()) -> None:
+        # folded alias -> canonical key, and canonical key -> display name
+        self.aliases: Dict[str, str] = {}
+        self.names: Dict[str, str] = {}
+        self.speech_ambiguous = frozenset(fold(a) for a in speech_ambiguous)
+        # token -> child node; the "" key marks the end of an alias
+        self.trie: Dict[str, Dict] = {}
+
+        for entry in entries:
+            key = fold(entry["name"])
+            self.names[key] = entry["name"]
+            for alias in [entry["name"], *entry.get("aliases", [])]:
+                alias_key = fold(alias)
+                if alias_key:
+                    self.aliases.setdefault(alias_key, key)
+                    self._insert(alias_key)
+
+        # every single-character deletion of an alias -> aliases it came from
+        self._deletion_index: Dict[str, List[str]] = {}
+        for alias_key in self.aliases:
+            if len(alias_key) >= FUZZY_MIN_LENGTH:
+                for deleted in _deletions(alias_key):
+                    self._deletion_index.setdefault(deleted, []).append(alias_key)
+        self._fuzzy = lru_cache(maxsize=4096)(self._fuzzy_lookup)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["skills"], data.get("speech_ambiguous", ()))
+
+    def _insert(self, alias_key: str) -> None:
+        node = self.trie
+        for token in alias_key.split(" "):
+            node = node.setdefault(token, {})
+        node[_END] = alias_key
+
+    def _fuzzy_lookup(self, key: str) -> Optional[str]:
+        """Closest alias within one insertion, deletion, substitution or transposition"""
+        candidates = set(self._deletion_index.get(key, ()))
+        for deleted in _deletions(key):
+            if deleted in self.aliases:
+                candidates.add(deleted)
+            candidates.update(self._deletion_index.get(deleted, ()))
+        matches = difflib.get_close_matches(key, sorted(candidates), n=1, cutoff=FUZZY_CUTOFF)
+        return self.aliases[matches[0]] if matches else None
+
+    def lookup(self, skill: str, fuzzy: bool = True) -> Optional[str]:
+        """Return the canonical key for a skill, or None if it is not in the taxonomy"""
+        key = fold(skill)
+        if not key:
+            return None
+        canonical = self.aliases.get(key)
+        if canonical is None and fuzzy and len(key) >= FUZZY_MIN_LENGTH:
+            canonical = self._fuzzy(key)
+        return canonical
+
+    def canonical_key(self, skill: str) -> str:
+        """Canonical key for a skill; unknown skills are kept as their folded form"""
+        return self.lookup(skill) or fold(skill)
+
+    def display_name(self, key: str, default: Optional[str] = None) -> str:
+        return self.names.get(key, default or key)
+
+    def extract(self, text: str) -> List[str]:
+        """Find every known skill mentioned in free text, in order of first mention
+
+        Single left-to-right pass: at each token walk the trie as far as it
+        goes and keep the longest alias, so "react native" beats "react".
+        """
+        tokens = tokenize(text)
+        found: List[str] = []
+        seen = set()
+        i = 0
+        while i < len(tokens):
+            node = self.trie
+            match: Optional[Tuple[str, int]] = None
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if _END in node:
+                    match = (node[_END], j)
+            if match and match[0] not in self.speech_ambiguous:
+                canonical = self.aliases[match[0]]
+                if canonical not in seen:
+                    seen.add(canonical)
+                    found.append(canonical)
+                i = match[1]
+            else:
+                i += 1
+        return found
+
+
+@lru_cache(maxsize=None)
+def load_skill_taxonomy(path: str = SKILLS_PATH) -> SkillTaxonomy:
+    """Load and index the skill taxonomy once per process"""
+    return SkillTaxonomy.from_file(path)
+
+
+def normalize_skill(skill: str) -> str:
+    """Fold case, whitespace and known aliases into a canonical skill key"""
+    return load_skill_taxonomy().canonical_key(skill)
+
+
+def normalize_skills(skills: Iterable[str]) -> List[str]:
+    """Normalize a list of skills, dropping blanks and duplicates but keeping order"""
+    seen = set()
+    normalized = []
+    for skill in skills:
+        if not skill:
+            continue
+        key = normalize_skill(skill)
+        if key and key not in seen:
+            seen.add(key)
+            normalized.append(key)
+    return normalized
+
+
+def skill_name(skill: str) -> str:
+    """Canonical display name for a skill ("reactjs" -> "React")"""
+    taxonomy = load_skill_taxonomy()
+    return taxonomy.display_name(taxonomy.canonical_key(skill))
+
+
+def extract_skills(text: str) -> List[str]:
+    """Extract canonical skill names mentioned in free speech"""
+    taxonomy = load_skill_taxonomy()
+    return [taxonomy.display_name(key) for key in taxonomy.extract(text)]
+
+
+def skill_vector(skills: Iterable[str], weight: float = 1.0) -> Dict[str, float]:
+    """Weighted skill vector keyed by canonical skill key"""
+    return {key: weight for key in normalize_skills(skills)}
+
+
+def job_skill_vector(job_data: Dict) -> Dict[str, float]:
+    """Required skills weigh in fully, preferred skills at PREFERRED_WEIGHT"""
+    vector = skill_vector(job_data.get('skillsRequired') or [], REQUIRED_WEIGHT)
+    for key, weight in skill_vector(job_data.get('skillsPreferred') or [], PREFERRED_WEIGHT).items():
+        vector.setdefault(key, weight)
+    return vector
+
+
+def overlap_score(job_vector: Dict[str, float], resume_vector: Dict[str, float]) -> float:
+    """Weighted share of the job's skills covered by the resume, from 0.0 to 1.0"""
+    total = sum(job_vector.values())
+    if not total:
+        return 0.0
+    covered = sum(min(weight, resume_vector[key]) for key, weight in job_vector.items() if key in resume_vector)
+    return covered / total
+
+
+def match_skills(job_data: Dict, resume_data: Dict) -> Dict:
+    """Score a resume against a job posting and list matched/missing skills"""
+    taxonomy = load_skill_taxonomy()
+    job_vector = job_skill_vector(job_data)
+    resume_vector = skill_vector(resume_data.get('skills') or [])
+
+    matched, missing_required, missing_preferred = [], [], []
+    for key, weight in job_vector.items():
+        name = taxonomy.display_name(key)
+        if key in resume_vector:
+            matched.append(name)
+        elif weight >= REQUIRED_WEIGHT:
+            missing_required.append(name)
+        else:
+            missing_preferred.append(name)
+
+    return {
+        "score": round(overlap_score(job_vector, resume_vector) * 100),
+        "matched": matched,
+        "missing_required": missing_required,
+        "missing_preferred": missing_preferred,
+    }
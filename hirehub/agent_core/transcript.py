@@ -0,0 +1,42 @@
+"""Interview/conversation transcript shared by every agent"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+SPEAKER_LABELS = {
+    "candidate": "Candidate",
+    "interviewer": "Interviewer",
+    "recruiter": "Recruiter",
+    "assistant": "Assistant",
+}
+
+
+class TranscriptStore:
+    def __init__(self) -> None:
+        self._turns: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def add(self, speaker: str, content: str, **fields: Any) -> Dict[str, Any]:
+        """Record one turn; extra fields (question_id, analysis...) are stored alongside"""
+        turn = {
+            "timestamp": datetime.now().isoformat(),
+            "speaker": speaker,
+            "content": content,
+            **fields,
+        }
+        self._turns.append(turn)
+        return turn
+
+    def turns(self) -> List[Dict[str, Any]]:
+        return list(self._turns)
+
+    def last(self, count: int, speaker: Optional[str] = None) -> List[Dict[str, Any]]:
+        turns = self._turns if speaker is None else [t for t in self._turns if t["speaker"] == speaker]
+        return turns[-count:] if count else []
+
+    def as_text(self, count: Optional[int] = None) -> str:
+        """Plain "Speaker: content" lines, for prompts and summaries"""
+        turns = self._turns if count is None else self._turns[-count:]
+        return "\n".join(f"{SPEAKER_LABELS.get(t['speaker'], t['speaker'])}: {t['content']}" for t in turns)
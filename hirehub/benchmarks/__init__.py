@@ -0,0 +1 @@
+"""Micro-benchmarks for the agent hot paths. Run modules with ``python -m benchmarks.<name>`` from ``hirehub/``."""
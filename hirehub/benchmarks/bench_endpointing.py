@@ -0,0 +1,142 @@
+"""Turn-taking latency and cut-offs on recorded session traces
+
+Each fixture in ``fixtures/endpointing`` is a session's VAD, STT and agent
+speech events (as written by ``bind_endpointer`` with
+``$ENDPOINTING_TRACE_DIR`` set), annotated with ``turn_end`` events where the
+candidate actually finished. The adaptive endpointer is compared against
+fixed silence timeouts: 0.5s, and 1.05s, which is what silero's default
+0.55s end-of-speech plus AgentSession's default 0.5s endpointing delay add
+up to.
+
+    python -m benchmarks.bench_endpointing
+    python -m benchmarks.bench_endpointing --tune
+"""
+
+import argparse
+import glob
+import os
+from typing import Callable, Dict, List
+
+from agent_core import endpointing
+from agent_core.endpointing import AdaptiveEndpointer, PauseProfile, load_trace, replay
+from agent_core.metrics import percentile
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "endpointing")
+# Seconds of latency one cut-off is considered to cost, for --tune
+CUTOFF_COST = 3.0
+
+
+def evaluate(events: List[Dict], make: Callable[..., AdaptiveEndpointer]) -> Dict:
+    commits: List[float] = []
+    barge_ins: List[float] = []
+    clock = {"now": 0.0}
+
+    endpointer = make(
+        on_end_of_turn=lambda text: commits.append(clock["now"]),
+        on_barge_in=lambda: barge_ins.append(clock["now"]),
+    )
+    # Callbacks fire from inside poll/feed; track the time they are called at
+    poll, feed = endpointer.poll, endpointer.feed
+
+    def timed_poll(now: float) -> None:
+        clock["now"] = now
+        poll(now)
+
+    def timed_feed(event: Dict) -> None:
+        clock["now"] = event["t"]
+        feed(event)
+
+    endpointer.poll, endpointer.feed = timed_poll, timed_feed
+    replay(endpointer, events)
+
+    # A labeled turn runs from the first speech after the agent stops to its turn_end
+    latencies, cutoffs, missed = [], 0, 0
+    turn_start = None
+    for event in events:
+        if event["event"] == "agent_stop":
+            turn_start = None
+        elif event["event"] == "speech_start" and turn_start is None:
+            turn_start = event["t"]
+        elif event["event"] == "turn_end":
+            end = event["t"]
+            cutoffs += sum(1 for c in commits if (turn_start or end) <= c < end)
+            following = [c for c in commits if c >= end]
+            next_speech = min((e["t"] for e in events if e["event"] == "speech_start" and e["t"] > end), default=None)
+            if following and (next_speech is None or following[0] <= next_speech):
+                latencies.append(following[0] - end)
+            else:
+                missed += 1
+            turn_start = None
+
+    return {
+        "latencies": latencies,
+        "cutoffs": cutoffs,
+        "missed": missed,
+        "barge_ins": len(barge_ins),
+        "allowance": endpointer.profile.allowance,
+    }
+
+
+def fixed(delay: float) -> Callable[..., AdaptiveEndpointer]:
+    return lambda **kw: AdaptiveEndpointer(min_delay=delay, max_delay=delay, **kw)
+
+
+def adaptive(min_delay: float = endpointing.MIN_DELAY, allowance: float = endpointing.DEFAULT_ALLOWANCE) -> Callable[..., AdaptiveEndpointer]:
+    return lambda **kw: AdaptiveEndpointer(min_delay=min_delay, profile=PauseProfile(allowance), **kw)
+
+
+def run(traces: Dict[str, List[Dict]], make: Callable[..., AdaptiveEndpointer]) -> Dict:
+    total = {"latencies": [], "cutoffs": 0, "missed": 0, "barge_ins": 0}
+    for events in traces.values():
+        result = evaluate(events, make)
+        total["latencies"] += result["latencies"]
+        for key in ("cutoffs", "missed", "barge_ins"):
+            total[key] += result[key]
+    return total
+
+
+def report(name: str, result: Dict) -> None:
+    latencies = result["latencies"]
+    mean = sum(latencies) / len(latencies) if latencies else 0.0
+    print(
+        f"{name:<22} turns {len(latencies):3d}  mean {mean * 1000:6.0f} ms  "
+        f"p95 {percentile(latencies, 95) * 1000:6.0f} ms  cut-offs {result['cutoffs']:2d}  "
+        f"missed {result['missed']:2d}  barge-ins {result['barge_ins']:2d}"
+    )
+
+
+def cost(result: Dict) -> float:
+    return sum(result["latencies"]) + CUTOFF_COST * result["cutoffs"] + CUTOFF_COST * result["missed"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", default=FIXTURES, help="directory of .jsonl traces")
+    parser.add_argument("--tune", action="store_true", help="grid-search MIN_DELAY and DEFAULT_ALLOWANCE")
+    args = parser.parse_args()
+
+    traces = {
+        os.path.basename(path): load_trace(path)
+        for path in sorted(glob.glob(os.path.join(args.fixtures, "*.jsonl")))
+    }
+    print(f"{len(traces)} traces from {args.fixtures}")
+
+    report("fixed 0.50s", run(traces, fixed(0.5)))
+    report("fixed 1.05s", run(traces, fixed(1.05)))
+    report("adaptive", run(traces, adaptive()))
+    for name, events in traces.items():
+        result = evaluate(events, adaptive())
+        report(f"  {name}", result)
+
+    if args.tune:
+        grid = [
+            (cost(run(traces, adaptive(min_delay, allowance))), min_delay, allowance)
+            for min_delay in (0.15, 0.2, 0.25, 0.3, 0.4)
+            for allowance in (0.8, 1.0, 1.2, 1.4, 1.6, 1.8)
+        ]
+        for score, min_delay, allowance in sorted(grid)[:5]:
+            print(f"MIN_DELAY={min_delay:.2f} DEFAULT_ALLOWANCE={allowance:.1f}  cost {score:.2f}")
+
+
+if __name__ == "__main__":
+    main()
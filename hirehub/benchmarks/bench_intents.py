@@ -0,0 +1,77 @@
+"""Accuracy and per-utterance latency of the intent classifier
+
+Every fifth corpus utterance is held out; the classifier is trained on the
+rest and compared against the phrase-list scan it replaced.
+
+    python -m benchmarks.bench_intents
+"""
+
+import argparse
+import json
+import time
+from collections import Counter
+
+from agent_core.intents import (
+    PATTERNS_PATH,
+    IntentClassifier,
+    load_corpus,
+)
+
+
+def legacy_intent(text: str) -> str:
+    """The ordered phrase-list scan from the original process_conversation"""
+    text_lower = text.lower()
+    if any(phrase in text_lower for phrase in ["review", "summary", "read it back", "what do we have", "looks good", "submit", "post it", "create it"]):
+        return "review"
+    if any(phrase in text_lower for phrase in ["yes, submit", "yes submit", "looks perfect", "submit it", "post the job", "create the job", "yes, that's correct"]):
+        return "confirm_submit"
+    if any(phrase in text_lower for phrase in ["undo that", "undo the last", "go back to what it was", "change it back"]):
+        return "undo"
+    if any(phrase in text_lower for phrase in ["change", "update", "modify", "edit", "different"]):
+        return "edit"
+    return "other"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200, help="latency passes over the corpus")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    train = [ex for i, ex in enumerate(corpus) if i % 5]
+    held_out = [ex for i, ex in enumerate(corpus) if not i % 5]
+
+    with open(PATTERNS_PATH, encoding="utf-8") as f:
+        patterns = json.load(f)
+    start = time.perf_counter()
+    classifier = IntentClassifier(patterns, train)
+    print(f"build: {(time.perf_counter() - start) * 1000:.1f} ms on {len(train)} utterances")
+
+    for name, predict in (("classifier", lambda t: classifier.classify(t).intent), ("legacy", legacy_intent)):
+        correct = 0
+        confusion = Counter()
+        for text, intent in held_out:
+            predicted = predict(text)
+            correct += predicted == intent
+            if predicted != intent:
+                confusion[(intent, predicted)] += 1
+        print(f"{name:<10} held-out accuracy: {correct}/{len(held_out)} ({correct / len(held_out):.0%})")
+        for (expected, predicted), count in confusion.most_common(5):
+            print(f"    {expected} -> {predicted}: {count}")
+
+    samples = []
+    for _ in range(args.repeat):
+        for text, _ in corpus:
+            start = time.perf_counter()
+            classifier.rank(text)
+            samples.append(time.perf_counter() - start)
+    print(f"latency: p50 {percentile(samples, 50) * 1e6:.1f} us  p99 {percentile(samples, 99) * 1e6:.1f} us  ({len(samples)} utterances)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Cost of the event-loop monitor, and whether it catches a blocking handler
+
+Runs a busy loop (many tasks yielding to each other, as a loaded agent
+worker would) with and without a watched session, then blocks the loop
+from a session event handler and checks the monitor's stack sample points
+at it.
+
+    python -m benchmarks.bench_loop_monitor
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from agent_core import loop_monitor
+from agent_core.runtime import AgentRuntime, SessionRuntime
+from benchmarks.bench_sessions import Emitter
+
+
+async def busy(tasks: int, switches: int) -> float:
+    async def worker() -> None:
+        for _ in range(switches):
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(tasks)))
+    return time.perf_counter() - start
+
+
+async def overhead(tasks: int, switches: int, rounds: int) -> None:
+    runtime = AgentRuntime("bench")
+    for monitored in (False, True):
+        os.environ["LOOP_MONITOR"] = "1" if monitored else "0"
+        session = SessionRuntime(runtime, "overhead")
+        times = sorted([await busy(tasks, switches) for _ in range(rounds)])
+        await session.shutdown()
+        print(f"monitor {'on ' if monitored else 'off'}  best {times[0] * 1000:7.1f} ms  median {times[len(times) // 2] * 1000:7.1f} ms")
+    os.environ.pop("LOOP_MONITOR")
+
+
+def blocking_handler(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def detection(block: float) -> None:
+    session = SessionRuntime(AgentRuntime("bench"), "detection")
+    emitter = Emitter()
+
+    @session.on(emitter, "user_speech")
+    def on_user_speech(seconds):
+        blocking_handler(seconds)
+
+    # Let the watchdog start pinging, then block the loop
+    await asyncio.sleep(0.05)
+    emitter.emit("user_speech", block)
+    await asyncio.sleep(loop_monitor.PING * 4)
+
+    slowest = session.monitor.slowest(1)
+    caught = bool(slowest and slowest[0]["stack"] and "blocking_handler" in slowest[0]["stack"])
+    print(f"blocked {block * 1000:.0f} ms: slow callbacks {session.metrics.counters.get('loop.slow_callbacks', 0)}, "
+          f"stack sample points at the handler: {caught}")
+    if slowest:
+        print(f"  measured {slowest[0]['blocked_s'] * 1000:.0f} ms, innermost frames: {' <- '.join(reversed((slowest[0]['stack'] or '').split(';')[-3:]))}")
+    await session.shutdown()
+
+
+async def main(args: argparse.Namespace) -> None:
+    await overhead(args.tasks, args.switches, args.rounds)
+    await detection(args.block)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--switches", type=int, default=2000, help="yields per task")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--block", type=float, default=0.3, help="seconds the handler blocks")
+    asyncio.run(main(parser.parse_args()))
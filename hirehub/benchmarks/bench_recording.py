@@ -0,0 +1,88 @@
+"""Event-loop cost and memory of the audio recorder
+
+Feeds synthetic 20 ms frames from several concurrent tracks through
+``TrackRecorder`` (no LiveKit connection) and reports per-frame loop time,
+peak traced memory and what was encoded. ``--encode-delay`` stalls every
+segment encode to show that a slow encoder costs dropped audio, not memory.
+
+    python -m benchmarks.bench_recording
+    python -m benchmarks.bench_recording --encode-delay 30 --seconds 60
+"""
+
+import argparse
+import asyncio
+import math
+import shutil
+import struct
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from agent_core import recording
+from agent_core.metrics import percentile
+from agent_core.recording import CHANNELS, SAMPLE_RATE, TrackRecorder
+
+FRAME_MS = 20
+
+
+def tone(samples: int, hz: float = 220.0) -> bytes:
+    return struct.pack(
+        f"<{samples}h", *(int(8000 * math.sin(2 * math.pi * hz * i / SAMPLE_RATE)) for i in range(samples))
+    )
+
+
+async def run(tracks: int, seconds: int, fmt: str, encode_delay: float) -> None:
+    frame = tone(SAMPLE_RATE * FRAME_MS // 1000 * CHANNELS)
+    directory = tempfile.mkdtemp(prefix="bench-recording-")
+    executor = ThreadPoolExecutor(max_workers=recording.ENCODER_WORKERS)
+    encode = recording.encode_segment
+    if encode_delay:
+        def slow_encode(*args):
+            time.sleep(encode_delay)
+            return encode(*args)
+        recording.encode_segment = slow_encode
+
+    try:
+        tracemalloc.start()
+        recorders = [TrackRecorder(f"{directory}/track{i}", fmt, executor=executor) for i in range(tracks)]
+        frame_times: List[float] = []
+        start = time.perf_counter()
+        for _ in range(seconds * 1000 // FRAME_MS):
+            for recorder in recorders:
+                t0 = time.perf_counter()
+                recorder.write(frame)
+                frame_times.append(time.perf_counter() - t0)
+            # Let encode completions run, as they would between real frames
+            await asyncio.sleep(0)
+        feed_time = time.perf_counter() - start
+        manifests = [await recorder.close() for recorder in recorders]
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        recording.encode_segment = encode
+        executor.shutdown()
+        shutil.rmtree(directory)
+
+    segments = sum(len(m["segments"]) for m in manifests)
+    encoded = sum(s["bytes"] for m in manifests for s in m["segments"])
+    dropped = sum(m["dropped_seconds"] for m in manifests)
+    print(f"{tracks} tracks x {seconds}s, format {manifests[0]['format']}, encode delay {encode_delay}s")
+    print(
+        f"  per frame  p50 {percentile(frame_times, 50) * 1e6:7.1f} us  p99 {percentile(frame_times, 99) * 1e6:7.1f} us  "
+        f"max {max(frame_times) * 1e6:7.1f} us  over {recording.FRAME_BUDGET * 1000:.0f} ms budget: "
+        f"{sum(r.over_budget for r in recorders)}"
+    )
+    print(f"  fed {len(frame_times)} frames in {feed_time:.2f}s, peak traced memory {peak / 1024:.0f} KiB")
+    print(f"  {segments} segments, {encoded / 1024:.0f} KiB on disk, {dropped:.1f}s of audio dropped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracks", type=int, default=8)
+    parser.add_argument("--seconds", type=int, default=120, help="audio per track")
+    parser.add_argument("--format", default=recording.DEFAULT_FORMAT, choices=sorted(recording.FORMATS))
+    parser.add_argument("--encode-delay", type=float, default=0.0, help="seconds each encode is stalled")
+    args = parser.parse_args()
+    asyncio.run(run(args.tracks, args.seconds, args.format, args.encode_delay))
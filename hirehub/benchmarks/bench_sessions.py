@@ -0,0 +1,169 @@
+"""Per-session overhead of the shared agent runtime, by agent type
+
+Each session is built against stand-in room and session emitters (no LiveKit
+connection, no model calls), so the numbers cover only what our code does
+per room: creating the session runtime, wiring handlers, the agent's own
+per-session state and a few turns of event handling, then shutdown.
+
+    python -m benchmarks.bench_sessions
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from agent_core.intents import load_intent_classifier
+from agent_core.job_draft import JobDraft
+from agent_core.metrics import percentile
+from agent_core.question_bank import build_question_plan, load_question_bank
+from agent_core.runtime import AgentRuntime, SessionRuntime
+
+JOB = {
+    "title": "Senior Backend Engineer",
+    "skillsRequired": ["Python", "PostgreSQL", "AWS"],
+    "experienceLevel": "senior",
+}
+RESUME = {"skills": ["python", "django", "postgres"], "experience": "6 years"}
+TURNS = [
+    "I have six years of backend experience, mostly Python and Postgres.",
+    "We moved the billing service to AWS and cut latency by half.",
+    "I usually pair with the on-call engineer when an incident is open.",
+]
+RECRUITER_TURNS = [
+    "The title is senior backend engineer, fully remote.",
+    "Change the salary to 150 to 180 thousand.",
+    "Can you read it back to me?",
+]
+
+
+class Emitter:
+    def __init__(self) -> None:
+        self.handlers: Dict[str, List[Callable]] = {}
+
+    def on(self, event: str, callback: Callable) -> None:
+        self.handlers.setdefault(event, []).append(callback)
+
+    def emit(self, event: str, *args) -> None:
+        for callback in self.handlers.get(event, ()):
+            callback(*args)
+
+
+class Room(Emitter):
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.name = name
+
+
+class Context:
+    def __init__(self, name: str) -> None:
+        self.room = Room(name)
+        self.shutdown_callbacks: List[Callable] = []
+
+    def add_shutdown_callback(self, callback: Callable) -> None:
+        self.shutdown_callbacks.append(callback)
+
+
+class Event:
+    def __init__(self, text: str) -> None:
+        self.is_final = True
+        self.transcript = text
+
+
+def interview(runtime: SessionRuntime, session: Emitter) -> None:
+    plan = build_question_plan(JOB, RESUME)
+
+    @runtime.on(session, "user_input_transcribed")
+    def on_user(event):
+        runtime.transcript.add("candidate", event.transcript)
+
+    for question, answer in zip(plan, TURNS):
+        runtime.transcript.add("interviewer", question["question"], question_id=question["id"])
+        session.emit("user_input_transcribed", Event(answer))
+
+
+def job_posting(runtime: SessionRuntime, session: Emitter) -> None:
+    draft = JobDraft()
+    classifier = load_intent_classifier()
+
+    @runtime.on(session, "user_input_transcribed")
+    def on_user(event):
+        runtime.transcript.add("recruiter", event.transcript)
+        classifier.classify(event.transcript)
+        draft.set("title", JOB["title"])
+
+    for text in RECRUITER_TURNS:
+        session.emit("user_input_transcribed", Event(text))
+
+
+def livekit_agent(runtime: SessionRuntime, session: Emitter) -> None:
+    @runtime.on(session, "user_input_transcribed")
+    def on_user(event):
+        runtime.transcript.last(1, speaker="interviewer")
+        runtime.transcript.add("candidate", event.transcript)
+        runtime.transcript.as_text(6)
+
+    for answer in TURNS:
+        runtime.transcript.add("interviewer", "Tell me more about that.")
+        session.emit("user_input_transcribed", Event(answer))
+
+
+def realtime(runtime: SessionRuntime, session: Emitter) -> None:
+    @runtime.on(session, "conversation_item_added")
+    def on_item(event):
+        runtime.transcript.add("candidate", event.transcript)
+
+    for answer in TURNS:
+        session.emit("conversation_item_added", Event(answer))
+
+
+AGENTS = {
+    "interview-agent": interview,
+    "job-posting-agent": job_posting,
+    "livekit-agent": livekit_agent,
+    "livekit-interview-agent": realtime,
+}
+
+
+async def run_session(runtime: AgentRuntime, name: str, policy: Callable) -> None:
+    ctx = Context(name)
+    session_runtime = runtime.session(ctx)
+    policy(session_runtime, Emitter())
+    for callback in ctx.shutdown_callbacks:
+        await callback()
+
+
+async def measure(agent_type: str, policy: Callable, sessions: int) -> None:
+    runtime = AgentRuntime(agent_type)
+    await run_session(runtime, "warmup", policy)
+
+    samples = []
+    for i in range(sessions):
+        start = time.perf_counter()
+        await run_session(runtime, f"room-{i}", policy)
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    await run_session(runtime, "traced", policy)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{agent_type:<24} p50 {percentile(samples, 50) * 1e6:8.1f} us  "
+        f"p95 {percentile(samples, 95) * 1e6:8.1f} us  peak {peak / 1024:7.1f} KiB"
+    )
+
+
+async def main(sessions: int) -> None:
+    load_question_bank()
+    load_intent_classifier()
+    for agent_type, policy in AGENTS.items():
+        await measure(agent_type, policy, sessions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=500, help="sessions per agent type")
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions))
@@ -0,0 +1,99 @@
+"""Benchmark the skill taxonomy on thousands of skills x thousands of resumes
+
+    python -m benchmarks.bench_skills --skills 5000 --resumes 5000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from agent_core.skills import (
+    SKILLS_PATH,
+    SkillTaxonomy,
+    fold,
+    overlap_score,
+    REQUIRED_WEIGHT,
+    PREFERRED_WEIGHT,
+)
+
+SPEECH = (
+    "We're looking for a senior engineer who knows {a} and {b} really well, "
+    "has shipped production {c} services, and ideally some {d} experience would be a plus."
+)
+
+
+def build_taxonomy(extra_skills: int, rng: random.Random) -> SkillTaxonomy:
+    with open(SKILLS_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    entries = list(data["skills"])
+    for i in range(extra_skills):
+        name = f"Skill{i} Framework"
+        entries.append({"name": name, "aliases": [f"skill{i}", f"skill{i}fw", f"skill {i} framework js"]})
+    rng.shuffle(entries)
+    return SkillTaxonomy(entries, data.get("speech_ambiguous", ()))
+
+
+def variant(name: str, rng: random.Random) -> str:
+    """A messy spelling of a skill, as it would appear on a parsed resume"""
+    choice = rng.random()
+    if choice < 0.3:
+        return name.upper()
+    if choice < 0.6:
+        return f"  {name.lower()} "
+    if choice < 0.7 and len(name) > 6:
+        # Drop one character to exercise the fuzzy fallback
+        i = rng.randrange(1, len(name) - 1)
+        return name[:i] + name[i + 1:]
+    return name
+
+
+def timed(label: str, count: int, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed * 1000:9.1f} ms total  {elapsed / max(count, 1) * 1e6:9.2f} us/op")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skills", type=int, default=5000, help="synthetic skills added to the taxonomy")
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    taxonomy = timed("build taxonomy", 1, lambda: build_taxonomy(args.skills, rng))
+    names = list(taxonomy.names.values())
+    print(f"{len(taxonomy.names)} skills, {len(taxonomy.aliases)} aliases")
+
+    resumes = [[variant(rng.choice(names), rng) for _ in range(rng.randint(5, 25))] for _ in range(args.resumes)]
+    jobs = [
+        ([rng.choice(names) for _ in range(rng.randint(3, 8))], [rng.choice(names) for _ in range(rng.randint(0, 4))])
+        for _ in range(args.jobs)
+    ]
+    sentences = [SPEECH.format(**{k: rng.choice(names) for k in "abcd"}) for _ in range(args.resumes)]
+    total_skills = sum(len(r) for r in resumes)
+
+    def vectorize():
+        return [{taxonomy.canonical_key(s): 1.0 for s in resume if fold(s)} for resume in resumes]
+
+    timed("normalize resume skills (cold)", total_skills, vectorize)
+    resume_vectors = timed("normalize resume skills (warm)", total_skills, vectorize)
+
+    def score():
+        best = []
+        for required, preferred in jobs:
+            job_vector = {taxonomy.canonical_key(s): PREFERRED_WEIGHT for s in preferred}
+            job_vector.update({taxonomy.canonical_key(s): REQUIRED_WEIGHT for s in required})
+            best.append(max(overlap_score(job_vector, r) for r in resume_vectors))
+        return best
+
+    timed("score jobs x resumes", args.jobs * args.resumes, score)
+    timed("extract skills from speech", len(sentences), lambda: [taxonomy.extract(s) for s in sentences])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Import-time budget for the agent entry points
+
+Loads an agent script in a fresh interpreter under ``-X importtime`` (without
+running its ``__main__`` block), reports the heaviest top-level imports and
+exits non-zero when the total exceeds the budget.
+
+    python -m benchmarks.bench_startup interview-agent.py --budget-ms 1500
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import List, Tuple
+
+LOADER = (
+    "import importlib.util as u, sys; "
+    "spec = u.spec_from_file_location('agent_under_test', sys.argv[1]); "
+    "spec.loader.exec_module(u.module_from_spec(spec))"
+)
+
+
+def import_times(script: str) -> List[Tuple[str, int]]:
+    """(module, cumulative microseconds) for every top-level import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", LOADER, script],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else ""
+        raise SystemExit(f"{script} failed to import: {last_line}")
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        # Nested imports are indented under their parent; keep top-level only
+        if not name.startswith("  "):
+            times.append((name.strip(), int(cumulative)))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("scripts", nargs="+")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    over_budget = False
+    for script in args.scripts:
+        times = import_times(script)
+        total_ms = sum(us for _, us in times) / 1000
+        status = "OK" if total_ms <= args.budget_ms else "OVER BUDGET"
+        over_budget |= total_ms > args.budget_ms
+        print(f"{script}: {total_ms:.0f} ms of imports (budget {args.budget_ms:.0f} ms) {status}")
+        for name, us in sorted(times, key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"    {us / 1000:8.1f} ms  {name}")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
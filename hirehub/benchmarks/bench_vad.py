@@ -0,0 +1,90 @@
+"""CPU per room: silero VAD per stream vs. batched across rooms
+
+Simulates N rooms each delivering a 32 ms window of 16 kHz audio on a
+realtime clock (with a random phase per room, as real rooms aren't in
+step), each from its own thread like the plugin's per-stream executor.
+"per-room" runs the plugin's own OnnxModel, one inference per window;
+"batched" runs every room through one ``VadEngine``. Reports process CPU
+per room per second of audio, window latency (scheduled arrival to result)
+and windows over ``FRAME_DEADLINE``.
+
+    python -m benchmarks.bench_vad --rooms 1,8,32 --seconds 5
+"""
+
+import argparse
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+from livekit.plugins.silero import onnx_model
+
+from agent_core.batched_vad import CADENCE, FRAME_DEADLINE, BatchedModel, VadEngine
+from agent_core.metrics import percentile
+
+SAMPLE_RATE = 16000
+WINDOW = 512
+WINDOW_SECONDS = WINDOW / SAMPLE_RATE
+
+
+def audio(seconds: float, seed: int) -> np.ndarray:
+    """Noise with bursts of louder tone, so the model sees both speech-ish and silence"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    bursts = (np.sin(2 * np.pi * 0.5 * t) > 0).astype(np.float32)
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) * bursts
+    return (tone + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def run_rooms(rooms: int, seconds: float, make_model: Callable[[], Any]) -> Dict[str, Any]:
+    latencies: List[List[float]] = [[] for _ in range(rooms)]
+    start = time.perf_counter() + 0.05
+
+    def room(index: int) -> None:
+        model = make_model()
+        samples = audio(seconds, index)
+        phase = random.Random(index).uniform(0, WINDOW_SECONDS)
+        for i in range(len(samples) // WINDOW):
+            due = start + phase + (i + 1) * WINDOW_SECONDS
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            model(samples[i * WINDOW:(i + 1) * WINDOW])
+            latencies[index].append(time.perf_counter() - due)
+
+    threads = [threading.Thread(target=room, args=(i,)) for i in range(rooms)]
+    cpu = time.process_time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cpu = time.process_time() - cpu
+
+    flat = [latency for per_room in latencies for latency in per_room]
+    return {
+        "cpu_ms_per_room_s": cpu * 1000 / rooms / seconds,
+        "p99_ms": percentile(flat, 99) * 1000,
+        "late": sum(1 for latency in flat if latency > FRAME_DEADLINE),
+        "windows": len(flat),
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    session = onnx_model.new_inference_session(force_cpu=True)
+    print(f"{'rooms':>5}  {'mode':<8}  {'CPU ms/room/s':>13}  {'p99 ms':>7}  {'late':>9}  batch")
+    for rooms in [int(n) for n in args.rooms.split(",")]:
+        per_room = run_rooms(rooms, args.seconds, lambda: onnx_model.OnnxModel(onnx_session=session, sample_rate=SAMPLE_RATE))
+        engine = VadEngine(session, SAMPLE_RATE, cadence=args.cadence)
+        batched = run_rooms(rooms, args.seconds, lambda: BatchedModel(engine))
+        for mode, result, batch in (("per-room", per_room, "1.0"), ("batched", batched, engine.summary()["mean_batch"])):
+            print(f"{rooms:>5}  {mode:<8}  {result['cpu_ms_per_room_s']:>13.1f}  {result['p99_ms']:>7.2f}  "
+                  f"{result['late']:>4}/{result['windows']:<4}  {batch}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", default="1,8,32", help="comma-separated room counts")
+    parser.add_argument("--seconds", type=float, default=5.0, help="audio per room")
+    parser.add_argument("--cadence", type=float, default=CADENCE, help="batching window in seconds")
+    main(parser.parse_args())
@@ -0,0 +1,446 @@
+"""Regression suite for the agent hot paths, with JSON baselines
+
+Each case times one hot-path operation (job-info extraction, a recruiter
+turn, summary rendering, question planning, transcript serialization,
+prompt assembly, a simulated interview turn against a stub LLM) and records
+p50/p99 per call plus tracemalloc's peak and retained bytes over a batch of
+calls. Every case runs ``--rounds`` times and keeps the round with the best
+p50, which filters most scheduler noise.
+
+    python -m benchmarks.suite run --out benchmarks/baselines/$(hostname).json
+    python -m benchmarks.suite compare benchmarks/baselines/$(hostname).json
+    python -m benchmarks.suite compare old.json new.json --p50 0.2 --p99 0.5
+
+``compare`` (which runs the suite now unless given a second file) exits 1
+when a case's p50, p99 or peak allocation grew past its threshold, relative
+and by more than the absolute floor, so a 2 us case going to 3 us on a busy
+machine doesn't fail a build. Timings are only comparable on the same
+machine: record a baseline per machine (or CI runner type).
+
+The agent scripts import livekit and dotenv at load. Where those aren't
+installed, the suite puts stand-ins for them in ``sys.modules``
+(``stub_livekit``): the cases run the scripts' own code against
+``StubLLM``, so only the names have to exist. A case that still can't run
+is reported as skipped, and ``compare`` fails if it wasn't skipped in the
+baseline, so a broken import can't hide a regression.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import inspect
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import ModuleType, SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from agent_core.metrics import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ITERATIONS = 2000
+ALLOC_ITERATIONS = 200
+ROUNDS = 3
+
+# Relative growth that counts as a regression, and the absolute floor under which it doesn't
+P50_THRESHOLD = 0.25
+P99_THRESHOLD = 0.5
+ALLOC_THRESHOLD = 0.2
+MIN_DELTA_US = 5.0
+MIN_DELTA_KIB = 4.0
+
+JOB = {
+    "job": {
+        "id": "bench-job",
+        "title": "Senior Backend Engineer",
+        "company": "Bench Co",
+        "experienceLevel": "senior",
+        "skillsRequired": ["Python", "PostgreSQL", "AWS"],
+        "skillsPreferred": ["Kubernetes"],
+    },
+    "resume": {"name": "Sam", "skills": ["python", "django", "postgres"], "experience": "6 years"},
+}
+RECRUITER_TURNS = [
+    "We're hiring a senior backend engineer, full time and fully remote.",
+    "Required skills are Python, PostgreSQL and AWS; Kubernetes would be a plus.",
+    "The salary is 150k to 180k.",
+    "Can you read it back to me?",
+    "Actually, undo that last change.",
+]
+ANSWERS = [
+    "I have six years of backend experience, mostly Python and Postgres.",
+    "We moved the billing service to AWS and cut p99 latency by half.",
+    "I usually pair with the on-call engineer when an incident is open.",
+]
+STUB_REPLY = json.dumps({
+    "key_points": ["migration", "latency"],
+    "technical_skills_mentioned": ["AWS", "PostgreSQL"],
+    "soft_skills_demonstrated": ["communication"],
+    "confidence_level": "high",
+    "clarity_score": 8,
+    "relevance_score": 9,
+})
+
+# name -> setup returning the operation to time (sync or async, no arguments)
+CASES: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def case(name: str) -> Callable:
+    def decorator(setup: Callable[[], Callable[[], Any]]) -> Callable:
+        CASES[name] = setup
+        return setup
+    return decorator
+
+
+_scripts: Dict[str, ModuleType] = {}
+
+
+class _Stub:
+    """Any LiveKit class the scripts subclass or construct at load"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+class _StubChatContext(_Stub):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.messages: List[Any] = []
+
+    def add_message(self, **kwargs: Any) -> None:
+        self.messages.append(SimpleNamespace(**kwargs))
+
+
+class _StubStopResponse(Exception):
+    pass
+
+
+def stub_livekit() -> bool:
+    """Install livekit and dotenv stand-ins if they aren't installed; True if any were"""
+    stubbed = False
+    try:
+        import dotenv  # noqa: F401
+    except ImportError:
+        dotenv_stub = ModuleType("dotenv")
+        dotenv_stub.load_dotenv = lambda *args, **kwargs: False
+        sys.modules["dotenv"] = dotenv_stub
+        stubbed = True
+    try:
+        import livekit.agents  # noqa: F401
+    except ImportError:
+        livekit, agents, llm = ModuleType("livekit"), ModuleType("livekit.agents"), ModuleType("livekit.agents.llm")
+        livekit.__path__ = agents.__path__ = []
+        livekit.agents, agents.llm = agents, llm
+        for name in ("Agent", "AgentSession", "JobContext", "RoomInputOptions", "WorkerOptions"):
+            setattr(agents, name, type(name, (_Stub,), {}))
+        agents.AutoSubscribe = SimpleNamespace(AUDIO_ONLY="audio_only", SUBSCRIBE_ALL="subscribe_all")
+        agents.JobExecutorType = SimpleNamespace(PROCESS="process", THREAD="thread")
+        llm.ChatContext = _StubChatContext
+        llm.ChatMessage = type("ChatMessage", (_Stub,), {})
+        llm.StopResponse = _StubStopResponse
+        sys.modules.update({"livekit": livekit, "livekit.agents": agents, "livekit.agents.llm": llm})
+        stubbed = True
+    return stubbed
+
+
+def load_script(filename: str) -> ModuleType:
+    """Import an agent script (hyphenated, so not importable by name) without running it"""
+    module = _scripts.get(filename)
+    if module is None:
+        name = filename[:-3].replace("-", "_")
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _scripts[filename] = module
+    return module
+
+
+def interview_config() -> Any:
+    from agent_core.interview_config import parse_interview_config
+
+    return parse_interview_config(JOB)
+
+
+class StubLLM:
+    """Streams a canned reply in a few chunks, with usage, like a provider LLM"""
+
+    def __init__(self, model: str = "stub", **kwargs: Any) -> None:
+        self.model = model
+
+    def chat(self, chat_ctx: Any, **kwargs: Any) -> "_StubStream":
+        return _StubStream()
+
+
+class _StubStream:
+    async def __aenter__(self) -> "_StubStream":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def __aiter__(self):
+        for i in range(0, len(STUB_REPLY), 40):
+            yield SimpleNamespace(delta=SimpleNamespace(content=STUB_REPLY[i:i + 40]), usage=None)
+        usage = SimpleNamespace(prompt_tokens=900, prompt_cached_tokens=768, completion_tokens=60)
+        yield SimpleNamespace(delta=None, usage=usage)
+
+
+@case("job_posting.extract_job_info")
+def extract_job_info() -> Callable:
+    assistant = load_script("job-posting-agent.py").JobPostingAssistant()
+    turns = itertools.cycle(RECRUITER_TURNS)
+    return lambda: assistant.extract_job_info(next(turns))
+
+
+@case("job_posting.process_conversation")
+def process_conversation() -> Callable:
+    module = load_script("job-posting-agent.py")
+    state = {"assistant": module.JobPostingAssistant(), "turn": 0}
+
+    async def turn() -> None:
+        # A fresh draft per conversation, so every pass does the same work
+        if state["turn"] % len(RECRUITER_TURNS) == 0:
+            state["assistant"] = module.JobPostingAssistant()
+        await state["assistant"].process_conversation(RECRUITER_TURNS[state["turn"] % len(RECRUITER_TURNS)])
+        state["turn"] += 1
+    return turn
+
+
+@case("job_posting.format_job_summary")
+def format_job_summary() -> Callable:
+    module = load_script("job-posting-agent.py")
+    assistant = module.JobPostingAssistant()
+    asyncio.run(assistant.update_job_data({"title": "Senior Backend Engineer", "salaryMin": 150000, "salaryMax": 180000}))
+    # Uncached: what the first read-back of each draft version costs
+    return lambda: module.render_job_summary(assistant.job_data)
+
+
+@case("interview._generate_interview_questions")
+def generate_interview_questions() -> Callable:
+    from agent_core.interview_config import question_plan
+    from agent_core.question_bank import load_question_bank
+
+    load_question_bank()
+    config = interview_config()
+    return lambda: question_plan(config)
+
+
+@case("interview.candidate_context")
+def cached_candidate_context() -> Callable:
+    from agent_core.candidate_context import candidate_context
+    from agent_core.question_bank import load_question_bank
+
+    load_question_bank()
+    config = interview_config()
+    # Interview start after handle_request (or the CLI) precomputed the context
+    candidate_context(config)
+    return lambda: candidate_context(config)
+
+
+@case("transcript.serialize")
+def transcript_serialize() -> Callable:
+    from agent_core.transcript import TranscriptStore
+
+    transcript = TranscriptStore()
+    for i in range(20):
+        transcript.add("interviewer", f"Question {i}: tell me about a system you designed.", question_id=f"q{i}")
+        transcript.add("candidate", ANSWERS[i % len(ANSWERS)])
+
+    def serialize() -> None:
+        transcript.as_text()
+        json.dumps(transcript.turns())
+    return serialize
+
+
+@case("prompt.assemble")
+def prompt_assemble() -> Callable:
+    from agent_core.prompts import Prompt
+    from agent_core.scoring import scoring_prompt
+
+    config = interview_config()
+    base = scoring_prompt(config)
+    prompt = Prompt(stable=base.stable, job=base.job, candidate="CANDIDATE: Sam\n- Skills: python, django")
+
+    def assemble() -> None:
+        turn = prompt.with_turn(f"Analyze this exchange:\n\nQuestion: {ANSWERS[0]}\nAnswer: {ANSWERS[1]}")
+        turn.messages()
+        turn.prefix_digest()
+    return assemble
+
+
+@case("turn.livekit_agent")
+def livekit_agent_turn() -> Callable:
+    from agent_core import providers
+    from agent_core.question_bank import load_question_bank
+    from agent_core.runtime import SessionRuntime
+
+    providers.register("llm", "openai")(StubLLM)
+    load_question_bank()
+    module = load_script("livekit-agent.py")
+    config = interview_config()
+
+    async def turn() -> None:
+        # One candidate answer: record it, analyze it, steer the reply to the next question
+        runtime = SessionRuntime(module.RUNTIME, "bench")
+        agent = module.InterviewAgent(config, runtime)
+        agent.questions_asked = 1
+        for answer in ANSWERS:
+            question = agent.fallback_question()
+            agent.turn_instructions()
+            runtime.transcript.add("interviewer", question)
+            runtime.transcript.add("candidate", answer)
+            await agent.analyze_response(question, answer)
+        await runtime.shutdown()
+    return turn
+
+
+async def _timed(op: Callable[[], Any], iterations: int) -> List[float]:
+    """Per-call seconds; awaits the result when the operation is async"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = op()
+        if inspect.isawaitable(result):
+            await result
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def measure(op: Callable[[], Any], iterations: int, alloc_iterations: int, rounds: int) -> Dict[str, Any]:
+    asyncio.run(_timed(op, max(10, iterations // 10)))
+    best: Optional[List[float]] = None
+    for _ in range(rounds):
+        samples = asyncio.run(_timed(op, iterations))
+        if best is None or percentile(samples, 50) < percentile(best, 50):
+            best = samples
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    asyncio.run(_timed(op, alloc_iterations))
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "p50_us": round(percentile(best, 50) * 1e6, 2),
+        "p99_us": round(percentile(best, 99) * 1e6, 2),
+        "mean_us": round(sum(best) / len(best) * 1e6, 2),
+        "peak_kib": round((peak - before) / 1024, 1),
+        "retained_b_per_op": round((after - before) / alloc_iterations, 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run_suite(selected: Optional[str], iterations: int, alloc_iterations: int, rounds: int) -> Dict[str, Any]:
+    # Keep the job cache out of the working tree, and fresh per run
+    os.environ.setdefault("JOB_CACHE_DB", os.path.join(tempfile.mkdtemp(prefix="bench-"), "jobs.db"))
+    stubbed = stub_livekit()
+    results: Dict[str, Any] = {}
+    for name, setup in CASES.items():
+        if selected and selected not in name:
+            continue
+        try:
+            op = setup()
+        except ImportError as e:
+            results[name] = {"skipped": f"missing dependency: {e.name or e}"}
+            print(f"{name:<42} skipped ({results[name]['skipped']})")
+            continue
+        result = results[name] = measure(op, iterations, alloc_iterations, rounds)
+        print(
+            f"{name:<42} p50 {result['p50_us']:9.1f} us  p99 {result['p99_us']:9.1f} us  "
+            f"peak {result['peak_kib']:8.1f} KiB  retained {result['retained_b_per_op']:8.1f} B/op"
+        )
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpus)",
+            "iterations": iterations,
+            "rounds": rounds,
+            "livekit_stubbed": stubbed,
+        },
+        "cases": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], args: argparse.Namespace) -> List[str]:
+    """Human-readable regressions of ``current`` against ``baseline``"""
+    checks = (
+        ("p50_us", args.p50, MIN_DELTA_US, "us"),
+        ("p99_us", args.p99, MIN_DELTA_US, "us"),
+        ("peak_kib", args.alloc, MIN_DELTA_KIB, "KiB"),
+    )
+    regressions = []
+    for name, before in baseline["cases"].items():
+        if "skipped" in before or (args.filter and args.filter not in name):
+            continue
+        after = current["cases"].get(name)
+        if after is None or "skipped" in after:
+            reason = after["skipped"] if after else "not run"
+            regressions.append(f"{name}: measured in the baseline, now {reason}")
+            continue
+        for metric, threshold, floor, unit in checks:
+            old, new = before[metric], after[metric]
+            if new > old * (1 + threshold) and new - old > floor:
+                regressions.append(f"{name} {metric}: {old} -> {new} {unit} (+{(new / old - 1) if old else float('inf'):.0%}, limit +{threshold:.0%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    for command in ("run", "compare"):
+        sub = commands.add_parser(command)
+        if command == "run":
+            sub.add_argument("--out", help="write results here as JSON")
+        else:
+            sub.add_argument("baseline")
+            sub.add_argument("current", nargs="?", help="results to compare (default: run the suite now)")
+            sub.add_argument("--p50", type=float, default=P50_THRESHOLD, help="allowed relative p50 growth")
+            sub.add_argument("--p99", type=float, default=P99_THRESHOLD, help="allowed relative p99 growth")
+            sub.add_argument("--alloc", type=float, default=ALLOC_THRESHOLD, help="allowed relative peak allocation growth")
+        sub.add_argument("--filter", help="only cases whose name contains this")
+        sub.add_argument("--iterations", type=int, default=ITERATIONS)
+        sub.add_argument("--alloc-iterations", type=int, default=ALLOC_ITERATIONS)
+        sub.add_argument("--rounds", type=int, default=ROUNDS)
+    args = parser.parse_args()
+
+    if args.command == "compare" and args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = run_suite(args.filter, args.iterations, args.alloc_iterations, args.rounds)
+
+    if args.command == "run":
+        if args.out:
+            os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+            with open(args.out, "w") as f:
+                json.dump(current, f, indent=2)
+            print(f"Wrote {args.out}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, current, args)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regressions against {args.baseline} (commit {baseline['meta'].get('commit')})")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,118 +1,136 @@
 import asyncio
 import json
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
 from dotenv import load_dotenv
 
 from livekit import rtc
-from livekit.agents import Agent, AgentSession, JobContext, JobRequest, RoomIO, WorkerOptions, cli
+from livekit.agents import Agent, AgentSession, JobContext, JobRequest, RoomIO
+from livekit.agents.voice import SpeechHandle
 from livekit.agents.llm import ChatContext, ChatMessage, StopResponse
-from livekit.plugins import cartesia, deepgram, openai
+
+from agent_core.candidate_context import candidate_context, precompute
+from agent_core.commands import CommandQueue
+from agent_core.deadlines import model_name
+from agent_core.endpointing import VAD_OPTIONS, bind_endpointer
+from agent_core.export import bind_export, start_export
+from agent_core.interview_config import (
+    InterviewConfig,
+    JobConfig,
+    get_job_cache,
+    job_prompt,
+    load_interview_config,
+)
+from agent_core.profiling import bind_profiling, install_signal_handlers
+from agent_core.prompts import Prompt, track_session_llm
+from agent_core.question_bank import load_question_bank
+from agent_core.recording import bind_recorder
+from agent_core.runtime import AgentRuntime, SessionRuntime
 
 logger = logging.getLogger("interview-agent")
 logger.setLevel(logging.INFO)
 
 load_dotenv()
 
+# Plugins are imported lazily (see agent_core.providers); these are the ones this agent uses
+PLUGINS = ("deepgram", "openai", "cartesia", "silero")
+
+RUNTIME = AgentRuntime("interview-agent", plugins=PLUGINS)
+RUNTIME.on_prewarm(install_signal_handlers)
+RUNTIME.on_prewarm(start_export)
+
+# Said instead of the LLM's closing message if it misses its deadline
+CLOSING_REMARK = {
+    "id": "closing",
+    "question": "Thank you for your time today. That completes our interview, and we'll be in touch soon with next steps.",
+}
+RUNTIME.on_prewarm(load_question_bank)
+
+@RUNTIME.on_prewarm
+def open_job_cache() -> None:
+    """Open the job artifact cache shared by this worker's job processes"""
+    get_job_cache().sweep()
+
+# Instructions shared by every session; job and candidate details follow them
+STABLE_INSTRUCTIONS = """You are an AI interviewer conducting a professional, structured job interview.
+
+INTERVIEW GUIDELINES:
+1. Be professional, friendly, and engaging
+2. Ask one question at a time and wait for the candidate's response
+3. Ask follow-up questions based on their answers
+4. Keep responses concise and focused
+5. Evaluate both technical skills and cultural fit
+6. The interview should last 5-10 minutes total
+
+Remember: You are the interviewer, not the candidate. Ask questions and listen to responses."""
+
+# Bump when job_section changes; cached sections are keyed by it
+JOB_SECTION_VERSION = "1"
+
+def job_section(job: JobConfig) -> str:
+    """The part of the instructions shared by every interview for a job"""
+    job_title = job.title or 'this position'
+    company_name = job.company or 'our company'
+    
+    return f"""CURRENT FOCUS:
+You're interviewing for the {job_title} position at {company_name}. Assess the candidate's suitability for the {job_title} role. Ask meaningful questions that help evaluate their skills, experience, and fit for the position."""
+
 class InterviewAgent(Agent):
-    def __init__(self, job_data: Dict, resume_data: Dict) -> None:
-        self.job_data = job_data
-        self.resume_data = resume_data
+    def __init__(self, config: InterviewConfig, runtime: SessionRuntime, context: Dict, job: str) -> None:
+        """Use ``create``, which reads ``context`` and ``job`` from the job cache"""
+        self.config = config
+        self.candidate_context = context
+        self.job_instructions = job
         self.questions = self._generate_interview_questions()
         self.current_question_index = 0
-        self.interview_transcript = []
+        self.runtime = runtime
+        self.interview_transcript = runtime.transcript
+        # Plan question the next reply is asking, if any
+        self.asking: Optional[Dict] = None
+        # Reply being generated or spoken; a newer one supersedes it
+        self.speech: Optional[SpeechHandle] = None
         self.interview_started = False
         self.interview_completed = False
+        # The room's command queue; state changes go through it once it is set
+        self.commands: Optional[CommandQueue] = None
         
         # Create personalized instructions based on job and resume
         instructions = self._create_personalized_instructions()
         
         super().__init__(
             instructions=instructions,
-            stt=deepgram.STT(),
-            llm=openai.LLM(model="gpt-4o-mini"),
-            tts=cartesia.TTS(),
+            stt=RUNTIME.provider("stt", "deepgram"),
+            llm=RUNTIME.provider("llm", "openai", model="gpt-4o-mini"),
+            tts=RUNTIME.provider("tts", "cartesia"),
         )
 
-    def _create_personalized_instructions(self) -> str:
-        job_title = self.job_data.get('title', 'this position')
-        company_name = self.job_data.get('company', {}).get('name', 'our company')
-        candidate_name = self.resume_data.get('name', 'the candidate')
-        skills = ', '.join(self.resume_data.get('skills', [])[:5])
-        
-        return f"""You are an AI interviewer conducting a professional job interview for the {job_title} position at {company_name}.
-
-CANDIDATE CONTEXT:
-- Name: {candidate_name}
-- Key Skills: {skills}
-- Experience: {self.resume_data.get('experience', 'Not specified')}
+    @classmethod
+    async def create(cls, config: InterviewConfig, runtime: SessionRuntime) -> "InterviewAgent":
+        """The agent for a room, with its cached artifacts read off the event loop
 
-INTERVIEW GUIDELINES:
-1. Be professional, friendly, and engaging
-2. Ask one question at a time and wait for the candidate's response
-3. Ask follow-up questions based on their answers
-4. Keep responses concise and focused
-5. Evaluate both technical skills and cultural fit
-6. The interview should last 5-10 minutes total
-
-CURRENT FOCUS:
-You're conducting a structured interview to assess the candidate's suitability for the {job_title} role. Ask meaningful questions that help evaluate their skills, experience, and fit for the position.
+        The candidate context and job section come from the job cache's SQLite
+        file: a cache hit once the candidate_context CLI (or the warm-up
+        handle_request starts) has built them, built here on a miss.
+        """
+        context, job = await asyncio.to_thread(
+            lambda: (candidate_context(config), job_prompt(config, "interview-agent", job_section, JOB_SECTION_VERSION))
+        )
+        return cls(config, runtime, context, job)
 
-Remember: You are the interviewer, not the candidate. Ask questions and listen to responses."""
+    def _create_personalized_instructions(self) -> str:
+        prompt = Prompt(
+            stable=STABLE_INSTRUCTIONS,
+            job=self.job_instructions,
+            candidate=self.candidate_context["prompt"],
+        )
+        logger.info(f"Prompt prefix {prompt.prefix_digest()} ({len(prompt.prefix)} chars)")
+        return prompt.instructions
 
     def _generate_interview_questions(self) -> List[Dict]:
         """Generate personalized interview questions based on job and resume data"""
-        job_title = self.job_data.get('title', 'this position')
-        company_name = self.job_data.get('company', {}).get('name', 'our company')
-        required_skills = self.job_data.get('skillsRequired', [])
-        candidate_skills = self.resume_data.get('skills', [])
-        
-        # Find overlapping skills for targeted questions
-        overlapping_skills = list(set(required_skills) & set(candidate_skills))
-        primary_skill = overlapping_skills[0] if overlapping_skills else (candidate_skills[0] if candidate_skills else 'your technical skills')
-        
-        questions = [
-            {
-                "id": "intro",
-                "question": f"Hello! Welcome to your interview for the {job_title} position at {company_name}. To start, could you please introduce yourself and tell me why you're interested in this role?",
-                "category": "introduction",
-                "expected_duration": 60
-            },
-            {
-                "id": "technical",
-                "question": f"I see you have experience with {primary_skill}. Can you walk me through a specific project where you used {primary_skill} and describe the challenges you faced?",
-                "category": "technical",
-                "expected_duration": 90
-            },
-            {
-                "id": "experience",
-                "question": f"How do you think your background and experience align with what we're looking for in this {job_title} role?",
-                "category": "experience", 
-                "expected_duration": 75
-            },
-            {
-                "id": "problem_solving",
-                "question": "Describe a time when you had to solve a difficult technical problem. What was your approach and what did you learn from it?",
-                "category": "problem_solving",
-                "expected_duration": 90
-            },
-            {
-                "id": "teamwork",
-                "question": f"At {company_name}, collaboration is important. Can you tell me about a time when you worked effectively with a team to achieve a goal?",
-                "category": "behavioral",
-                "expected_duration": 75
-            },
-            {
-                "id": "goals",
-                "question": "Where do you see your career heading in the next few years, and how does this position fit into those goals?",
-                "category": "career_goals",
-                "expected_duration": 60
-            }
-        ]
-        
-        return questions
+        # The cached plan is shared; questions are annotated per session
+        return [dict(question) for question in self.candidate_context["question_plan"]]
 
     async def on_user_turn_completed(self, turn_ctx: ChatContext, new_message: ChatMessage) -> None:
         """Called when user completes a turn"""
@@ -121,27 +139,60 @@ Remember: You are the interviewer, not the candidate. Ask questions and listen t
             raise StopResponse()
         
         # Record the user's response
-        self.interview_transcript.append({
-            "timestamp": datetime.now().isoformat(),
-            "speaker": "candidate",
-            "content": new_message.text_content,
-            "question_id": self.questions[self.current_question_index]["id"] if self.current_question_index < len(self.questions) else None
-        })
+        self.record_turn("candidate", new_message.text_content)
         
         logger.info(f"Candidate response recorded: {new_message.text_content[:100]}...")
 
-    async def on_agent_turn_completed(self, turn_ctx: ChatContext, new_message: ChatMessage) -> None:
-        """Called when agent completes a turn"""
-        if new_message.text_content:
-            # Record the interviewer's question/response
-            self.interview_transcript.append({
-                "timestamp": datetime.now().isoformat(),
-                "speaker": "interviewer",
-                "content": new_message.text_content,
-                "question_id": self.questions[self.current_question_index]["id"] if self.current_question_index < len(self.questions) else None
-            })
-            
-            logger.info(f"Interviewer message recorded: {new_message.text_content[:100]}...")
+    async def llm_node(self, chat_ctx: ChatContext, tools, model_settings):
+        """Stream the reply, falling back to a planned question if the LLM is slow"""
+        fallback = self.fallback_question()
+        index = self.current_question_index
+        fell_back = False
+        async for chunk in self.runtime.deadlines.stream(
+            Agent.default.llm_node(self, chat_ctx, tools, model_settings),
+            model_name(self.llm),
+            fallback["question"] if fallback else None,
+        ):
+            # The LLM streams ChatChunks; only the fallback arrives as plain text
+            fell_back = fell_back or isinstance(chunk, str)
+            yield chunk
+        if fell_back and fallback is not None and fallback is not self.asking and not self.interview_completed:
+            self.advance_from(index)
+        self.asking = None
+
+    def fallback_question(self) -> Optional[Dict]:
+        """The question being asked, else the next one in the plan"""
+        if self.interview_completed:
+            return CLOSING_REMARK
+        if self.asking is not None:
+            return self.asking
+        next_index = self.current_question_index + 1
+        if self.interview_started and next_index < len(self.questions):
+            return self.questions[next_index]
+        return None
+
+    def ask(self, session: AgentSession, question: Dict) -> None:
+        """Have the agent ask a plan question"""
+        self.reply(session, f"Ask this exact question: {question['question']}")
+        self.asking = question
+
+    def reply(self, session: AgentSession, instructions: str) -> None:
+        """Generate a reply, cancelling the previous one if it is still going"""
+        previous = self.speech
+        if previous is not None and not previous.done() and previous.allow_interruptions:
+            previous.interrupt()
+            self.runtime.metrics.incr("replies.superseded")
+        self.asking = None
+        self.speech = session.generate_reply(instructions=instructions)
+
+    def record_turn(self, speaker: str, content: str) -> None:
+        """Record a turn against the current question"""
+        current_question = self.get_current_question()
+        self.interview_transcript.add(
+            speaker,
+            content,
+            question_id=current_question["id"] if current_question else None,
+        )
 
     def get_current_question(self) -> Optional[Dict]:
         """Get the current question"""
@@ -153,6 +204,18 @@ Remember: You are the interviewer, not the candidate. Ask questions and listen t
         """Move to the next question"""
         self.current_question_index += 1
 
+    def advance_from(self, index: int) -> None:
+        """Move past question ``index`` after falling back to the next one, unless a command already moved on"""
+        def advance() -> None:
+            if self.current_question_index == index and not self.interview_completed:
+                self.advance_to_next_question()
+
+        if self.commands is None:
+            advance()
+        else:
+            # Queued like the RPCs, so it can't interleave with one and the progress snapshot follows it
+            self.commands.submit("fallback_advance", advance)
+
     def get_interview_progress(self) -> Dict:
         """Get current interview progress"""
         return {
@@ -164,115 +227,140 @@ Remember: You are the interviewer, not the candidate. Ask questions and listen t
 
     def get_transcript(self) -> List[Dict]:
         """Get the full interview transcript"""
-        return self.interview_transcript
+        return self.interview_transcript.turns()
+
+    def snapshot(self) -> Dict:
+        """Interview state as of the last command, for read-only RPCs"""
+        return {
+            "progress": self.get_interview_progress(),
+            "current_question": self.get_current_question(),
+            "started": self.interview_started,
+            "completed": self.interview_completed,
+        }
 
 
 async def entrypoint(ctx: JobContext):
     """Main entrypoint for the interview agent"""
     await ctx.connect()
+    runtime = RUNTIME.session(ctx)
+    bind_recorder(runtime, ctx.room)
+    bind_profiling(runtime, ctx.room.local_participant)
     
     logger.info(f"Interview agent starting for room: {ctx.room.name}")
     
     # Get job and resume data from room metadata
-    room_metadata = json.loads(ctx.room.metadata or '{}')
-    job_data = room_metadata.get('job_data', {})
-    resume_data = room_metadata.get('resume_data', {})
+    config = load_interview_config(ctx.room.metadata)
+    bind_export(runtime, config)
     
-    logger.info(f"Job data: {job_data.get('title', 'Unknown')}")
-    logger.info(f"Candidate: {resume_data.get('name', 'Unknown')}")
+    logger.info(f"Job data: {config.job.title or 'Unknown'}")
+    logger.info(f"Candidate: {config.candidate.name or 'Unknown'}")
     
-    # Create agent session with manual turn detection for controlled interview flow
-    session = AgentSession(turn_detection="manual")
+    # Create agent session with manual turn detection for controlled interview flow;
+    # the adaptive endpointer decides when the candidate has finished answering
+    session = AgentSession(turn_detection="manual", vad=RUNTIME.provider("vad", "silero", **VAD_OPTIONS))
     room_io = RoomIO(session, room=ctx.room)
     await room_io.start()
     
     # Create the interview agent
-    agent = InterviewAgent(job_data=job_data, resume_data=resume_data)
+    agent = await InterviewAgent.create(config, runtime)
     await session.start(agent=agent)
+    bind_endpointer(runtime, session)
+    track_session_llm(runtime, session)
+    
+    @runtime.on(session, "conversation_item_added")
+    def on_conversation_item_added(event):
+        """Record the interviewer's questions/responses"""
+        if event.item.role == "assistant" and event.item.text_content:
+            agent.record_turn("interviewer", event.item.text_content)
+            logger.info(f"Interviewer message recorded: {event.item.text_content[:100]}...")
     
     # Start with audio input disabled - will be enabled when interview begins
     session.input.set_audio_enabled(False)
     
-    @ctx.room.local_participant.register_rpc_method("start_interview")
+    # State-changing RPCs run one at a time; repeats within a second share a result
+    commands = CommandQueue(runtime, agent.snapshot)
+    agent.commands = commands
+    
+    @runtime.rpc(ctx.room.local_participant, "start_interview")
     async def start_interview(data: rtc.RpcInvocationData):
         """Start the interview process"""
-        logger.info("Starting interview...")
-        
-        # Set the specific participant we're interviewing
-        room_io.set_participant(data.caller_identity)
-        
-        # Enable audio input
-        session.input.set_audio_enabled(True)
-        agent.interview_started = True
-        
-        # Ask the first question
-        current_question = agent.get_current_question()
-        if current_question:
-            # Send the question as an agent message
-            await session.llm.agenerate(
-                ChatContext([
-                    ChatMessage(role="system", content=f"Ask this exact question: {current_question['question']}")
-                ])
-            )
+        def start() -> Dict:
+            if agent.interview_started:
+                return {"status": "started", "question": agent.get_current_question()}
+            logger.info("Starting interview...")
+            
+            # Set the specific participant we're interviewing
+            room_io.set_participant(data.caller_identity)
+            
+            # Enable audio input
+            session.input.set_audio_enabled(True)
+            agent.interview_started = True
+            
+            # Ask the first question
+            current_question = agent.get_current_question()
+            if current_question:
+                agent.ask(session, current_question)
+            
+            return {"status": "started", "question": current_question}
         
-        return json.dumps({"status": "started", "question": current_question})
+        return json.dumps(await commands.call("start_interview", start, key="start_interview"))
 
-    @ctx.room.local_participant.register_rpc_method("next_question")
+    @runtime.rpc(ctx.room.local_participant, "next_question")
     async def next_question(data: rtc.RpcInvocationData):
         """Move to the next interview question"""
-        logger.info("Moving to next question...")
-        
-        agent.advance_to_next_question()
-        current_question = agent.get_current_question()
-        
-        if current_question:
-            # Ask the next question
-            await session.llm.agenerate(
-                ChatContext([
-                    ChatMessage(role="system", content=f"Ask this exact question: {current_question['question']}")
-                ])
-            )
-            return json.dumps({"status": "next_question", "question": current_question})
-        else:
+        def advance() -> Dict:
+            if agent.interview_completed:
+                return {"status": "completed", "transcript": agent.get_transcript()}
+            logger.info("Moving to next question...")
+            
+            agent.advance_to_next_question()
+            current_question = agent.get_current_question()
+            
+            if current_question:
+                agent.ask(session, current_question)
+                return {"status": "next_question", "question": current_question}
+            
             # Interview completed
             agent.interview_completed = True
             session.input.set_audio_enabled(False)
             
             # Send completion message
-            await session.llm.agenerate(
-                ChatContext([
-                    ChatMessage(role="system", content="Thank the candidate for their time and let them know the interview is complete. Keep it brief and professional.")
-                ])
+            agent.reply(
+                session,
+                "Thank the candidate for their time and let them know the interview is complete. Keep it brief and professional.",
             )
             
-            return json.dumps({"status": "completed", "transcript": agent.get_transcript()})
+            return {"status": "completed", "transcript": agent.get_transcript()}
+        
+        return json.dumps(await commands.call("next_question", advance, key="next_question"))
 
-    @ctx.room.local_participant.register_rpc_method("end_interview")
+    @runtime.rpc(ctx.room.local_participant, "end_interview")
     async def end_interview(data: rtc.RpcInvocationData):
         """End the interview and get transcript"""
-        logger.info("Ending interview...")
-        
-        session.input.set_audio_enabled(False)
-        agent.interview_completed = True
-        
-        # Save transcript to database or return it
-        transcript = agent.get_transcript()
+        def end() -> Dict:
+            logger.info("Ending interview...")
+            
+            session.input.set_audio_enabled(False)
+            agent.interview_completed = True
+            
+            # Save transcript to database or return it
+            return {
+                "status": "ended",
+                "transcript": agent.get_transcript(),
+                "progress": agent.get_interview_progress()
+            }
         
-        return json.dumps({
-            "status": "ended",
-            "transcript": transcript,
-            "progress": agent.get_interview_progress()
-        })
+        return json.dumps(await commands.call("end_interview", end, key="end_interview"))
 
-    @ctx.room.local_participant.register_rpc_method("get_progress")
+    @runtime.rpc(ctx.room.local_participant, "get_progress")
     async def get_progress(data: rtc.RpcInvocationData):
-        """Get current interview progress"""
-        progress = agent.get_interview_progress()
-        return json.dumps(progress)
+        """Get current interview progress, as of the last command"""
+        return json.dumps(commands.snapshot["progress"])
 
-    @ctx.room.local_participant.register_rpc_method("get_transcript")
+    @runtime.rpc(ctx.room.local_participant, "get_transcript")
     async def get_transcript(data: rtc.RpcInvocationData):
         """Get current transcript"""
+        # Turns are only ever appended, so a copy is always a consistent prefix
         transcript = agent.get_transcript()
         return json.dumps({"transcript": transcript})
 
@@ -283,10 +371,22 @@ async def entrypoint(ctx: JobContext):
     logger.info("Interview completed, shutting down agent...")
 
 
+# Candidate contexts being built after a request was accepted (kept so they aren't collected)
+_warming: Set[asyncio.Task] = set()
+
+
+async def warm_candidate_context(room: str, metadata: str) -> None:
+    try:
+        await asyncio.to_thread(precompute, metadata)
+    except Exception as e:
+        logger.warning(f"Could not precompute candidate context for {room}: {e}")
+
+
 async def handle_request(request: JobRequest) -> None:
     """Handle incoming job requests"""
     logger.info(f"Handling interview request for room: {request.room.name}")
     
+    # Join first: building the context here would delay the agent joining the candidate
     await request.accept(
         identity="interview-agent",
         attributes={
@@ -294,10 +394,13 @@ async def handle_request(request: JobRequest) -> None:
             "capabilities": "voice,transcript,questions"
         }
     )
+    
+    # Then warm the cache the job process reads; it builds the context itself
+    # (off its event loop) if it gets there first
+    task = asyncio.ensure_future(warm_candidate_context(request.room.name, request.room.metadata))
+    _warming.add(task)
+    task.add_done_callback(_warming.discard)
 
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(
-        entrypoint_fnc=entrypoint,
-        request_fnc=handle_request
-    ))
+    RUNTIME.run(entrypoint, request_fnc=handle_request)
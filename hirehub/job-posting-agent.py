@@ -1,35 +1,97 @@
 from dotenv import load_dotenv
 import json
 import asyncio
-import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from livekit import agents
 from livekit.agents import AgentSession, Agent, RoomInputOptions
-from livekit.plugins import (
-    openai,
-    noise_cancellation,
-)
+
+from agent_core import providers
+from agent_core.degradation import CONTROLLER
+from agent_core.draft_store import DraftStore, get_draft_store
+from agent_core.intents import load_intent_classifier
+from agent_core.job_draft import ESSENTIAL_ITEMS, FIELD_LABELS, JobDraft
+from agent_core.profiling import install_signal_handlers
+from agent_core.runtime import AgentRuntime
+from agent_core.skills import extract_skills, normalize_skill
 
 load_dotenv()
 
+# Plugins are imported lazily (see agent_core.providers); these are the ones this agent uses
+PLUGINS = ("openai", "noise_cancellation")
+
+RUNTIME = AgentRuntime("job-posting-agent", plugins=PLUGINS)
+RUNTIME.on_prewarm(install_signal_handlers)
+
+
+@RUNTIME.on_prewarm
+def open_draft_store() -> None:
+    """Open the draft store once per worker process, dropping expired drafts"""
+    get_draft_store().sweep()
+
+
+def render_job_summary(job_data: JobDraft) -> str:
+    """Format the complete job posting for review"""
+    skills_req = ", ".join(job_data["skillsRequired"]) if job_data["skillsRequired"] else "Not specified"
+    skills_pref = ", ".join(job_data["skillsPreferred"]) if job_data["skillsPreferred"] else "Not specified"
+    
+    salary_range = ""
+    if job_data["salaryMin"] and job_data["salaryMax"]:
+        salary_range = f"${job_data['salaryMin']:,} - ${job_data['salaryMax']:,} per year"
+    elif job_data["salaryMin"]:
+        salary_range = f"Starting at ${job_data['salaryMin']:,} per year"
+    else:
+        salary_range = "Not specified"
+        
+    remote_text = "Yes" if job_data["remoteAllowed"] else "No"
+    
+    return f"""Here's your complete job posting:
+
+**Position:** {job_data['title']}
+**Employment Type:** {job_data['jobType'].replace('_', '-') if job_data['jobType'] else 'Not specified'}
+**Experience Level:** {job_data['experienceLevel'] or 'Not specified'}
+**Location:** {job_data['location'] or 'Not specified'}
+**Remote Work Allowed:** {remote_text}
+**Salary Range:** {salary_range}
+
+**Job Description:**
+{job_data['description'] or 'Not provided'}
+
+**Requirements:**
+{job_data['requirements'] or 'Not provided'}
+
+**Required Skills:** {skills_req}
+**Preferred Skills:** {skills_pref}
+
+Does this look correct? Would you like to make any changes, or shall I submit this job posting?"""
+
+
+def render_progress_instructions(job_data: JobDraft) -> str:
+    """Progress context handed to the realtime model between scripted replies"""
+    return f"""Continue the conversation naturally. 
+            
+Current job posting progress: {job_data.completion_percentage}% complete.
+
+Current job data collected:
+- Title: {job_data['title'] or 'Not provided'}
+- Description: {'✓' if job_data['description'] else '✗'}
+- Requirements: {'✓' if job_data['requirements'] else '✗'}
+- Job Type: {job_data['jobType'] or 'Not provided'}
+- Experience Level: {job_data['experienceLevel'] or 'Not provided'}
+- Location: {job_data['location'] or 'Not provided'}
+- Skills: {len(job_data['skillsRequired'])} required, {len(job_data['skillsPreferred'])} preferred
+
+Guide the conversation naturally to gather missing information. Be encouraging and ask follow-up questions."""
+
 
 class JobPostingAssistant(Agent):
-    def __init__(self) -> None:
-        self.job_data = {
-            "title": "",
-            "description": "",
-            "requirements": "",
-            "jobType": "",
-            "experienceLevel": "",
-            "salaryMin": None,
-            "salaryMax": None,
-            "location": "",
-            "remoteAllowed": False,
-            "skillsRequired": [],
-            "skillsPreferred": []
-        }
+    def __init__(self, draft_store: Optional[DraftStore] = None) -> None:
+        self.job_data = JobDraft()
+        self.draft_store = draft_store
+        self.recruiter_identity: Optional[str] = None
         
+        # Draft version the recruiter last heard summarized; submission needs a match
+        self.summary_version: Optional[int] = None
         self.current_step = "greeting"
         self.conversation_state = "active"
         
@@ -67,57 +129,29 @@ Start by greeting them warmly and asking what position they'd like to create a j
 
         super().__init__(instructions=instructions)
 
+    async def resume_draft(self, identity: str) -> None:
+        """Attach the recruiter's saved draft, so a reconnect picks up where they left off"""
+        self.recruiter_identity = identity
+        if self.draft_store:
+            self.job_data = await self.draft_store.get_async(identity)
+            self.summary_version = None
+
+    async def save_draft(self) -> None:
+        """Persist the draft if it changed since the last save"""
+        if self.draft_store and self.recruiter_identity:
+            await self.draft_store.save_async(self.recruiter_identity, self.job_data)
+
     def get_completion_percentage(self) -> int:
         """Calculate how complete the job posting is"""
-        total_fields = 9  # Core required fields
-        completed_fields = 0
-        
-        if self.job_data["title"]: completed_fields += 1
-        if self.job_data["description"]: completed_fields += 1
-        if self.job_data["requirements"]: completed_fields += 1
-        if self.job_data["jobType"]: completed_fields += 1
-        if self.job_data["experienceLevel"]: completed_fields += 1
-        if self.job_data["location"]: completed_fields += 1
-        if self.job_data["skillsRequired"]: completed_fields += 1
-        if self.job_data["skillsPreferred"]: completed_fields += 1
-        if self.job_data["salaryMin"] or self.job_data["salaryMax"]: completed_fields += 1
-        
-        return int((completed_fields / total_fields) * 100)
+        return self.job_data.completion_percentage
 
     def format_job_summary(self) -> str:
         """Format the complete job posting for review"""
-        skills_req = ", ".join(self.job_data["skillsRequired"]) if self.job_data["skillsRequired"] else "Not specified"
-        skills_pref = ", ".join(self.job_data["skillsPreferred"]) if self.job_data["skillsPreferred"] else "Not specified"
-        
-        salary_range = ""
-        if self.job_data["salaryMin"] and self.job_data["salaryMax"]:
-            salary_range = f"${self.job_data['salaryMin']:,} - ${self.job_data['salaryMax']:,} per year"
-        elif self.job_data["salaryMin"]:
-            salary_range = f"Starting at ${self.job_data['salaryMin']:,} per year"
-        else:
-            salary_range = "Not specified"
-            
-        remote_text = "Yes" if self.job_data["remoteAllowed"] else "No"
-        
-        return f"""Here's your complete job posting:
+        return self.job_data.render("summary", render_job_summary)
 
-**Position:** {self.job_data['title']}
-**Employment Type:** {self.job_data['jobType'].replace('_', '-') if self.job_data['jobType'] else 'Not specified'}
-**Experience Level:** {self.job_data['experienceLevel'] or 'Not specified'}
-**Location:** {self.job_data['location'] or 'Not specified'}
-**Remote Work Allowed:** {remote_text}
-**Salary Range:** {salary_range}
-
-**Job Description:**
-{self.job_data['description'] or 'Not provided'}
-
-**Requirements:**
-{self.job_data['requirements'] or 'Not provided'}
-
-**Required Skills:** {skills_req}
-**Preferred Skills:** {skills_pref}
-
-Does this look correct? Would you like to make any changes, or shall I submit this job posting?"""
+    def format_progress_instructions(self) -> str:
+        """Instructions for the realtime model when there is no scripted reply"""
+        return self.job_data.render("progress", render_progress_instructions)
 
     async def extract_job_info(self, text: str) -> Dict[str, Any]:
         """Extract job information from the conversation using pattern matching and keywords"""
@@ -174,6 +208,15 @@ Does this look correct? Would you like to make any changes, or shall I submit th
         if any(keyword in text_lower for keyword in remote_keywords):
             extracted["remoteAllowed"] = True
         
+        # Skill extraction - mentions are folded to canonical names ("ReactJS" -> "React")
+        skills = extract_skills(text)
+        if skills:
+            preferred_cues = ["nice to have", "nice-to-have", "preferred", "bonus", "a plus", "would be great"]
+            if any(cue in text_lower for cue in preferred_cues):
+                extracted["skillsPreferred"] = skills
+            else:
+                extracted["skillsRequired"] = skills
+        
         # Salary extraction (basic pattern matching)
         import re
         salary_patterns = [
@@ -198,32 +241,42 @@ Does this look correct? Would you like to make any changes, or shall I submit th
         
         return extracted
 
-    async def update_job_data(self, extracted_info: Dict[str, Any]) -> None:
-        """Update job data with extracted information"""
+    async def update_job_data(self, extracted_info: Dict[str, Any]) -> List[str]:
+        """Update job data with extracted information, returning the fields that changed"""
+        changes = {}
         for key, value in extracted_info.items():
-            if value and key in self.job_data:
-                self.job_data[key] = value
+            if not value or key not in self.job_data:
+                continue
+            if isinstance(self.job_data[key], list):
+                # Skill lists accumulate across turns, deduplicated by canonical name
+                changes[key] = self.job_data.merged_list(key, value, key=normalize_skill)
+            else:
+                changes[key] = value
+        
+        # One utterance is one undoable edit ("undo that" reverts min and max salary together)
+        return self.job_data.update(changes)
 
     async def submit_job_posting(self) -> Dict[str, Any]:
         """Submit the job posting to the API"""
+        import httpx
+        
         try:
             # Update the API URL to match your Next.js app
             api_url = "http://localhost:3000/api/jobs"  # Adjust port if needed
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    api_url,
-                    json=self.job_data,
-                    headers={"Content-Type": "application/json"},
-                    timeout=30.0
-                )
-                
-                if response.status_code == 201:
-                    job_data = response.json()
-                    return {"success": True, "job": job_data}
-                else:
-                    error_text = response.text
-                    return {"success": False, "error": f"API error {response.status_code}: {error_text}"}
+            response = await RUNTIME.http_client().post(
+                api_url,
+                json=self.job_data.to_dict(),
+                headers={"Content-Type": "application/json"},
+                timeout=30.0
+            )
+            
+            if response.status_code == 201:
+                job_data = response.json()
+                return {"success": True, "job": job_data}
+            else:
+                error_text = response.text
+                return {"success": False, "error": f"API error {response.status_code}: {error_text}"}
                     
         except httpx.TimeoutException:
             return {"success": False, "error": "Request timed out. Please try again."}
@@ -236,39 +289,48 @@ Does this look correct? Would you like to make any changes, or shall I submit th
         """Process the user's input and determine the next response"""
         # Extract any job information from the conversation
         extracted_info = await self.extract_job_info(text)
-        await self.update_job_data(extracted_info)
+        changed = await self.update_job_data(extracted_info)
         
-        # Check if they're asking for a review or want to submit
-        text_lower = text.lower()
+        # Rank intents in one pass; "submit" alone no longer shadows confirmation
+        intent = load_intent_classifier().classify(text).intent
         
-        if any(phrase in text_lower for phrase in ["review", "summary", "read it back", "what do we have", "looks good", "submit", "post it", "create it"]):
+        if intent in ("review", "confirm_submit"):
             completion = self.get_completion_percentage()
             
-            if completion >= 70:  # Most fields completed
-                return self.format_job_summary()
-            else:
-                missing_fields = []
-                if not self.job_data["title"]: missing_fields.append("job title")
-                if not self.job_data["description"]: missing_fields.append("job description")
-                if not self.job_data["requirements"]: missing_fields.append("requirements")
-                if not self.job_data["jobType"]: missing_fields.append("job type")
+            if completion < 70:  # Most fields not yet completed
+                if intent == "confirm_submit":
+                    return "I'd like to make sure we have all the essential information before submitting. Let's fill in a few more details first."
+                missing_fields = self.job_data.missing_fields(ESSENTIAL_ITEMS)
                 
                 return f"We're about {completion}% complete. We still need to gather: {', '.join(missing_fields)}. Let's continue with those details."
-        
-        # Check for explicit confirmation to submit
-        if any(phrase in text_lower for phrase in ["yes, submit", "yes submit", "looks perfect", "submit it", "post the job", "create the job", "yes, that's correct"]):
-            if self.get_completion_percentage() >= 70:
-                result = await self.submit_job_posting()
-                
-                if result["success"]:
-                    return "Excellent! Your job posting has been successfully created and is now live. Candidates can start applying right away. You can view and manage your posting in the recruiter dashboard. Is there anything else I can help you with?"
-                else:
-                    return f"I encountered an issue submitting your job posting: {result['error']}. Would you like me to try again, or would you prefer to make any changes first?"
+            
+            # Only submit once the recruiter has heard the summary of this exact draft
+            if intent == "review" or self.summary_version != self.job_data.version:
+                self.summary_version = self.job_data.version
+                return self.format_job_summary()
+            
+            result = await self.submit_job_posting()
+            
+            if result["success"]:
+                if self.draft_store and self.recruiter_identity:
+                    await self.draft_store.discard_async(self.recruiter_identity)
+                self.job_data = JobDraft()
+                self.summary_version = None
+                return "Excellent! Your job posting has been successfully created and is now live. Candidates can start applying right away. You can view and manage your posting in the recruiter dashboard. Is there anything else I can help you with?"
             else:
-                return "I'd like to make sure we have all the essential information before submitting. Let's fill in a few more details first."
+                return f"I encountered an issue submitting your job posting: {result['error']}. Would you like me to try again, or would you prefer to make any changes first?"
+        
+        # Undo the most recent edit
+        if intent == "undo":
+            reverted = self.job_data.undo()
+            if reverted:
+                return f"No problem, I've reverted the last change to the {reverted}."
+            return "There's nothing to undo yet."
         
         # If they want to make changes
-        if any(phrase in text_lower for phrase in ["change", "update", "modify", "edit", "different"]):
+        if intent == "edit":
+            if changed:
+                return f"Done, I've updated the {FIELD_LABELS[changed[0]]}. Anything else you'd like to change?"
             return "Of course! What would you like to change? You can say something like 'change the title' or 'update the salary range' and I'll help you modify it."
         
         # Continue the natural conversation flow
@@ -276,10 +338,13 @@ Does this look correct? Would you like to make any changes, or shall I submit th
 
 
 async def entrypoint(ctx: agents.JobContext):
-    assistant = JobPostingAssistant()
+    runtime = RUNTIME.session(ctx)
+    assistant = JobPostingAssistant(draft_store=get_draft_store())
     
     session = AgentSession(
-        llm=openai.realtime.RealtimeModel(
+        llm=RUNTIME.provider(
+            "realtime",
+            "openai",
             voice="alloy",  # Professional, clear voice for business context
             temperature=0.7,  # Balanced creativity and consistency
         )
@@ -289,8 +354,8 @@ async def entrypoint(ctx: agents.JobContext):
         room=ctx.room,
         agent=assistant,
         room_input_options=RoomInputOptions(
-            # Enhanced noise cancellation for professional conversations
-            noise_cancellation=noise_cancellation.BVC(),
+            # Enhanced noise cancellation for professional conversations, unless the worker is shedding load
+            noise_cancellation=None if CONTROLLER.active("no_noise_cancellation") else providers.noise_cancellation("bvc"),
         ),
     )
 
@@ -300,7 +365,7 @@ async def entrypoint(ctx: agents.JobContext):
     initial_greeting_given = False
 
     # Handle participant joining - give initial greeting when user joins
-    @ctx.room.on("participant_connected")
+    @runtime.on(ctx.room, "participant_connected")
     async def on_participant_connected(participant):
         nonlocal initial_greeting_given
         
@@ -308,23 +373,42 @@ async def entrypoint(ctx: agents.JobContext):
         if not participant.identity.startswith("agent-") and not initial_greeting_given:
             print(f"👋 Participant joined: {participant.identity}")
             initial_greeting_given = True
+            await assistant.resume_draft(participant.identity)
             
             # Give a brief delay to ensure audio tracks are set up
             await asyncio.sleep(1)
             
+            if assistant.get_completion_percentage() > 0:
+                # Reconnect with a draft in progress
+                await session.generate_reply(
+                    instructions=f"Welcome the recruiter back and let them know their job posting draft was saved and is {assistant.get_completion_percentage()}% complete. Briefly say what is still missing ({', '.join(assistant.job_data.missing_fields())}) and continue from there."
+                )
+                return
+            
             # Start the conversation with a warm greeting
             await session.generate_reply(
                 instructions="Greet the recruiter warmly and ask what job position they'd like to create a posting for. Be enthusiastic and professional. Start with something like 'Hi there! I'm your AI voice assistant.'"
             )
 
+    @runtime.on(session, "conversation_item_added")
+    def on_conversation_item_added(event):
+        """Record the assistant's side of the conversation"""
+        if event.item.role == "assistant" and event.item.text_content:
+            runtime.transcript.add("assistant", event.item.text_content)
+
     # Set up conversation processing
-    @session.on("user_speech_committed")
-    async def on_user_speech(text: str):
+    @runtime.on(session, "user_input_transcribed")
+    async def on_user_speech(event):
         """Handle user speech and maintain conversation flow"""
+        if not event.is_final:
+            return
+        text = event.transcript
         print(f"👤 Recruiter: {text}")
+        runtime.transcript.add("recruiter", text)
         
         # Process the conversation and extract job information
         response_context = await assistant.process_conversation(text)
+        await assistant.save_draft()
         
         if response_context:
             # If we have a specific response (like job summary), use it
@@ -333,29 +417,16 @@ async def entrypoint(ctx: agents.JobContext):
             )
         else:
             # Let the realtime model continue naturally
-            completion = assistant.get_completion_percentage()
-            
-            context_instructions = f"""Continue the conversation naturally. 
-            
-Current job posting progress: {completion}% complete.
-
-Current job data collected:
-- Title: {assistant.job_data['title'] or 'Not provided'}
-- Description: {'✓' if assistant.job_data['description'] else '✗'}
-- Requirements: {'✓' if assistant.job_data['requirements'] else '✗'}
-- Job Type: {assistant.job_data['jobType'] or 'Not provided'}
-- Experience Level: {assistant.job_data['experienceLevel'] or 'Not provided'}
-- Location: {assistant.job_data['location'] or 'Not provided'}
-- Skills: {len(assistant.job_data['skillsRequired'])} required, {len(assistant.job_data['skillsPreferred'])} preferred
-
-Guide the conversation naturally to gather missing information. Be encouraging and ask follow-up questions."""
+            context_instructions = assistant.format_progress_instructions()
 
             await session.generate_reply(instructions=context_instructions)
 
+    runtime.on_shutdown(assistant.save_draft)
+
     print("🎤 Job Posting Voice Assistant is ready!")
     print("📝 I'll help you create a comprehensive job posting through natural conversation.")
     print("💼 Waiting for participants to join...")
 
 
 if __name__ == "__main__":
-    agents.cli.run_app(agents.WorkerOptions(entrypoint_fnc=entrypoint)) 
\ No newline at end of file
+    RUNTIME.run(entrypoint)
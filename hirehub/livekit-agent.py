@@ -7,49 +7,78 @@ This agent conducts technical interviews using OpenAI's GPT models
 and provides real-time voice interaction through LiveKit.
 
 To run:
-1. Install dependencies: pip install livekit-agents openai
+1. Install dependencies: pip install -r requirements.txt
 2. Set environment variables: LIVEKIT_API_KEY, LIVEKIT_API_SECRET, LIVEKIT_WS_URL, OPENAI_API_KEY
-3. Run: python livekit-agent.py
+3. Run: python livekit-agent.py start
 """
 
 import asyncio
-import os
 import json
 import logging
-from typing import Dict, List, Optional
+import os
+from typing import Dict, List, Tuple
 
-from livekit import api
-from livekit.agents import AutoSubscribe, JobContext, WorkerOptions, cli, llm
-from livekit.agents.voice_assistant import VoiceAssistant
-from livekit.plugins import openai, silero
+from livekit.agents import Agent, AgentSession, AutoSubscribe, JobContext, JobExecutorType
+from livekit.agents.llm import ChatContext, ChatMessage, StopResponse
+
+from agent_core import providers
+from agent_core.deadlines import model_name
+from agent_core.degradation import CONTROLLER
+from agent_core.endpointing import VAD_OPTIONS, bind_endpointer
+from agent_core.export import bind_export, start_export
+from agent_core.interview_config import (
+    InterviewConfig,
+    JobConfig,
+    job_prompt,
+    load_interview_config,
+    question_plan,
+)
+from agent_core.profiling import install_signal_handlers
+from agent_core.prompts import Prompt, track_session_llm
+from agent_core.recording import bind_recorder
+from agent_core.runtime import AgentRuntime, SessionRuntime
+from agent_core.scoring import DEFAULT_ANALYSIS, ScoringError, score_transcript
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class InterviewAgent:
-    def __init__(self, interview_config: Dict):
-        self.config = interview_config
-        self.questions_asked = 0
-        self.max_questions = 5
-        self.interview_transcript = []
-        
-        # Initialize OpenAI LLM
-        self.llm = openai.LLM(
-            model="gpt-4",
-            temperature=0.7,
-        )
-        
-        # System prompt for the AI interviewer
-        self.system_prompt = f"""You are a professional AI interviewer conducting a {interview_config.get('experience_level', 'mid-level')} interview for a {interview_config.get('job_title', 'Software Engineer')} position at {interview_config.get('company', 'our company')}.
+# Plugins are imported lazily (see agent_core.providers); these are the ones this agent uses
+PLUGINS = ("openai", "silero")
+
+RUNTIME = AgentRuntime("livekit-agent", plugins=PLUGINS)
+RUNTIME.on_prewarm(install_signal_handlers)
+RUNTIME.on_prewarm(start_export)
+
+# $VAD_BATCHING=1 runs rooms as threads of one worker process, so every room's
+# VAD shares one batched inference thread (see agent_core.batched_vad)
+VAD_BATCHING = os.getenv("VAD_BATCHING") == "1"
+if VAD_BATCHING:
+    # Prewarm and jobs then run on worker threads, but LiveKit only accepts
+    # plugins registered on the main thread: import them now, at load
+    providers.preload(*PLUGINS)
+    import agent_core.batched_vad  # noqa: F401
+
+# Chat items the session LLM normally sees (older ones drop off under short_prompts)
+HISTORY_ITEMS = 12
+
+# Used when the room has no (valid) metadata
+DEFAULT_INTERVIEW_CONFIG = {
+    "job_title": "Software Engineer",
+    "company": "Tech Company",
+    "experience_level": "mid-level",
+    "skills_to_evaluate": ["JavaScript", "React", "Node.js"],
+    "max_duration": 30
+}
+
+# Instructions shared by every session; job and candidate details follow them
+STABLE_INSTRUCTIONS = """You are a professional AI interviewer.
 
 INTERVIEW GUIDELINES:
 - Be conversational, warm, and professional
 - Ask follow-up questions based on candidate responses
-- Evaluate technical skills: {', '.join(interview_config.get('skills_to_evaluate', []))}
 - Assess communication, problem-solving, and cultural fit
 - Keep questions appropriate for the experience level
-- Conduct exactly {self.max_questions} questions over 15-20 minutes
 - Be encouraging and help candidates showcase their strengths
 
 CONVERSATION FLOW:
@@ -66,25 +95,65 @@ Remember to:
 - Keep responses concise but engaging
 - Transition smoothly between topics"""
 
-    async def generate_question(self, conversation_history: List[str]) -> str:
-        """Generate the next interview question based on conversation history"""
-        
-        if self.questions_asked == 0:
-            return "Hello! Welcome to your interview today. I'm excited to learn more about you. Could you please start by introducing yourself and telling me a bit about your background in software development?"
-        
-        # Prepare context for question generation
-        context = f"""
-Previous conversation:
-{chr(10).join(conversation_history[-6:])}  # Last 3 exchanges
+# Bump when job_section changes; cached sections are keyed by it
+JOB_SECTION_VERSION = "1"
 
-This is question {self.questions_asked + 1} of {self.max_questions}.
-Generate an appropriate follow-up question that builds on their responses.
-"""
-        
-        prompt = f"{self.system_prompt}\n\n{context}\n\nGenerate the next interview question:"
+def job_section(job: JobConfig, max_questions: int) -> str:
+    """The part of the prompt shared by every interview for a job"""
+    return f"""THIS INTERVIEW:
+You are conducting a {job.experience_level or 'mid-level'} interview for a {job.title or 'Software Engineer'} position at {job.company or 'our company'}.
+- Evaluate technical skills: {', '.join(job.skills_required)}
+- Conduct exactly {max_questions} questions over 15-20 minutes"""
+
+def candidate_section(config: InterviewConfig) -> str:
+    candidate = config.candidate
+    if not (candidate.name or candidate.skills):
+        return ""
+    return f"""CANDIDATE:
+- Name: {candidate.name or 'Not specified'}
+- Skills: {', '.join(candidate.skills) or 'Not specified'}"""
+
+class InterviewAgent:
+    def __init__(self, config: InterviewConfig, runtime: SessionRuntime):
+        self.config = config
+        self.runtime = runtime
+        self.questions_asked = 0
+        self.max_questions = config.max_questions
+        self.interview_transcript = runtime.transcript
+        # Planned questions, spoken if the LLM misses a turn's deadline
+        self.questions = question_plan(config)
+        # (question, answer) pairs whose analysis was put off while shedding load
+        self.deferred_analysis: List[Tuple[str, str]] = []
         
-        response = await self.llm.agenerate(prompt)
-        return response.choices[0].message.content.strip()
+        # Prompt sections, most shared first; each call only adds its turn
+        self.prompt = Prompt(
+            stable=STABLE_INSTRUCTIONS,
+            job=job_prompt(
+                config,
+                f"livekit-agent:{self.max_questions}",
+                lambda job: job_section(job, self.max_questions),
+                JOB_SECTION_VERSION,
+            ),
+            candidate=candidate_section(config),
+        )
+        self.system_prompt = self.prompt.instructions
+        logger.info(f"Prompt prefix {self.prompt.prefix_digest()} ({len(self.prompt.prefix)} chars)")
+
+    @property
+    def llm(self):
+        """OpenAI LLM for answer analysis and scoring; a cheaper model while the worker sheds load"""
+        return RUNTIME.provider("llm", "openai", model=CONTROLLER.model("gpt-4"), temperature=0.7)
+
+    def fallback_question(self) -> str:
+        """Planned question for the current turn"""
+        return self.questions[self.questions_asked % len(self.questions)]["question"]
+
+    def turn_instructions(self) -> str:
+        """Note added to the session LLM's context for the reply to the candidate's latest answer"""
+        return (
+            f"This is question {self.questions_asked + 1} of {self.max_questions}. "
+            "Ask one appropriate follow-up question that builds on their responses."
+        )
 
     async def analyze_response(self, question: str, answer: str) -> Dict:
         """Analyze candidate's response for insights"""
@@ -107,9 +176,11 @@ Provide analysis in JSON format:
 """
         
         try:
-            response = await self.llm.agenerate(analysis_prompt)
-            return json.loads(response.choices[0].message.content)
-        except:
+            response = await self.runtime.complete(
+                self.llm, self.prompt.with_turn(analysis_prompt), metric="llm.analysis"
+            )
+            return json.loads(response)
+        except Exception:
             return {
                 "key_points": [],
                 "technical_skills_mentioned": [],
@@ -120,156 +191,146 @@ Provide analysis in JSON format:
             }
 
     async def generate_final_analysis(self) -> Dict:
-        """Generate comprehensive final analysis"""
-        
-        transcript_text = "\n".join(self.interview_transcript)
-        
-        analysis_prompt = f"""
-Based on this complete interview transcript, provide a comprehensive candidate analysis:
-
-{transcript_text}
-
-Provide analysis in JSON format:
-{{
-    "overall_score": 0-100,
-    "technical_skills": [{{"skill": "JavaScript", "proficiency": 0-100}}],
-    "soft_skills": [{{"skill": "Communication", "rating": 0-100}}],
-    "communication_score": 0-100,
-    "experience_match": 0-100,
-    "culture_fit": 0-100,
-    "strengths": ["strength1", "strength2"],
-    "areas_for_improvement": ["area1", "area2"],
-    "summary": "Comprehensive assessment summary",
-    "recommendation": "strong_hire|hire|maybe|no_hire",
-    "interview_duration": 20,
-    "response_quality": 0-100,
-    "engagement_level": 0-100
-}}
-"""
-        
+        """Generate comprehensive final analysis; a neutral placeholder if scoring fails"""
         try:
-            response = await self.llm.agenerate(analysis_prompt)
-            return json.loads(response.choices[0].message.content)
-        except Exception as e:
+            return await score_transcript(self.runtime, self.llm, self.config, self.interview_transcript.as_text())
+        except ScoringError as e:
             logger.error(f"Error generating final analysis: {e}")
-            return {
-                "overall_score": 50,
-                "technical_skills": [],
-                "soft_skills": [],
-                "communication_score": 50,
-                "experience_match": 50,
-                "culture_fit": 50,
-                "strengths": [],
-                "areas_for_improvement": [],
-                "summary": "Analysis could not be completed",
-                "recommendation": "maybe",
-                "interview_duration": 20,
-                "response_quality": 50,
-                "engagement_level": 50
-            }
+            return dict(DEFAULT_ANALYSIS)
+
+class InterviewerAgent(Agent):
+    """Voice agent whose replies fall back to a planned question when the LLM is slow"""
+
+    def __init__(self, interview_agent: InterviewAgent) -> None:
+        super().__init__(instructions=interview_agent.system_prompt)
+        self.interview_agent = interview_agent
+
+    async def on_user_turn_completed(self, turn_ctx: ChatContext, new_message: ChatMessage) -> None:
+        """Steer the reply to the next question; after the last answer the goodbye is said instead"""
+        interview_agent = self.interview_agent
+        if interview_agent.questions_asked >= interview_agent.max_questions:
+            raise StopResponse()
+        turn_ctx.add_message(role="system", content=interview_agent.turn_instructions())
+
+    async def llm_node(self, chat_ctx, tools, model_settings):
+        if CONTROLLER.active("short_prompts"):
+            # Carry a third of the usual history while the worker sheds load
+            chat_ctx = chat_ctx.copy()
+            chat_ctx.truncate(max_items=CONTROLLER.history(HISTORY_ITEMS))
+        async for chunk in self.interview_agent.runtime.deadlines.stream(
+            Agent.default.llm_node(self, chat_ctx, tools, model_settings),
+            model_name(self.session.llm),
+            self.interview_agent.fallback_question(),
+        ):
+            yield chunk
 
 async def entrypoint(ctx: JobContext):
     """Main entrypoint for the LiveKit agent"""
     
     logger.info(f"Starting interview agent for room: {ctx.room.name}")
+    await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
+    runtime = RUNTIME.session(ctx)
+    bind_recorder(runtime, ctx.room)
     
     # Get interview configuration from room metadata or default
-    interview_config = {
-        "job_title": "Software Engineer",
-        "company": "Tech Company",
-        "experience_level": "mid-level",
-        "skills_to_evaluate": ["JavaScript", "React", "Node.js"],
-        "max_duration": 30
-    }
+    interview_config = load_interview_config(ctx.room.metadata, DEFAULT_INTERVIEW_CONFIG)
     
-    # Initialize interview agent
-    interview_agent = InterviewAgent(interview_config)
+    # Initialize interview agent; its plan and prompt come from the job cache
+    # (SQLite), so build it off the event loop
+    interview_agent = await asyncio.to_thread(InterviewAgent, interview_config, runtime)
+    export = bind_export(runtime, interview_config)
     
-    # Create voice assistant with TTS and STT
-    assistant = VoiceAssistant(
-        vad=silero.VAD.load(),
-        stt=openai.STT(),
-        llm=openai.LLM(model="gpt-4"),
-        tts=openai.TTS(),
-        chat_ctx=llm.ChatContext().append(
-            role="system", 
-            text=interview_agent.system_prompt
-        ),
+    vad = RUNTIME.provider("vad", "silero_batched" if VAD_BATCHING else "silero", **VAD_OPTIONS)
+    if VAD_BATCHING:
+        runtime.on_shutdown(lambda: logger.info(f"[{ctx.room.name}] VAD engine: {vad.engine.summary()}"))
+    
+    # Create voice session with TTS and STT; turns are ended by the adaptive endpointer
+    session = AgentSession(
+        turn_detection="manual",
+        vad=vad,
+        stt=RUNTIME.provider("stt", "openai"),
+        llm=RUNTIME.provider("llm", "openai", model=CONTROLLER.model("gpt-4")),
+        tts=RUNTIME.provider("tts", "openai"),
     )
     
-    # Start the voice assistant
-    assistant.start(ctx.room)
+    async def publish(message: Dict) -> None:
+        await ctx.room.local_participant.publish_data(json.dumps(message).encode(), reliable=True)
     
-    # Handle interview flow
-    conversation_history = []
+    async def publish_analysis(exchanges: List[Tuple[str, str]]) -> None:
+        """Analyze exchanges (one, or a deferred batch) and send each to the frontend"""
+        analyses = await asyncio.gather(*(interview_agent.analyze_response(q, a) for q, a in exchanges))
+        for (question, answer), analysis in zip(exchanges, analyses):
+            export.add_analysis(question, answer, analysis)
+            await publish({
+                "type": "response_analysis",
+                "analysis": analysis
+            })
     
-    @assistant.on("user_speech_committed")
-    async def on_user_speech(user_msg: llm.ChatMessage):
-        """Handle when user completes speaking"""
-        
+    async def flush_deferred_analysis() -> None:
+        deferred, interview_agent.deferred_analysis = interview_agent.deferred_analysis, []
+        if deferred:
+            await publish_analysis(deferred)
+    
+    async def on_user_turn(text: str):
+        """Handle when user completes their turn"""
         # Record the exchange
-        conversation_history.append(f"User: {user_msg.content}")
-        interview_agent.interview_transcript.append(f"A: {user_msg.content}")
+        last_question = interview_agent.interview_transcript.last(1, speaker="interviewer")
+        interview_agent.interview_transcript.add("candidate", text)
         
-        # Analyze the response
-        if len(conversation_history) >= 2:  # Have both question and answer
-            last_question = conversation_history[-2].replace("Assistant: ", "")
-            analysis = await interview_agent.analyze_response(last_question, user_msg.content)
-            
-            # Send analysis to frontend via data channel
-            await ctx.room.local_participant.publish_data(
-                json.dumps({
-                    "type": "response_analysis",
-                    "analysis": analysis
-                }).encode(),
-                reliable=True
-            )
+        # Analyze the response, or queue it while the worker sheds load
+        if last_question:  # Have both question and answer
+            interview_agent.deferred_analysis.append((last_question[0]["content"], text))
+            if CONTROLLER.active("defer_analysis"):
+                runtime.metrics.incr("degraded.analysis_deferred")
+            else:
+                await flush_deferred_analysis()
         
         # Check if interview should continue
         if interview_agent.questions_asked >= interview_agent.max_questions:
             # Complete the interview
+            await flush_deferred_analysis()
             final_analysis = await interview_agent.generate_final_analysis()
+            export.set_final(final_analysis)
             
             # Send final analysis
-            await ctx.room.local_participant.publish_data(
-                json.dumps({
-                    "type": "interview_complete",
-                    "analysis": final_analysis,
-                    "transcript": "\n".join(interview_agent.interview_transcript)
-                }).encode(),
-                reliable=True
-            )
+            await publish({
+                "type": "interview_complete",
+                "analysis": final_analysis,
+                "transcript": interview_agent.interview_transcript.as_text()
+            })
             
             # Say goodbye
-            await assistant.say("Thank you for taking the time to interview with us today. We've completed our conversation and will be in touch soon with next steps. Have a great day!")
+            await session.say("Thank you for taking the time to interview with us today. We've completed our conversation and will be in touch soon with next steps. Have a great day!")
             
             # Wait a moment then disconnect
             await asyncio.sleep(3)
-            await ctx.room.disconnect()
-        else:
-            # Generate next question
-            next_question = await interview_agent.generate_question(conversation_history)
-            conversation_history.append(f"Assistant: {next_question}")
-            interview_agent.interview_transcript.append(f"Q: {next_question}")
+            ctx.shutdown(reason="interview complete")
+
+    @runtime.on(session, "conversation_item_added")
+    def on_conversation_item_added(event):
+        """Record what the interviewer actually said (the session LLM's reply, a fallback, or the goodbye)"""
+        if event.item.role != "assistant" or not event.item.text_content:
+            return
+        interview_agent.interview_transcript.add("interviewer", event.item.text_content)
+        if interview_agent.questions_asked < interview_agent.max_questions:
             interview_agent.questions_asked += 1
-            
-            # Send transcript update
-            await ctx.room.local_participant.publish_data(
-                json.dumps({
-                    "type": "transcript",
-                    "text": next_question,
-                    "speaker": "interviewer"
-                }).encode(),
-                reliable=True
-            )
+        
+        # Send transcript update
+        runtime.spawn(publish({
+            "type": "transcript",
+            "text": event.item.text_content,
+            "speaker": "interviewer"
+        }), name="publish_transcript")
+    
+    # Each committed turn gets the session LLM's reply, steered by InterviewerAgent
+    bind_endpointer(runtime, session, on_user_turn)
+    track_session_llm(runtime, session)
     
-    # Wait for the interview to complete
-    await assistant.aclose()
+    # Start the voice session; it runs until the room closes
+    await session.start(room=ctx.room, agent=InterviewerAgent(interview_agent))
 
 if __name__ == "__main__":
-    cli.run_app(
-        WorkerOptions(
-            entrypoint_fnc=entrypoint,
-            auto_subscribe=AutoSubscribe.AUDIO_ONLY,
-        ),
-    ) 
\ No newline at end of file
+    if VAD_BATCHING:
+        RUNTIME.run(entrypoint, job_executor_type=JobExecutorType.THREAD)
+    else:
+        RUNTIME.run(entrypoint)
@@ -1,13 +1,13 @@
 import asyncio
 import logging
-import os
-from typing import Annotated
 
-from livekit import agents, rtc
-from livekit.agents import JobContext, WorkerOptions, cli, tokenize, tts
-from livekit.agents.llm import ChatContext, ChatMessage
-from livekit.agents.voice_assistant import VoiceAssistant
-from livekit.plugins import openai
+from livekit.agents import Agent, AgentSession, AutoSubscribe, JobContext
+
+from agent_core.interview_config import InterviewConfig, JobConfig, job_prompt, load_interview_config
+from agent_core.profiling import install_signal_handlers
+from agent_core.prompts import Prompt, track_session_llm
+from agent_core.recording import bind_recorder
+from agent_core.runtime import AgentRuntime
 
 # Set up logging
 logging.basicConfig(
@@ -16,14 +16,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class InterviewAgent:
-    def __init__(self):
-        self.transcript = []
-        self.interview_context = {}
-        
-    def create_interview_prompt(self, context: dict) -> str:
-        """Create a dynamic interview prompt based on job context"""
-        base_prompt = f"""You are an AI interviewer conducting a professional job interview for the position of {context.get('jobTitle', 'Software Engineer')} at {context.get('company', 'our company')}.
+# Plugins are imported lazily (see agent_core.providers); these are the ones this agent uses
+PLUGINS = ("openai",)
+
+RUNTIME = AgentRuntime("livekit-interview-agent", plugins=PLUGINS)
+RUNTIME.on_prewarm(install_signal_handlers)
+
+def realtime_model():
+    """Realtime model shared by every room in this worker process"""
+    return RUNTIME.provider("realtime", "openai", voice="alloy", temperature=0.7)
+
+# Build the model before the first job arrives
+RUNTIME.on_prewarm(realtime_model)
+
+# Same for every interview; the job section follows it so the whole prefix is shared per job
+STABLE_INSTRUCTIONS = """You are an AI interviewer conducting a professional job interview.
 
 INTERVIEW OBJECTIVES:
 - Assess the candidate's technical skills and experience
@@ -37,9 +44,6 @@ INTERVIEW STRUCTURE:
 3. Behavioral/situational questions (5-10 minutes)
 4. Company culture and candidate questions (5 minutes)
 
-SKILLS TO ASSESS: {', '.join(context.get('requiredSkills', []))}
-EXPERIENCE LEVEL: {context.get('experienceLevel', 'Mid-level')}
-
 COMMUNICATION GUIDELINES:
 - Be professional, friendly, and encouraging
 - Ask one question at a time
@@ -52,86 +56,72 @@ CURRENT PHASE: Introduction - Start by welcoming the candidate and briefly expla
 
 Remember: You're evaluating both technical competency and soft skills. Create a comfortable environment while gathering comprehensive information about the candidate."""
 
-        return base_prompt
+# Bump when build_interview_prompt changes; cached sections are keyed by it
+JOB_SECTION_VERSION = "1"
 
-    async def entrypoint(self, ctx: JobContext):
-        """Main entry point for the interview agent"""
-        logger.info(f"Starting interview agent for room: {ctx.room.name}")
-        
-        # Wait for participant to join
-        await ctx.connect(auto_subscribe=agents.AutoSubscribe.AUDIO_ONLY)
-        
-        # Get interview context from room metadata
-        room_metadata = ctx.room.metadata or "{}"
-        try:
-            import json
-            self.interview_context = json.loads(room_metadata)
-        except:
-            self.interview_context = {}
-            
-        logger.info(f"Interview context: {self.interview_context}")
-        
-        # Create initial context with interview-specific prompt
-        initial_ctx = ChatContext().append(
-            role="system",
-            text=self.create_interview_prompt(self.interview_context),
-        )
-        
-        # Initialize OpenAI Realtime API
-        openai_model = openai.realtime.RealtimeModel(
-            instructions=self.create_interview_prompt(self.interview_context),
-            voice="alloy",  # Professional, clear voice
-            temperature=0.7,
-            modalities=["text", "audio"],
-        )
-        
-        logger.info("Creating voice assistant with OpenAI Realtime API...")
+class InterviewAgent:
+    def __init__(self, config: InterviewConfig):
+        self.config = config
         
-        # Create the voice assistant
-        assistant = VoiceAssistant(
-            vad=rtc.AudioVAD(),  # Voice Activity Detection
-            stt=openai.STT(),    # Speech-to-Text
-            llm=openai_model,    # Large Language Model
-            tts=openai.TTS(),    # Text-to-Speech
-            chat_ctx=initial_ctx,
+    def create_interview_prompt(self) -> str:
+        """Interview prompt: the stable instructions, then the job section built once per job"""
+        prompt = Prompt(
+            stable=STABLE_INSTRUCTIONS,
+            job=job_prompt(self.config, "livekit-interview-agent", self.build_interview_prompt, JOB_SECTION_VERSION),
         )
-        
-        # Set up event handlers
-        @assistant.on("user_speech_committed")
-        def on_user_speech_committed(msg: ChatMessage):
-            logger.info(f"User said: {msg.content}")
-            self.transcript.append(f"Candidate: {msg.content}")
-        
-        @assistant.on("agent_speech_committed")  
-        def on_agent_speech_committed(msg: ChatMessage):
-            logger.info(f"Agent said: {msg.content}")
-            self.transcript.append(f"Interviewer: {msg.content}")
-        
-        @assistant.on("function_calls_finished")
-        def on_function_calls_finished(called_functions):
-            if called_functions:
-                logger.info(f"Function calls completed: {len(called_functions)}")
-        
-        # Start the voice assistant
-        assistant.start(ctx.room)
-        
-        logger.info("🎙️ Voice assistant started! Interview ready to begin.")
-        
-        # Wait for the interview to complete
-        await assistant.aclose()
+        logger.info(f"Prompt prefix {prompt.prefix_digest()} for job {self.config.job.key}")
+        return prompt.instructions
+
+    @staticmethod
+    def build_interview_prompt(job: JobConfig) -> str:
+        """Create the job section of the interview prompt"""
+        return f"""POSITION: {job.title or 'Software Engineer'} at {job.company or 'our company'}
+SKILLS TO ASSESS: {', '.join(job.skills_required)}
+EXPERIENCE LEVEL: {job.experience_level or 'Mid-level'}"""
 
-def prewarm(proc: agents.WorkerProcess):
-    """Pre-warm the worker process with necessary models"""
-    logger.info("Pre-warming worker process...")
-    proc.userdata["openai_models"] = [
-        openai.realtime.RealtimeModel(),
-    ]
+async def entrypoint(ctx: JobContext):
+    """Main entry point for the interview agent"""
+    logger.info(f"Starting interview agent for room: {ctx.room.name}")
+    
+    # Wait for participant to join
+    await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
+    runtime = RUNTIME.session(ctx)
+    bind_recorder(runtime, ctx.room)
+    
+    # Get interview context from room metadata
+    interview_agent = InterviewAgent(load_interview_config(ctx.room.metadata))
+    logger.info(f"Interview context: {interview_agent.config}")
+    
+    logger.info("Creating agent session with OpenAI Realtime API...")
+    
+    # The realtime model handles speech in and out; instructions are per room
+    session = AgentSession(llm=realtime_model())
+    track_session_llm(runtime, session, name="realtime")
+    
+    # Set up event handlers
+    @runtime.on(session, "conversation_item_added")
+    def on_conversation_item_added(event):
+        text = event.item.text_content
+        if not text:
+            return
+        speaker = "candidate" if event.item.role == "user" else "interviewer"
+        logger.info(f"{speaker.title()} said: {text}")
+        runtime.transcript.add(speaker, text)
+    
+    @runtime.on(session, "function_tools_executed")
+    def on_function_tools_executed(event):
+        if event.function_calls:
+            logger.info(f"Function calls completed: {len(event.function_calls)}")
+    
+    # Start the agent session; the job section may be read from the job cache's
+    # SQLite file, so build the prompt off the event loop
+    instructions = await asyncio.to_thread(interview_agent.create_interview_prompt)
+    await session.start(
+        room=ctx.room,
+        agent=Agent(instructions=instructions),
+    )
+    
+    logger.info("🎙️ Agent session started! Interview ready to begin.")
 
 if __name__ == "__main__":
-    # Configure CLI options
-    cli.run_app(
-        WorkerOptions(
-            entrypoint_fnc=InterviewAgent().entrypoint,
-            prewarm_fnc=prewarm,
-        ),
-    ) 
\ No newline at end of file
+    RUNTIME.run(entrypoint)
@@ -19,4 +19,4 @@ echo "Starting HireHub LiveKit Agent..."
 echo "LiveKit URL: $LIVEKIT_URL"
 
 # Start the agent
-python -m livekit.agents.cli interview-agent.py 
\ No newline at end of file
+python interview-agent.py start 
\ No newline at end of file
@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def quiet_runtime(monkeypatch):
+    """Sessions built by tests don't start loop-monitor or load-shedding threads"""
+    monkeypatch.setenv("LOOP_MONITOR", "0")
+    monkeypatch.setenv("DEGRADATION", "0")
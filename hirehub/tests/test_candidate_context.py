@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from agent_core import candidate_context as context_module
+from agent_core.candidate_context import (
+    candidate_context,
+    context_kind,
+    precompute,
+    ranked_skills,
+    summarize_experience,
+)
+from agent_core.interview_config import get_job_cache, parse_interview_config
+
+METADATA = {
+    "application_id": "app-1",
+    "job_data": {
+        "id": "job-1",
+        "title": "Backend Engineer",
+        "skillsRequired": ["Python", "PostgreSQL", "AWS"],
+        "skillsPreferred": ["Kubernetes"],
+    },
+    "resume_data": {"name": "Sam", "skills": ["django", "python", "postgres"], "experience": "Six years of APIs."},
+}
+
+
+@pytest.fixture
+def job_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("JOB_CACHE_DB", str(tmp_path / "job_cache.sqlite3"))
+    get_job_cache.cache_clear()
+    yield get_job_cache()
+    get_job_cache().close()
+    get_job_cache.cache_clear()
+
+
+def test_summarize_experience_cuts_at_a_boundary():
+    assert summarize_experience("  Built   APIs.\n") == "Built APIs."
+    text = "First sentence is here. " + "word " * 100
+    assert summarize_experience(text, limit=40) == "First sentence is here."
+    assert summarize_experience("word " * 100, limit=22) == "word word word word..."
+
+
+def test_job_skills_rank_first():
+    config = parse_interview_config(METADATA)
+    skills = ranked_skills(config)
+    assert skills[-1] == "Django"
+    assert len(skills) == 3
+
+
+def test_context_is_built_once_per_resume(job_cache):
+    config = parse_interview_config(METADATA)
+    context = candidate_context(config)
+    assert context["candidate"] == "app-1"
+    assert context["question_plan"]
+    assert "Name: Sam" in context["prompt"]
+    assert "Required skills not on the resume: AWS" in context["prompt"]
+
+    misses = job_cache.misses
+    assert candidate_context(config) == context
+    assert job_cache.misses == misses
+
+    edited = dict(METADATA, resume_data=dict(METADATA["resume_data"], skills=["python", "aws"]))
+    assert context_kind(parse_interview_config(edited)) != context_kind(config)
+    assert candidate_context(parse_interview_config(edited))["overlap"] != context["overlap"]
+
+
+def test_precompute_fills_the_cache_the_agent_reads(job_cache, monkeypatch):
+    precompute(json.dumps(METADATA))
+    monkeypatch.setattr(context_module, "build_candidate_context", lambda config: pytest.fail("rebuilt"))
+    assert candidate_context(parse_interview_config(METADATA))["candidate"] == "app-1"
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from agent_core.commands import CommandQueue
+from agent_core.runtime import AgentRuntime, SessionRuntime
+
+
+def run(scenario):
+    async def wrapper():
+        runtime = SessionRuntime(AgentRuntime("test"), "room")
+        try:
+            return await scenario(runtime)
+        finally:
+            await runtime.shutdown()
+    return asyncio.run(wrapper())
+
+
+def test_commands_run_one_at_a_time_in_order():
+    async def scenario(runtime):
+        state = {"step": 0}
+        log = []
+
+        async def slow(label):
+            log.append(f"start {label}")
+            await asyncio.sleep(0.01)
+            log.append(f"end {label}")
+            return label
+
+        queue = CommandQueue(runtime, lambda: dict(state))
+        results = await asyncio.gather(
+            queue.call("a", lambda: slow("a")),
+            queue.call("b", lambda: slow("b")),
+        )
+        assert results == ["a", "b"]
+        assert log == ["start a", "end a", "start b", "end b"]
+        assert runtime.metrics.counters["command.a"] == 1
+
+    run(scenario)
+
+
+def test_repeated_key_shares_one_result():
+    async def scenario(runtime):
+        state = {"index": 0}
+
+        def advance():
+            state["index"] += 1
+            return state["index"]
+
+        queue = CommandQueue(runtime, lambda: dict(state))
+        first, second = await asyncio.gather(
+            queue.call("next", advance, key="next"),
+            queue.call("next", advance, key="next"),
+        )
+        assert first == second == 1
+        # Still inside the window after finishing
+        assert await queue.call("next", advance, key="next") == 1
+        assert await queue.call("next", advance, key="next", window=0.0) == 2
+        assert runtime.metrics.counters["command.next.coalesced"] == 2
+
+    run(scenario)
+
+
+def test_snapshot_follows_each_command_and_failures_propagate():
+    async def scenario(runtime):
+        state = {"index": 0}
+
+        def advance():
+            state["index"] += 1
+
+        def fail():
+            state["index"] += 10
+            raise RuntimeError("boom")
+
+        queue = CommandQueue(runtime, lambda: dict(state))
+        assert queue.snapshot == {"index": 0}
+        await queue.call("next", advance)
+        assert queue.snapshot == {"index": 1}
+        with pytest.raises(RuntimeError):
+            await queue.call("fail", fail)
+        assert queue.snapshot == {"index": 11}
+
+    run(scenario)
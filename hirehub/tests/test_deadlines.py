@@ -0,0 +1,57 @@
+import asyncio
+
+from agent_core.deadlines import GENERIC_FALLBACK, STATS, TurnDeadlines, model_name
+from agent_core.metrics import SessionMetrics
+
+
+async def chunks(*items, delay=0.0):
+    for item in items:
+        await asyncio.sleep(delay)
+        yield item
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_stream_relays_a_reply_that_starts_in_time():
+    deadlines = TurnDeadlines(SessionMetrics("test", "room"))
+    result = asyncio.run(collect(deadlines.stream(chunks("Hel", "lo"), "fast-model", "fallback", budget=1.0)))
+
+    assert result == ["Hel", "lo"]
+    assert deadlines.metrics.counters["deadline.fast-model.calls"] == 1
+    assert "deadline.fast-model.misses" not in deadlines.metrics.counters
+
+
+def test_stream_falls_back_when_the_first_token_is_late():
+    deadlines = TurnDeadlines(SessionMetrics("test", "room"))
+    misses = STATS.misses.get("slow-model", 0)
+    result = asyncio.run(collect(deadlines.stream(chunks("late", delay=1.0), "slow-model", "Next question?", budget=0.01)))
+
+    assert result == ["Next question?"]
+    assert deadlines.metrics.counters["deadline.slow-model.misses"] == 1
+    assert STATS.misses["slow-model"] == misses + 1
+
+
+def test_complete_cancels_the_slow_call():
+    deadlines = TurnDeadlines(SessionMetrics("test", "room"))
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "too late"
+
+    assert asyncio.run(deadlines.complete(slow(), "slow-model", None, budget=0.01)) == GENERIC_FALLBACK
+    assert cancelled == [True]
+
+
+def test_model_name_prefers_the_model_attribute():
+    class LLM:
+        model = "gpt-4o-mini"
+
+    assert model_name(LLM()) == "gpt-4o-mini"
+    assert model_name(object()) == "object"
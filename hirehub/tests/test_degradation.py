@@ -0,0 +1,133 @@
+import json
+import os
+import time
+
+import pytest
+
+from agent_core import degradation
+from agent_core.degradation import (
+    ESCALATE_TICKS,
+    LEVELS,
+    RECOVER_TICKS,
+    STALE_INTERVALS,
+    Degradation,
+    NodeCPU,
+)
+
+HIGH = {"lag": 0.5, "cpu": 0.2, "errors": 0.0}
+LOW = {"lag": 0.01, "cpu": 0.2, "errors": 0.0}
+MIDDLE = {"lag": 0.1, "cpu": 0.2, "errors": 0.0}
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    # lead() exports the directory to job processes; restore the environment after
+    monkeypatch.setenv("DEGRADATION_STATE", str(tmp_path))
+    return str(tmp_path)
+
+
+def test_levels_go_up_and_back_down():
+    controller = Degradation()
+    assert controller.model("gpt-4") == "gpt-4"
+    assert controller.history(12) == 12
+
+    levels = []
+    for _ in range(ESCALATE_TICKS * len(LEVELS)):
+        controller.tick(HIGH)
+        levels.append(controller.level)
+    assert levels[ESCALATE_TICKS - 1] == 1
+    assert controller.mode == "short_prompts"
+    assert controller.model("gpt-4") == "gpt-4o-mini"
+    assert controller.history(12) == 4
+
+    # Readings between the marks hold the level
+    for _ in range(RECOVER_TICKS * 2):
+        controller.tick(MIDDLE)
+    assert controller.level == len(LEVELS) - 1
+
+    for _ in range(RECOVER_TICKS - 1):
+        controller.tick(LOW)
+    assert controller.level == len(LEVELS) - 1
+    for _ in range(RECOVER_TICKS * (len(LEVELS) - 1)):
+        controller.tick(LOW)
+    assert controller.level == 0
+    assert controller.changes == 2 * (len(LEVELS) - 1)
+
+
+def test_one_high_interval_does_not_escalate():
+    controller = Degradation()
+    for _ in range(RECOVER_TICKS):
+        controller.tick(HIGH)
+        controller.tick(LOW)
+    assert controller.level == 0
+
+
+def test_node_cpu_reads_proc_stat_deltas(tmp_path):
+    stat = tmp_path / "stat"
+    stat.write_text("cpu  100 0 100 800 0 0 0 0 0 0\ncpu0 1 2 3 4\n")
+    cpu = NodeCPU(str(stat))
+    # 300 more busy jiffies out of 400
+    stat.write_text("cpu  300 0 200 900 0 0 0 0 0 0\n")
+    assert cpu.read() == pytest.approx(0.75)
+    assert cpu.read() == 0.0
+
+
+def test_node_cpu_falls_back_to_load_average(tmp_path):
+    cpu = NodeCPU(str(tmp_path / "missing"))
+    assert cpu.read() >= 0.0
+
+
+def test_followers_report_to_the_leader_and_take_its_level(state_dir):
+    leader = Degradation()
+    leader.lead(state_dir)
+    assert leader.leader and not leader.following
+    assert os.environ["DEGRADATION_STATE"] == state_dir
+
+    follower = Degradation(state_dir=state_dir)
+    assert follower.following
+    for _ in range(10):
+        follower.record_call(failed=True)
+    follower.report()
+
+    assert leader.sample()["errors"] == 1.0
+    # Counted once, however many times the same report is read
+    assert leader.sample()["errors"] == 0.0
+
+    for _ in range(ESCALATE_TICKS):
+        leader.tick(HIGH)
+    leader.publish()
+    follower.follow()
+    assert follower.level == leader.level == 1
+
+    # A room starting later in another job process starts at the worker's level
+    newcomer = Degradation(state_dir=state_dir)
+    newcomer.follow()
+    assert newcomer.active("defer_analysis")
+
+    for _ in range(RECOVER_TICKS):
+        leader.tick(LOW)
+    leader.publish()
+    follower.follow()
+    assert follower.level == 0
+    assert follower.summary()["role"] == "follower"
+
+
+def test_leader_drops_stale_job_reports(state_dir):
+    leader = Degradation(interval=1.0)
+    leader.lead(state_dir)
+    stale = os.path.join(state_dir, "job-1.json")
+    with open(stale, "w") as f:
+        json.dump({"at": time.time() - STALE_INTERVALS - 1, "lag": 5.0, "calls": 50, "failures": 50}, f)
+
+    readings = leader.sample()
+    assert readings["lag"] < degradation.THRESHOLDS["lag"][0]
+    assert readings["errors"] == 0.0
+    assert not os.path.exists(stale)
+
+
+def test_disabled_controller_stays_at_normal(state_dir):
+    controller = Degradation(state_dir=state_dir)
+    with open(os.path.join(state_dir, degradation.LEVEL_FILE), "w") as f:
+        json.dump({"level": 3}, f)
+    controller.start()  # $DEGRADATION=0 in tests
+    assert controller.level == 0
@@ -0,0 +1,105 @@
+import asyncio
+
+from agent_core import draft_store
+from agent_core.draft_store import DraftStore
+
+
+def make_store(tmp_path, **kwargs) -> DraftStore:
+    return DraftStore(str(tmp_path / "drafts.sqlite3"), **kwargs)
+
+
+def test_saved_draft_survives_a_new_store(tmp_path):
+    store = make_store(tmp_path)
+    draft = store.get("recruiter")
+    draft.update({"title": "Designer"})
+    assert store.save("recruiter", draft)
+    assert not store.save("recruiter", draft)  # unchanged
+    store.close()
+
+    resumed = make_store(tmp_path).get("recruiter")
+    assert resumed["title"] == "Designer"
+
+
+def test_save_async_writes_in_call_order(tmp_path):
+    store = make_store(tmp_path)
+    draft = store.get("recruiter")
+
+    async def edits():
+        for title in ("One", "Two", "Three"):
+            draft.set("title", title)
+            await store.save_async("recruiter", draft)
+        await store.discard_async("recruiter")
+        draft.set("title", "Four")
+        await store.save_async("recruiter", draft)
+
+    asyncio.run(edits())
+    store.close()
+    assert make_store(tmp_path).get("recruiter")["title"] == "Four"
+
+
+def test_discard_forgets_the_draft(tmp_path):
+    store = make_store(tmp_path)
+    draft = store.get("recruiter")
+    draft.set("title", "Designer")
+    store.save("recruiter", draft)
+
+    asyncio.run(store.discard_async("recruiter"))
+    assert store.get("recruiter")["title"] == ""
+
+
+def test_get_async_resumes_a_saved_draft(tmp_path):
+    store = make_store(tmp_path)
+
+    async def reconnect():
+        draft = await store.get_async("recruiter")
+        draft.set("title", "Designer")
+        await store.save_async("recruiter", draft)
+        # A new store, as in the next job process
+        return await make_store(tmp_path).get_async("recruiter")
+
+    assert asyncio.run(reconnect())["title"] == "Designer"
+
+
+def test_lru_evicts_and_flushes_unsaved_edits(tmp_path):
+    store = make_store(tmp_path, max_hot=2)
+    first = store.get("a")
+    first.set("title", "Unsaved")
+    store.get("b")
+    store.get("c")
+
+    assert store.hot_count() == 2
+    assert store.get("a")["title"] == "Unsaved"
+
+
+def test_saves_sweep_idle_drafts_once_due(tmp_path, monkeypatch):
+    store = make_store(tmp_path, hot_ttl=10)
+    now = [1000.0]
+    monkeypatch.setattr(draft_store.time, "time", lambda: now[0])
+    store._next_sweep = now[0] + draft_store.SWEEP_INTERVAL
+
+    idle = store.get("idle")
+    idle.set("title", "Idle")
+    store.save("idle", idle)
+    now[0] += 30
+    active = store.get("active")
+    active.set("title", "Active")
+    store.save("active", active)
+    assert store.hot_count() == 2  # idle for 30s, but no sweep due yet
+
+    now[0] += draft_store.SWEEP_INTERVAL
+    active.set("title", "Still active")
+    store.save("active", active)
+    assert store.hot_count() == 1
+    assert store.get("idle")["title"] == "Idle"  # dropped from memory, not disk
+
+
+def test_sweep_deletes_expired_drafts(tmp_path, monkeypatch):
+    store = make_store(tmp_path, draft_ttl=60)
+    draft = store.get("old")
+    draft.set("title", "Old")
+    store.save("old", draft)
+
+    later = draft_store.time.time() + 3600
+    monkeypatch.setattr(draft_store.time, "time", lambda: later)
+    store.sweep()
+    assert store.get("old")["title"] == ""
@@ -0,0 +1,112 @@
+import os
+
+from agent_core.endpointing import (
+    MAX_DELAY,
+    AdaptiveEndpointer,
+    PauseProfile,
+    completion_score,
+    load_trace,
+    replay,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "fixtures", "endpointing")
+
+
+def record():
+    turns, barge_ins, discarded = [], [], []
+    endpointer = AdaptiveEndpointer(turns.append, on_barge_in=lambda: barge_ins.append(True), on_discard=discarded.append)
+    return endpointer, turns, barge_ins, discarded
+
+
+def speak(endpointer, start, end, text):
+    endpointer.speech_start(start)
+    endpointer.speech_end(end)
+    endpointer.transcript(text, True, end)
+
+
+def test_completion_score():
+    assert completion_score("so I worked on the") == 0.0
+    assert completion_score("we shipped it and um") == 0.0
+    assert completion_score("mostly Django,") == 0.1
+    assert completion_score("That's how we shipped it.") == 0.9
+    assert completion_score("") == 0.0
+
+
+def test_finished_turns_commit_sooner_than_unfinished_ones():
+    finished, _, _, _ = record()
+    speak(finished, 0.0, 2.0, "That's how we shipped it.")
+    unfinished, _, _, _ = record()
+    speak(unfinished, 0.0, 2.0, "and then we moved it to the")
+
+    assert finished.commit_deadline() < unfinished.commit_deadline() <= 2.0 + MAX_DELAY
+
+
+def test_commit_fires_once_silence_is_long_enough():
+    endpointer, turns, _, _ = record()
+    speak(endpointer, 0.0, 2.0, "I led the migration.")
+
+    endpointer.poll(2.1)
+    assert turns == []
+    endpointer.poll(endpointer.commit_deadline())
+    assert turns == ["I led the migration."]
+    assert endpointer.next_deadline() is None
+
+
+def test_interim_text_waits_to_settle():
+    endpointer, turns, _, _ = record()
+    endpointer.speech_start(0.0)
+    endpointer.speech_end(1.0)
+    endpointer.transcript("Done.", False, 1.9)
+
+    assert endpointer.commit_deadline() >= 1.9 + 0.3
+
+
+def test_backchannel_while_agent_talks_is_discarded():
+    endpointer, turns, barge_ins, discarded = record()
+    endpointer.agent_state(True, 0.0)
+    speak(endpointer, 1.0, 1.3, "mm-hmm")
+    endpointer.poll(endpointer.commit_deadline())
+
+    assert turns == [] and barge_ins == []
+    assert discarded == ["mm-hmm"]
+
+
+def test_sustained_speech_over_the_agent_barges_in():
+    endpointer, turns, barge_ins, _ = record()
+    endpointer.agent_state(True, 0.0)
+    endpointer.speech_start(1.0)
+    endpointer.poll(endpointer.next_deadline())
+    assert barge_ins == [True]
+
+    endpointer.speech_end(3.0)
+    endpointer.transcript("Sorry, can I add something?", True, 3.0)
+    endpointer.poll(endpointer.commit_deadline())
+    assert turns == ["Sorry, can I add something?"]
+
+
+def test_resuming_right_after_a_commit_widens_the_floor():
+    endpointer, turns, _, _ = record()
+    speak(endpointer, 0.0, 2.0, "I worked at a bank.")
+    endpointer.poll(endpointer.commit_deadline())
+    floor = endpointer.profile.floor
+
+    endpointer.speech_start(endpointer.committed_at + 0.5)
+    assert endpointer.profile.cutoffs == 1
+    assert endpointer.profile.floor > floor
+
+
+def test_pause_profile_learns_long_pauses():
+    profile = PauseProfile()
+    allowance = profile.allowance
+    for _ in range(10):
+        profile.observe_pause(1.8)
+    assert profile.allowance > allowance
+
+
+def test_replayed_trace_finds_barge_in_and_backchannels():
+    endpointer, turns, barge_ins, discarded = record()
+    replay(endpointer, load_trace(os.path.join(FIXTURES, "barge_in.jsonl")))
+
+    assert turns[0] == "Yeah I've used Kubernetes in production for about three years."
+    assert barge_ins == [True]
+    assert discarded == ["mm-hmm", "right", "okay"]
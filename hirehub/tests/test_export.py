@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from agent_core import export
+from agent_core.export import Exporter, bind_export, compact, interview_rows, remove_stale_parts
+from agent_core.interview_config import parse_interview_config
+from agent_core.runtime import AgentRuntime, SessionRuntime
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet  # noqa: E402
+
+CONFIG = parse_interview_config({"jobId": "j1", "jobTitle": "Backend Engineer", "company": "Acme"})
+TURNS = [
+    {"speaker": "interviewer", "content": "Tell me about yourself", "timestamp": "2026-01-05T10:00:00+00:00"},
+    {"speaker": "candidate", "content": "I build APIs in Python", "timestamp": "2026-01-05T10:00:30+00:00"},
+]
+ENDED = datetime(2026, 1, 5, 10, 1, tzinfo=timezone.utc)
+
+
+def rows(final=None, metrics=None):
+    analyses = [("Tell me about yourself", "I build APIs in Python", {"clarity_score": "8", "key_points": ["APIs"]})]
+    return interview_rows("i1", "room", "livekit-agent", CONFIG, TURNS, analyses, final, metrics, [0.2, 0.4], ENDED)
+
+
+def test_interview_rows_summarize_the_session():
+    tables = rows(final={"overall_score": 7, "recommendation": "hire"})
+    assert [turn["turn"] for turn in tables["turns"]] == [0, 1]
+    assert tables["turns"][1]["timestamp"] == datetime(2026, 1, 5, 10, 0, 30, tzinfo=timezone.utc)
+
+    analysis = tables["analyses"][0]
+    assert analysis["clarity_score"] == 8.0
+    assert analysis["key_points"] == ["APIs"]
+    assert analysis["technical_skills"] == []
+
+    interview = tables["interviews"][0]
+    assert interview["job_title"] == "Backend Engineer"
+    assert (interview["turns"], interview["candidate_turns"], interview["candidate_words"]) == (2, 1, 5)
+    assert interview["duration_s"] == 30.0
+    assert interview["overall_score"] == 7.0
+    assert interview["scoring_version"] is not None
+    assert interview["llm_calls"] == 2
+    assert json.loads(interview["final_analysis"])["recommendation"] == "hire"
+
+
+def test_interview_rows_take_duration_and_misses_from_metrics():
+    metrics = {"duration_s": 95.0, "counters": {"deadline.gpt-4.misses": 2, "deadline.gpt-4.hits": 5}}
+    interview = rows(metrics=metrics)["interviews"][0]
+    assert interview["duration_s"] == 95.0
+    assert interview["deadline_misses"] == 2
+    assert interview["scoring_version"] is None
+
+
+def test_naive_turn_timestamps_are_read_as_local_time():
+    naive = dict(TURNS[0], timestamp="2026-01-05T10:00:00")
+    tables = interview_rows("i1", "room", "a", CONFIG, [naive], [], None, None, [], ENDED)
+    expected = datetime(2026, 1, 5, 10, 0).astimezone(timezone.utc)
+    assert tables["turns"][0]["timestamp"] == expected
+
+
+def read_dataset(directory, table):
+    return pa.parquet.read_table(os.path.join(directory, table)).to_pylist()
+
+
+def test_exporter_writes_utc_day_partitions(tmp_path):
+    exporter = Exporter(str(tmp_path), flush_seconds=0.05)
+    assert exporter.submit("2026-01-05", rows())
+    exporter.close()
+
+    files = os.listdir(tmp_path / "interviews" / "date=2026-01-05")
+    assert len(files) == 1 and files[0].endswith(".parquet")
+    schema = pa.parquet.read_schema(tmp_path / "interviews" / "date=2026-01-05" / files[0])
+    assert schema.field("ended_at").type == pa.timestamp("us", tz="UTC")
+    turns = read_dataset(str(tmp_path), "turns")
+    assert [turn["speaker"] for turn in turns] == ["interviewer", "candidate"]
+    assert turns[0]["timestamp"].tzinfo is not None
+
+
+def test_stale_part_files_are_removed(tmp_path):
+    partition = tmp_path / "turns" / "date=2026-01-05"
+    partition.mkdir(parents=True)
+    dead = partition / "part-999999999-20260105100000-1.parquet.part"
+    live = partition / f"part-{os.getpid()}-20260105100000-1.parquet.part"
+    dead.write_bytes(b"PAR1")
+    live.write_bytes(b"PAR1")
+
+    assert remove_stale_parts(str(tmp_path)) == 1
+    assert not dead.exists() and live.exists()
+
+
+def test_compaction_merges_past_days(tmp_path):
+    for _ in range(3):
+        exporter = Exporter(str(tmp_path))
+        exporter.submit("2026-01-05", rows())
+        exporter.submit("2026-01-06", rows())
+        exporter.close()
+    assert len(os.listdir(tmp_path / "turns" / "date=2026-01-05")) == 3
+
+    assert compact(str(tmp_path), before="2026-01-06") == 3
+    files = os.listdir(tmp_path / "turns" / "date=2026-01-05")
+    assert len(files) == 1 and files[0].startswith("compacted-")
+    # Not yet past, so left alone
+    assert len(os.listdir(tmp_path / "turns" / "date=2026-01-06")) == 3
+    assert len(read_dataset(str(tmp_path), "turns")) == 12
+    # Nothing left to merge
+    assert compact(str(tmp_path), before="2026-01-06") == 0
+
+
+def test_interrupted_compaction_is_finished(tmp_path):
+    partition = tmp_path / "turns" / "date=2026-01-05"
+    for _ in range(2):
+        exporter = Exporter(str(tmp_path))
+        exporter.submit("2026-01-05", rows())
+        exporter.close()
+    inputs = sorted(os.listdir(partition))
+    # Died after writing the merged file, before deleting its inputs
+    merged = partition / "compacted-1-20260106000000.parquet"
+    merged.write_bytes((partition / inputs[0]).read_bytes())
+    (partition / "_compacting.json").write_text(json.dumps({"output": merged.name, "inputs": inputs}))
+
+    compact(str(tmp_path), before="2026-01-06")
+    assert sorted(os.listdir(partition)) == [merged.name]
+
+
+def test_session_shutdown_leaves_finished_files(tmp_path, monkeypatch):
+    # As in a job process: no close(), no atexit, and the process is gone right after shutdown
+    monkeypatch.setenv("EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(export, "_exporter", None)
+
+    async def interview():
+        runtime = SessionRuntime(AgentRuntime("livekit-agent"), "room")
+        runtime.transcript.add("interviewer", "Tell me about yourself")
+        runtime.transcript.add("candidate", "I build APIs")
+        result = bind_export(runtime, CONFIG)
+        result.set_final({"overall_score": 70})
+        await runtime.shutdown()
+
+    asyncio.run(interview())
+    names = [name for _, _, files in os.walk(tmp_path) for name in files]
+    assert names and not [name for name in names if name.endswith(".part")]
+    assert len(read_dataset(str(tmp_path), "turns")) == 2
+    assert read_dataset(str(tmp_path), "interviews")[0]["overall_score"] == 70.0
+
+    # The next job process's exporter keeps them
+    assert remove_stale_parts(str(tmp_path)) == 0
+    assert len(read_dataset(str(tmp_path), "turns")) == 2
@@ -0,0 +1,146 @@
+import json
+
+import pytest
+
+from agent_core import interview_config
+from agent_core.interview_config import (
+    ConfigError,
+    JobCache,
+    get_job_cache,
+    job_prompt,
+    load_interview_config,
+    parse_interview_config,
+    parse_room_metadata,
+    question_plan,
+)
+
+DEFAULTS = {"job_title": "Software Engineer", "company": "Tech Company", "skills_to_evaluate": ["JavaScript"]}
+
+
+@pytest.fixture
+def job_cache(tmp_path, monkeypatch):
+    """A fresh process-wide job cache in a temporary file"""
+    monkeypatch.setenv("JOB_CACHE_DB", str(tmp_path / "job_cache.sqlite3"))
+    get_job_cache.cache_clear()
+    yield get_job_cache()
+    get_job_cache().close()
+    get_job_cache.cache_clear()
+
+
+def test_api_shape():
+    config = parse_room_metadata(json.dumps({
+        "job_data": {"id": "j1", "title": " SRE ", "company": {"name": "Acme"}, "skillsRequired": ["Go", "go", "Python"]},
+        "resume_data": {"name": "Ana", "skills": "python, aws"},
+        "interview_id": "i1",
+        "max_questions": 50,
+    }))
+
+    assert config.job.title == "SRE"
+    assert config.job.company == "Acme"
+    assert config.job.skills_required == ("Go", "Python")
+    assert config.candidate.skills == ("python", "aws")
+    assert config.interview_id == "i1"
+    assert config.max_questions == 20
+
+
+def test_flat_shapes():
+    camel = parse_interview_config({"jobTitle": "SRE", "requiredSkills": ["Go"], "candidateName": "Ana"})
+    snake = parse_interview_config({"job_title": "SRE", "skills_to_evaluate": ["Go"]})
+
+    assert camel.job.title == snake.job.title == "SRE"
+    assert camel.job.skills_required == snake.job.skills_required == ("Go",)
+    assert camel.candidate.name == "Ana"
+
+
+@pytest.mark.parametrize("metadata", ["not json", "[1, 2]", '{"job_data": []}', '{"jobTitle": {"a": 1}}', '{"max_questions": "5"}'])
+def test_unusable_metadata_is_a_config_error(metadata):
+    with pytest.raises(ConfigError):
+        parse_room_metadata(metadata)
+
+
+def test_invalid_or_missing_metadata_falls_back_to_defaults():
+    assert load_interview_config(None, DEFAULTS).job.title == "Software Engineer"
+    assert load_interview_config("not json", DEFAULTS).job.title == "Software Engineer"
+    assert load_interview_config("not json").job.title == ""
+
+
+def test_metadata_without_a_job_takes_the_default_job():
+    config = load_interview_config(json.dumps({"candidateName": "Ana", "interview_id": "i1"}), DEFAULTS)
+
+    assert config.job.title == "Software Engineer"
+    assert config.job.skills_required == ("JavaScript",)
+    assert config.candidate.name == "Ana"
+    assert config.interview_id == "i1"
+    assert load_interview_config('{"jobTitle": "SRE"}', DEFAULTS).job.title == "SRE"
+
+
+def test_job_key_changes_with_content():
+    first = parse_interview_config({"jobId": "j1", "jobTitle": "SRE"}).job
+    edited = parse_interview_config({"jobId": "j1", "jobTitle": "Senior SRE"}).job
+
+    assert first.key.startswith("j1:")
+    assert first.key != edited.key
+
+
+def test_cache_builds_once_and_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    builds = []
+
+    def build():
+        builds.append(True)
+        return {"text": "built"}
+
+    cache = JobCache(path)
+    assert cache.get("job", "kind", build) == {"text": "built"}
+    assert cache.get("job", "kind", build) == {"text": "built"}
+    cache.close()
+
+    restarted = JobCache(path)
+    assert restarted.get("job", "kind", build) == {"text": "built"}
+    assert len(builds) == 1
+    assert (restarted.hits, restarted.misses) == (1, 0)
+
+
+def test_expired_entries_are_rebuilt_and_swept(tmp_path, monkeypatch):
+    cache = JobCache(str(tmp_path / "cache.sqlite3"), ttl=60)
+    cache.get("job", "kind", lambda: "old")
+    cache.get("job", "unused", lambda: "old")
+
+    later = interview_config.time.time() + 120
+    monkeypatch.setattr(interview_config.time, "time", lambda: later)
+    restarted = JobCache(str(tmp_path / "cache.sqlite3"), ttl=60)
+    assert restarted.get("job", "kind", lambda: "new") == "new"
+
+    restarted.sweep()
+    assert restarted._db.execute("SELECT COUNT(*) FROM job_artifacts").fetchone()[0] == 1
+
+
+def test_builds_may_read_other_entries(tmp_path):
+    cache = JobCache(str(tmp_path / "cache.sqlite3"))
+    outer = cache.get("job", "outer", lambda: cache.get("job", "inner", lambda: 1) + 1)
+    assert outer == 2
+
+
+def test_job_prompts_are_keyed_by_builder_version(job_cache):
+    config = parse_interview_config({"jobTitle": "SRE"})
+
+    assert job_prompt(config, "agent", lambda job: f"v1 {job.title}", "1") == "v1 SRE"
+    assert job_prompt(config, "agent", lambda job: f"stale {job.title}", "1") == "v1 SRE"
+    assert job_prompt(config, "agent", lambda job: f"v2 {job.title}", "2") == "v2 SRE"
+
+
+def test_question_plans_are_keyed_by_plan_version(job_cache, monkeypatch):
+    config = parse_interview_config({"jobTitle": "SRE", "requiredSkills": ["Python"], "candidateSkills": ["python"]})
+    question_plan(config)
+    kinds = {row[0] for row in job_cache._db.execute("SELECT kind FROM job_artifacts")}
+
+    monkeypatch.setattr(interview_config, "PLAN_VERSION", "next")
+    question_plan(config)
+    new_kinds = {row[0] for row in job_cache._db.execute("SELECT kind FROM job_artifacts")} - kinds
+    assert len(new_kinds) == 1 and new_kinds.pop().startswith("plan:next.")
+
+
+def test_question_plan_copies_are_independent(job_cache):
+    config = parse_interview_config({"jobTitle": "SRE"})
+    question_plan(config)[0]["asked"] = True
+    assert "asked" not in question_plan(config)[0]
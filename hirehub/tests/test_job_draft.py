@@ -0,0 +1,75 @@
+from agent_core.job_draft import COMPLETION_ITEMS, ESSENTIAL_ITEMS, JobDraft
+
+
+def test_completion_tracks_fields_as_they_change():
+    draft = JobDraft()
+    assert draft.completion_percentage == 0
+
+    draft.update({"title": "Designer", "jobType": "Full_time"})
+    assert draft.completion_percentage == int(2 / len(COMPLETION_ITEMS) * 100)
+    assert draft.missing_fields(ESSENTIAL_ITEMS) == ["job description", "requirements"]
+
+    draft.set("title", "")
+    assert "job title" in draft.missing_fields()
+
+
+def test_salary_item_is_complete_with_either_bound():
+    draft = JobDraft({"salaryMax": 150000})
+    assert "salary range" not in draft.missing_fields()
+
+
+def test_undo_reverts_one_utterance_at_a_time():
+    draft = JobDraft()
+    draft.update({"title": "Designer"})
+    draft.update({"salaryMin": 100000, "salaryMax": 120000})
+
+    assert draft.undo() == "salary range"
+    assert draft["salaryMin"] is None and draft["salaryMax"] is None
+    assert draft["title"] == "Designer"
+    assert draft.undo() == "job title"
+    assert draft.undo() is None
+
+
+def test_undo_by_field_skips_newer_edits():
+    draft = JobDraft()
+    draft.update({"title": "Designer"})
+    draft.update({"location": "Berlin"})
+
+    draft.undo("title")
+    assert draft["title"] == ""
+    assert draft["location"] == "Berlin"
+
+
+def test_unchanged_values_are_not_edits():
+    draft = JobDraft({"title": "Designer"})
+    version = draft.version
+
+    assert draft.update({"title": "Designer", "unknown": 1}) == []
+    assert draft.version == version
+    assert draft.undo() is None
+
+
+def test_render_is_cached_until_the_draft_changes():
+    draft = JobDraft({"title": "Designer"})
+    calls = []
+
+    def render(d: JobDraft) -> str:
+        calls.append(d.version)
+        return d["title"]
+
+    assert draft.render("summary", render) == "Designer"
+    assert draft.render("summary", render) == "Designer"
+    draft.set("title", "Engineer")
+    assert draft.render("summary", render) == "Engineer"
+    assert len(calls) == 2
+
+
+def test_merged_list_dedupes_by_key():
+    draft = JobDraft({"skillsRequired": ["React"]})
+    assert draft.merged_list("skillsRequired", ["react", "Go"], key=str.lower) == ["React", "Go"]
+
+
+def test_to_dict_is_a_copy():
+    draft = JobDraft({"skillsRequired": ["React"]})
+    draft.to_dict()["skillsRequired"].append("Go")
+    assert draft["skillsRequired"] == ["React"]
@@ -0,0 +1,37 @@
+import asyncio
+import time
+
+from agent_core import loop_monitor
+from agent_core.runtime import AgentRuntime, SessionRuntime
+
+
+def test_collapsed_stack_is_root_first():
+    def inner():
+        import sys
+        return loop_monitor.collapsed_stack(sys._getframe())
+
+    frames = inner().split(";")
+    assert frames[-1].startswith("test_loop_monitor.py:inner:")
+    assert frames[-2].startswith("test_loop_monitor.py:test_collapsed_stack_is_root_first:")
+
+
+def test_blocking_callback_is_counted_against_sessions(monkeypatch):
+    monkeypatch.setenv("LOOP_MONITOR", "1")
+
+    async def scenario():
+        session = SessionRuntime(AgentRuntime("test"), "room")
+        monitor = session.monitor
+        assert monitor is loop_monitor.monitor_for()
+        await asyncio.sleep(0.2)
+        time.sleep(0.3)  # hold the loop
+        await asyncio.sleep(0.2)
+        await session.shutdown()
+        return session, monitor
+
+    session, monitor = asyncio.run(scenario())
+    assert monitor.pings > 0
+    assert monitor.slow_count >= 1
+    assert session.metrics.counters["loop.slow_callbacks"] >= 1
+    slowest = monitor.slowest(1)[0]
+    assert slowest["blocked_s"] >= loop_monitor.SLOW_CALLBACK
+    assert "scenario" in (slowest["stack"] or "")
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import signal
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from agent_core import profiling
+from agent_core.runtime import AgentRuntime, SessionRuntime
+
+
+class Participant:
+    def __init__(self) -> None:
+        self.methods = {}
+
+    def register_rpc_method(self, method):
+        def decorator(handler):
+            self.methods[method] = handler
+            return handler
+        return decorator
+
+
+def call(handler, payload, caller="ops"):
+    return json.loads(asyncio.run(handler(SimpleNamespace(caller_identity=caller, payload=payload))))
+
+
+@pytest.fixture
+def profile_rpc(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("PROFILE_RPC_IDENTITIES", "ops")
+    participant = Participant()
+    profiling.bind_profiling(SessionRuntime(AgentRuntime("test"), "room"), participant)
+    return participant.methods["profile"]
+
+
+def test_profile_rpc_rejects_bad_payloads(profile_rpc):
+    assert call(profile_rpc, "{}", caller="candidate") == {"error": "not allowed"}
+    assert call(profile_rpc, "not json") == {"error": "payload must be JSON"}
+    assert call(profile_rpc, "[1, 2]") == {"error": "payload must be a JSON object"}
+    assert call(profile_rpc, '"cpu"') == {"error": "payload must be a JSON object"}
+    assert "error" in call(profile_rpc, '{"action": "cpu", "seconds": true}')
+    assert call(profile_rpc, '{"action": "flame"}') == {"error": "unknown action 'flame'"}
+
+
+def test_sampler_writes_collapsed_stacks(tmp_path):
+    profiler = profiling.SamplingProfiler(interval=0.001)
+    path = str(tmp_path / "cpu.collapsed")
+    assert profiler.start(0.1, path)
+    assert not profiler.start(0.1, path)
+    profiler._thread.join()
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any(line.startswith("MainThread;") for line in lines)
+
+
+def test_signal_handlers_skipped_off_the_main_thread(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    before = signal.getsignal(signal.SIGUSR1)
+    errors = []
+
+    def prewarm():
+        try:
+            profiling.install_signal_handlers()
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=prewarm)
+    thread.start()
+    thread.join()
+    assert errors == []
+    assert signal.getsignal(signal.SIGUSR1) is before
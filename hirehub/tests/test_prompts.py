@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+from agent_core.metrics import SessionMetrics
+from agent_core.prompts import Prompt, cache_ratios, record_completion_usage, record_usage
+
+
+def test_prefix_is_byte_identical_after_normalizing():
+    first = Prompt(stable="Be kind.  \r\nBe brief.\n", job="JOB: SRE\n")
+    second = Prompt(stable="Be kind.\nBe brief.", job="  JOB: SRE", candidate="CANDIDATE: Ana")
+
+    assert first.prefix == second.prefix == "Be kind.\nBe brief.\n\nJOB: SRE"
+    assert first.prefix_digest() == second.prefix_digest()
+
+
+def test_messages_put_the_shared_prefix_first():
+    prompt = Prompt(stable="Rules", job="Job", candidate="Candidate").with_turn("Next question?")
+
+    assert prompt.messages() == [("system", "Rules\n\nJob"), ("system", "Candidate"), ("user", "Next question?")]
+    assert prompt.instructions == "Rules\n\nJob\n\nCandidate"
+    assert Prompt(stable="Rules").messages() == [("system", "Rules")]
+
+
+def test_cache_ratios_per_call_site():
+    metrics = SessionMetrics("test", "room")
+    record_usage(metrics, "llm.analysis", 1000, 800, 50, ttft=0.2)
+    record_usage(metrics, "llm.analysis", 1000, 0, 50, ttft=0.5)
+    usage = SimpleNamespace(prompt_tokens=400, prompt_cached_tokens=100, completion_tokens=20)
+    record_completion_usage(metrics, "llm.reply", usage)
+
+    assert cache_ratios(metrics) == {"llm.analysis": 0.4, "llm.reply": 0.25}
+    assert metrics.timings["ttft.llm.analysis.cached"] == [0.2]
+    assert metrics.timings["ttft.llm.analysis.uncached"] == [0.5]
@@ -0,0 +1,40 @@
+import sys
+
+import pytest
+
+from agent_core import providers
+
+
+def test_plugins_are_imported_on_first_use(monkeypatch):
+    # Any module the test run hasn't imported yet stands in for a plugin
+    monkeypatch.setitem(providers.PLUGINS, "fake", "colorsys")
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+
+    module = providers.plugin("fake")
+    assert sys.modules["colorsys"] is module
+    assert providers.plugin("fake") is module
+
+
+def test_create_uses_registered_factory(monkeypatch):
+    monkeypatch.setattr(providers, "_FACTORIES", dict(providers._FACTORIES))
+    providers.register("stt", "echo")(lambda **kw: ("echo", kw))
+
+    assert providers.stt("echo", language="en") == ("echo", {"language": "en"})
+
+
+def test_unknown_provider_is_a_value_error():
+    with pytest.raises(ValueError, match="Unknown tts provider: nope"):
+        providers.tts("nope")
+
+
+def test_download_files_preloads_plugins(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(providers, "plugin", loaded.append)
+
+    monkeypatch.setattr(sys, "argv", ["agent.py", "start"])
+    providers.preload_for_command("openai")
+    assert loaded == []
+
+    monkeypatch.setattr(sys, "argv", ["agent.py", "download-files"])
+    providers.preload_for_command("openai", "silero")
+    assert loaded == ["openai", "silero"]
@@ -0,0 +1,53 @@
+from agent_core.question_bank import DEFAULT_SKILL, QuestionBank, build_question_plan, load_question_bank
+
+JOB = {
+    "title": "Site Reliability Engineer",
+    "company": {"name": "Acme"},
+    "skillsRequired": ["Python", "Go"],
+    "experienceLevel": "Senior",
+}
+
+
+def test_plan_has_one_question_per_slot():
+    plan = build_question_plan(JOB, {"skills": ["go", "python"]})
+
+    assert [q["id"] for q in plan] == [slot_id for slot_id, _ in load_question_bank().plan]
+    assert "Site Reliability Engineer" in plan[0]["question"]
+    assert "Acme" in plan[0]["question"]
+
+
+def test_primary_skill_follows_job_order_among_shared_skills():
+    bank = load_question_bank()
+
+    assert bank.choose_primary_skill(["Python", "Go"], ["go", "python"]) == ("python", "Python")
+    assert bank.choose_primary_skill(["Rust"], ["ReactJS"])[0] == "react"
+    assert bank.choose_primary_skill([], []) == ("", DEFAULT_SKILL)
+
+
+def test_skill_and_level_templates_win_over_generic_ones():
+    plan = {q["id"]: q for q in build_question_plan(JOB, {"skills": ["python"]})}
+
+    assert "Python project you are proud of" in plan["technical"]["question"]
+    assert "senior Site Reliability Engineer" in plan["experience"]["question"]
+
+
+def test_template_lookup_falls_back_from_specific_to_generic():
+    bank = QuestionBank(
+        plan=[{"id": "technical", "category": "technical"}],
+        templates=[
+            {"category": "technical", "rank": 10, "expected_duration": 90, "text": "generic {skill}"},
+            {"category": "technical", "rank": 5, "expected_duration": 90, "text": "worse generic"},
+            {"category": "technical", "level": "entry", "rank": 20, "expected_duration": 90, "text": "entry {skill}"},
+        ],
+    )
+
+    assert bank.find_template("technical", "python", "entry")["text"] == "entry {skill}"
+    assert bank.find_template("technical", "python", "senior")["text"] == "generic {skill}"
+    assert bank.find_template("behavioral") is None
+
+
+def test_missing_job_details_use_placeholders():
+    plan = build_question_plan({}, {})
+
+    assert "our company" in plan[0]["question"]
+    assert DEFAULT_SKILL in plan[1]["question"]
@@ -0,0 +1,51 @@
+import asyncio
+import json
+import os
+import wave
+
+from agent_core.recording import SegmentRing, TrackRecorder
+
+
+def test_ring_fills_slots_in_order():
+    ring = SegmentRing(slots=2, slot_bytes=4)
+
+    assert ring.write(memoryview(b"abc")) == []
+    assert ring.write(memoryview(b"def")) == [0]
+    assert bytes(ring.segment(0)) == b"abcd"
+    assert (ring.slot, ring.fill) == (1, 2)
+
+
+def test_ring_drops_audio_instead_of_overwriting_busy_slots():
+    ring = SegmentRing(slots=2, slot_bytes=4)
+    assert ring.write(memoryview(b"12345678")) == [0, 1]
+
+    assert ring.write(memoryview(b"xyz")) == []
+    assert ring.dropped == 3
+    assert bytes(ring.segment(0)) == b"1234"
+
+    ring.release(0)
+    assert ring.write(memoryview(b"ab")) == []
+    assert ring.take_partial() == 0
+    assert bytes(ring.segment(0, ring.fill)) == b"ab"
+
+
+def test_track_recorder_writes_segments_and_manifest(tmp_path):
+    directory = str(tmp_path / "track")
+    second = 8000 * 2  # 8 kHz mono int16
+
+    async def record():
+        recorder = TrackRecorder(directory, "wav", sample_rate=8000, segment_seconds=1, slots=4)
+        for _ in range(5):
+            recorder.write(bytes(second // 2))
+        return await recorder.close()
+
+    manifest = asyncio.run(record())
+
+    assert [segment["file"] for segment in manifest["segments"]] == ["00000.wav", "00001.wav", "00002.wav"]
+    assert [segment["seconds"] for segment in manifest["segments"]] == [1.0, 1.0, 0.5]
+    assert manifest["dropped_seconds"] == 0
+    with wave.open(os.path.join(directory, "00002.wav")) as f:
+        assert (f.getframerate(), f.getnframes()) == (8000, 4000)
+    with open(os.path.join(directory, "manifest.json")) as f:
+        assert json.load(f) == manifest
+    assert not [name for name in os.listdir(directory) if name.endswith(".part")]
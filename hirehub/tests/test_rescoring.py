@@ -0,0 +1,126 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from agent_core.interview_config import get_job_cache
+from agent_core.rescoring import Rescorer, StubTranscriber, Transcriber, iter_interviews
+
+
+@pytest.fixture
+def job_cache(tmp_path, monkeypatch):
+    """The scoring prompt's job section goes through the job cache; keep it in tmp"""
+    monkeypatch.setenv("JOB_CACHE_DB", str(tmp_path / "job_cache.sqlite3"))
+    get_job_cache.cache_clear()
+    yield get_job_cache()
+    get_job_cache().close()
+    get_job_cache.cache_clear()
+
+
+def write_interview(root, name, with_audio=False):
+    directory = root / name
+    directory.mkdir(parents=True)
+    interview = {
+        "room": name,
+        "metadata": json.dumps({"jobTitle": "Backend Engineer", "requiredSkills": ["Python"]}),
+        "transcript": [
+            {"speaker": "interviewer", "content": "Tell me about yourself", "timestamp": "2026-01-05T10:00:00"},
+            {"speaker": "candidate", "content": "I build APIs", "timestamp": "2026-01-05T10:00:05"},
+        ],
+        "tracks": {},
+    }
+    if with_audio:
+        track = directory / "candidate"
+        track.mkdir()
+        (track / "000.wav").write_bytes(b"")
+        started = 1767607203.0  # between the two live turns
+        (track / "manifest.json").write_text(json.dumps({
+            "started_at": started,
+            "segments": [{"file": "000.wav", "seconds": 2.0}],
+        }))
+        interview["tracks"] = {"candidate": "candidate"}
+    (directory / "interview.json").write_text(json.dumps(interview))
+    return directory
+
+
+def test_transcriber_is_abstract():
+    with pytest.raises(TypeError):
+        Transcriber()
+
+
+def test_stored_transcripts_are_scored_once(tmp_path):
+    recordings = tmp_path / "recordings"
+    write_interview(recordings, "room-a")
+    write_interview(recordings, "room-b")
+    out = str(tmp_path / "out")
+
+    report = asyncio.run(Rescorer(out, None, model="stub").run_all(iter_interviews(str(recordings))))
+    assert report["interviews"] == {"scored": 2, "skipped": 0, "failed": 0}
+    with open(tmp_path / "out" / "results.jsonl") as f:
+        results = [json.loads(line) for line in f]
+    assert [r["room"] for r in results] == ["room-a", "room-b"]
+    assert results[0]["transcript"] == "Interviewer: Tell me about yourself\nCandidate: I build APIs"
+
+    # A second run of the same version resumes from the checkpoint
+    report = asyncio.run(Rescorer(out, None, model="stub").run_all(iter_interviews(str(recordings))))
+    assert report["interviews"] == {"scored": 0, "skipped": 2, "failed": 0}
+
+
+def test_retranscribed_audio_is_cached(tmp_path):
+    recordings = tmp_path / "recordings"
+    write_interview(recordings, "room-a", with_audio=True)
+    out = str(tmp_path / "out")
+
+    report = asyncio.run(Rescorer(out, StubTranscriber(), model="stub").run_all(iter_interviews(str(recordings))))
+    assert report["segments"] == {"transcribed": 1, "cached": 0}
+    assert report["audio_transcribed_s"] == 2.0
+    with open(tmp_path / "out" / "results.jsonl") as f:
+        assert "Candidate: [audio 000.wav]" in json.loads(f.readline())["transcript"]
+
+    (tmp_path / "out" / "results.jsonl").unlink()
+    report = asyncio.run(Rescorer(out, StubTranscriber(), model="stub").run_all(iter_interviews(str(recordings))))
+    assert report["segments"] == {"transcribed": 0, "cached": 1}
+
+
+def test_rescoring_starts_no_session_threads(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOOP_MONITOR", "1")
+    monkeypatch.setenv("DEGRADATION", "1")
+    recordings = tmp_path / "recordings"
+    write_interview(recordings, "room-a")
+
+    async def scenario():
+        rescorer = Rescorer(str(tmp_path / "out"), None, model="stub")
+        await rescorer.run_all(iter_interviews(str(recordings)))
+
+    asyncio.run(scenario())
+    names = {thread.name for thread in threading.enumerate()}
+    assert not names & {"loop-monitor", "degradation"}
+
+
+@pytest.mark.parametrize("reply", [RuntimeError("provider timeout"), "not json", "[1, 2]"])
+def test_failed_scoring_is_not_checkpointed(tmp_path, monkeypatch, job_cache, reply):
+    recordings = tmp_path / "recordings"
+    write_interview(recordings, "room-a")
+    out = tmp_path / "out"
+
+    async def complete(self, llm, prompt, metric="llm"):
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(Rescorer, "complete", complete)
+    monkeypatch.setattr(Rescorer, "llm", lambda self: None)
+    report = asyncio.run(Rescorer(str(out), None, model="gpt-4").run_all(iter_interviews(str(recordings))))
+    assert report["interviews"] == {"scored": 0, "skipped": 0, "failed": 1}
+    assert (out / "results.jsonl").read_text() == ""
+
+    # Retried, and recorded, once scoring works
+    monkeypatch.setattr(Rescorer, "complete", lambda self, llm, prompt, metric="llm": _reply('{"overall_score": 80}'))
+    report = asyncio.run(Rescorer(str(out), None, model="gpt-4").run_all(iter_interviews(str(recordings))))
+    assert report["interviews"]["scored"] == 1
+    assert json.loads((out / "results.jsonl").read_text())["analysis"] == {"overall_score": 80}
+
+
+async def _reply(text):
+    return text
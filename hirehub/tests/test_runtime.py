@@ -0,0 +1,110 @@
+import asyncio
+
+from agent_core import providers
+from agent_core.runtime import AgentRuntime, SessionRuntime
+from agent_core.transcript import TranscriptStore
+
+
+class Emitter:
+    def __init__(self) -> None:
+        self.handlers = {}
+
+    def on(self, event, callback):
+        self.handlers.setdefault(event, []).append(callback)
+
+    def emit(self, event, *args):
+        for callback in self.handlers.get(event, []):
+            callback(*args)
+
+
+def test_transcript_filters_by_speaker():
+    transcript = TranscriptStore()
+    transcript.add("interviewer", "Tell me about yourself")
+    transcript.add("candidate", "I build APIs")
+    transcript.add("interviewer", "Which ones?")
+
+    assert [t["content"] for t in transcript.last(1, speaker="interviewer")] == ["Which ones?"]
+    assert transcript.last(0) == []
+    assert transcript.as_text(2) == "Candidate: I build APIs\nInterviewer: Which ones?"
+
+
+def test_handlers_are_timed_and_async_ones_tracked():
+    async def scenario():
+        runtime = SessionRuntime(AgentRuntime("test"), "room")
+        emitter = Emitter()
+        seen = []
+
+        @runtime.on(emitter, "sync_event")
+        def on_sync(value):
+            seen.append(("sync", value))
+
+        @runtime.on(emitter, "async_event")
+        async def on_async(value):
+            await asyncio.sleep(0)
+            seen.append(("async", value))
+
+        emitter.emit("sync_event", 1)
+        emitter.emit("async_event", 2)
+        assert runtime.pending_tasks == 1
+        await asyncio.sleep(0.01)
+        await runtime.shutdown()
+        return runtime, seen
+
+    runtime, seen = asyncio.run(scenario())
+    assert seen == [("sync", 1), ("async", 2)]
+    assert set(runtime.metrics.timings) == {"handler.sync_event", "handler.async_event"}
+
+
+def test_failed_tasks_are_counted():
+    async def scenario():
+        runtime = SessionRuntime(AgentRuntime("test"), "room")
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        runtime.spawn(fail(), name="fail")
+        await asyncio.sleep(0.01)
+        return runtime
+
+    assert asyncio.run(scenario()).metrics.counters["handler_errors"] == 1
+
+
+def test_shutdown_cancels_tasks_and_runs_hooks_once():
+    async def scenario():
+        runtime = SessionRuntime(AgentRuntime("test"), "room")
+        calls = []
+        task = runtime.spawn(asyncio.sleep(60))
+        runtime.on_shutdown(lambda: calls.append("sync"))
+
+        async def async_hook():
+            calls.append("async")
+
+        runtime.on_shutdown(async_hook)
+        runtime.on_shutdown(lambda: 1 / 0)  # logged, doesn't stop the rest
+        await runtime.shutdown("done")
+        await runtime.shutdown("again")
+        return task, calls
+
+    task, calls = asyncio.run(scenario())
+    assert task.cancelled()
+    assert calls == ["sync", "async"]
+
+
+def test_providers_are_pooled_by_config(monkeypatch):
+    monkeypatch.setattr(providers, "_FACTORIES", dict(providers._FACTORIES))
+    providers.register("llm", "counting")(lambda **kw: object())
+    runtime = AgentRuntime("test")
+
+    first = runtime.provider("llm", "counting", model="a", temperature=0.7)
+    assert runtime.provider("llm", "counting", temperature=0.7, model="a") is first
+    assert runtime.provider("llm", "counting", model="b") is not first
+
+
+def test_prewarm_runs_hooks(monkeypatch):
+    monkeypatch.setattr(providers, "preload", lambda *names: None)
+    runtime = AgentRuntime("test")
+    ran = []
+    runtime.on_prewarm(lambda: ran.append(True))
+
+    runtime.prewarm()
+    assert ran == [True]
@@ -0,0 +1,39 @@
+from agent_core.skills import extract_skills, match_skills, normalize_skill, normalize_skills, skill_name
+
+
+def test_aliases_fold_to_one_key():
+    assert normalize_skill("React.js") == normalize_skill("ReactJS") == normalize_skill("react") == "react"
+    assert skill_name("reactjs") == "React"
+
+
+def test_fuzzy_fallback_stays_within_one_edit():
+    assert normalize_skill("javascrpt") == "javascript"
+    assert normalize_skill("Kubernets") == "kubernetes"
+    # Too short to fuzzy match; unknown skills keep their folded form
+    assert normalize_skill("jav") == "jav"
+
+
+def test_normalize_skills_dedupes_in_order():
+    assert normalize_skills(["ReactJS", "", "react", "Unknown Thing"]) == ["react", "unknown thing"]
+
+
+def test_extract_prefers_longest_alias_and_skips_ambiguous_words():
+    assert extract_skills("we build with react native and react") == ["React Native", "React"]
+    # "go" is too common in speech to count as a mention
+    assert extract_skills("let's go with postgres and node js") == ["PostgreSQL", "Node.js"]
+
+
+def test_match_weights_preferred_skills_at_half():
+    result = match_skills(
+        {"skillsRequired": ["Python", "Go"], "skillsPreferred": ["AWS"]},
+        {"skills": ["python", "Amazon Web Services"]},
+    )
+
+    assert result["score"] == 60
+    assert result["matched"] == ["Python", "AWS"]
+    assert result["missing_required"] == ["Go"]
+    assert result["missing_preferred"] == []
+
+
+def test_match_without_job_skills_scores_zero():
+    assert match_skills({}, {"skills": ["python"]})["score"] == 0